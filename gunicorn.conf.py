@@ -0,0 +1,23 @@
+# gunicorn.conf.py
+#
+# የ web server ቅንብር (Procfile: `web: gunicorn`)
+#
+# SERVER_MODE=wsgi (ነባሪ)፡ መደበኛ sync workers (party_management/wsgi.py)።
+# SERVER_MODE=asgi፡ uvicorn workers (party_management/asgi.py)፤ async የሆኑት ገጾች
+# (profile, member_detail, dashboard, announcements, id card) ዳታቤዝ/cache ሲጠብቁ
+# worker አይያዝም። ሁለቱን በ `python manage.py benchmark_servers` ማነጻጸር ይቻላል።
+
+import os
+
+server_mode = os.environ.get('SERVER_MODE', 'wsgi').lower()
+if server_mode == 'asgi':
+    wsgi_app = 'party_management.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+elif server_mode == 'wsgi':
+    wsgi_app = 'party_management.wsgi:application'
+    worker_class = 'sync'
+else:
+    raise ValueError(f"SERVER_MODE must be 'wsgi' or 'asgi', not {server_mode!r}")
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
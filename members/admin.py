@@ -1,16 +1,254 @@
 # members/admin.py
+#
+# የአባላት admin ለትልቅ ሠንጠረዥ (ከአንድ ሚሊዮን በላይ አባላት)፡
+#   * የገጾች ብዛት ከ planner statistics ይገመታል (EstimatedCountPaginator)፤ ሙሉ COUNT(*) የለም
+#   * ፍለጋው በ members/search.py indexes (trigram/FTS prefix) ይሰራል
+#   * የክልል/ጾታ ማጣሪያዎች ብዛታቸውን ከ MemberStat ያሳያሉ፤ የ admin facets (COUNT በማጣሪያ) ጠፍተዋል
+#   * ዝርዝሩ የሚያሳያቸውን አምዶች ብቻ ያነባል (only())
+
+from collections import Counter
 
 from django.contrib import admin
-from .models import Member, Meeting, Attendance, Announcement
+from django.contrib.admin.views.main import ChangeList
+from django.db.models import Count
+from django.shortcuts import redirect
+from django.urls import reverse
+
+from . import dedup, scoping
+from .routing import use_replica
+from .models import (
+    GENDER_CHOICES, REGION_CHOICES, Member, MemberStat, Meeting, Attendance, Announcement, Broadcast, OutboundMessage,
+    DuplicateCandidate, AdministrativeUnit, ChangeLogEntry,
+)
+from .pagination import EstimatedCountPaginator
+from .search import search_members
+
+MEMBER_LIST_COLUMNS = ('membership_id', 'full_name', 'phone_number', 'email', 'region', 'city', 'membership_level')
+
+
+def _member_stat_counts(request):
+    # ሁለቱም ማጣሪያዎች በአንድ query፤ ለ request አንዴ ይሰላል
+    if not hasattr(request, '_member_stat_counts'):
+        stats = scoping.filter_by_scope(MemberStat.objects.filter(count__gt=0), scoping.scope_for_user(request.user))
+        counts = {'region': Counter(), 'gender': Counter()}
+        for region, gender, count in stats.values_list('region', 'gender', 'count'):
+            counts['region'][region] += count
+            counts['gender'][gender] += count
+        request._member_stat_counts = counts
+    return request._member_stat_counts
+
+
+class ReplicaChangeListMixin:
+    """Changelist pages (GET) read from the replica (members/routing.py); actions and edit forms use the primary."""
+
+    def changelist_view(self, request, extra_context=None):
+        view = super().changelist_view
+        if request.method in ('GET', 'HEAD'):
+            view = use_replica(view)
+        return view(request, extra_context)
+
+
+class MemberStatFilter(admin.SimpleListFilter):
+    """Choice filter whose counts (active members) come from MemberStat instead of COUNT queries."""
+
+    field_choices = ()
+
+    def lookups(self, request, model_admin):
+        counts = _member_stat_counts(request)[self.parameter_name]
+        return [(value, f"{label} ({counts[value]:,})") for value, label in self.field_choices]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.parameter_name: self.value()})
+        return queryset
+
+
+class RegionFilter(MemberStatFilter):
+    title = 'ክልል'
+    parameter_name = 'region'
+    field_choices = REGION_CHOICES
+
+
+class GenderFilter(MemberStatFilter):
+    title = 'ጾታ'
+    parameter_name = 'gender'
+    field_choices = GENDER_CHOICES
+
+
+class MemberChangeList(ChangeList):
+
+    def get_queryset(self, request, exclude_parameters=None):
+        # የለውጥ ቅጹ (change view) ሙሉውን ረድፍ ይፈልጋል፤ only() ለዝርዝሩ ብቻ
+        return super().get_queryset(request, exclude_parameters).only(*MEMBER_LIST_COLUMNS)
+
 
 @admin.register(Member)
-class MemberAdmin(admin.ModelAdmin):
+class MemberAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
     # በአዲሶቹ መስኮች እናስተካክለው
-    list_display = ('membership_id', 'full_name', 'phone_number', 'email', 'region', 'city', 'membership_level')
-    search_fields = ('full_name', 'phone_number', 'membership_id', 'city', 'zone', 'woreda')
-    list_filter = ('region', 'gender', 'education_level', 'membership_level', 'is_active')
+    list_display = MEMBER_LIST_COLUMNS
+    # ፍለጋው በ members/search.py indexes ይሰራል (ስም፣ መለያ ቁጥር፣ ስልክ፣ ከተማ)
+    search_fields = ('full_name', 'membership_id', 'phone_number', 'city')
+    list_filter = (RegionFilter, GenderFilter, 'education_level', 'membership_level', 'is_active', 'is_coordinator')
     list_per_page = 20
+    paginator = EstimatedCountPaginator
+    # "ሁሉም X" ለማሳየት ሁለተኛ COUNT(*) አይደረግም፤ facets በማጣሪያ COUNT ስለሚያደርጉ ጠፍተዋል
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    # index ባላቸው አምዶች ብቻ መደርደር (ሌሎቹ ሙሉውን ሠንጠረዥ sort ያደርጋሉ)
+    sortable_by = ('membership_id',)
+
+    def get_changelist(self, request, **kwargs):
+        return MemberChangeList
+
+    def get_queryset(self, request):
+        # የክልል አስተባባሪዎች በ admin ውስጥም የራሳቸውን ክልል ብቻ ያያሉ
+        return super().get_queryset(request).for_user(request.user)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        # ምርጥ ተዛማጆች መጀመሪያ (ሌላ አምድ ካልተመረጠ)
+        return search_members(queryset, search_term, ranked=True), False
+
+    def history_view(self, request, object_id, extra_context=None):
+        # የአባሉ ታሪክ ከለውጥ መዝገቡ (members/changelog.py) በ changelog_member_idx ይነበባል
+        if self.get_object(request, object_id) is None:
+            return super().history_view(request, object_id, extra_context)
+        return redirect(f"{reverse('admin:members_changelogentry_changelist')}?member_id={int(object_id)}")
+
+@admin.register(AdministrativeUnit)
+class AdministrativeUnitAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    # ክፍሎቹ ከአባላት አድራሻ በራሳቸው ይፈጠራሉ (members/units.py)፤ እዚህ ስማቸው ብቻ ይስተካከላል
+    list_display = ('name', 'level', 'region', 'parent', 'member_count')
+    list_select_related = ('parent',)
+    list_filter = ('level', 'region')
+    search_fields = ('name',)
+    readonly_fields = ('region', 'level', 'parent', 'match_key', 'member_count')
+    ordering = ('region', 'level', '-member_count')
+
+    def has_add_permission(self, request):
+        return False
+
 
 admin.site.register(Meeting)
 admin.site.register(Attendance)
-admin.site.register(Announcement)
\ No newline at end of file
+
+
+@admin.register(Announcement)
+class AnnouncementAdmin(admin.ModelAdmin):
+    list_display = ('title', 'date_posted')
+    actions = ['send_sms_to_all_members']
+
+    @admin.action(description='ለሁሉም ንቁ አባላት በ SMS ላክ')
+    def send_sms_to_all_members(self, request, queryset):
+        # እዚህ የሚፈጠረው Broadcast ብቻ ነው፤ መልዕክቶቹን `send_messages` worker ይልካል
+        Broadcast.objects.bulk_create([Broadcast(announcement=announcement, channel='sms') for announcement in queryset])
+        self.message_user(request, f"{queryset.count()} ማስታወቂያ(ዎች) ለመላክ ወረፋ ተይዘዋል።")
+
+
+@admin.register(Broadcast)
+class BroadcastAdmin(admin.ModelAdmin):
+    # ለክልል ወይም ለአባልነት ደረጃ የተለየ ስርጭት እዚህ ይፈጠራል (ባዶ = ሁሉም)
+    list_display = ('announcement', 'channel', 'region', 'membership_level', 'status', 'recipient_count', 'created_at')
+    list_filter = ('status', 'channel')
+    readonly_fields = ('status', 'recipient_count', 'queued_at', 'progress')
+
+    @admin.display(description='ሂደት')
+    def progress(self, obj):
+        if obj.pk is None:
+            return '-'
+        counts = dict(obj.messages.values_list('status').annotate(Count('id')).order_by())
+        return ', '.join(f"{label}: {counts.get(value, 0):,}" for value, label in OutboundMessage.STATUS_CHOICES)
+
+    def has_change_permission(self, request, obj=None):
+        # ወረፋ ከገባ በኋላ ዒላማውን መቀየር ትርጉም የለውም
+        return obj is None or obj.status == Broadcast.PENDING
+
+
+@admin.register(OutboundMessage)
+class OutboundMessageAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    list_display = ('recipient', 'channel', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'channel')
+    search_fields = ('^recipient',)
+    raw_id_fields = ('broadcast', 'member')
+    readonly_fields = ('broadcast', 'member', 'channel', 'recipient', 'attempts', 'sent_at', 'last_error')
+    list_per_page = 50
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    sortable_by = ()
+
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    # `find_duplicates` የሚያገኛቸው ጥንዶች፤ ከፍተኛ ተመሳሳይነት ያላቸው መጀመሪያ
+    list_display = ('member_a', 'phone_a', 'member_b', 'phone_b', 'score', 'reasons', 'status')
+    list_select_related = ('member_a', 'member_b')
+    list_filter = ('status',)
+    raw_id_fields = ('member_a', 'member_b')
+    readonly_fields = ('member_a', 'member_b', 'score', 'reasons', 'created_at')
+    ordering = ('status', '-score')
+    list_per_page = 50
+    actions = ['merge_into_older', 'dismiss']
+
+    def get_queryset(self, request):
+        # አስተባባሪዎች የራሳቸው ክልል አባላትን የሚያካትቱ ጥንዶች ብቻ
+        return scoping.filter_by_scope(super().get_queryset(request), scoping.scope_for_user(request.user), 'member_a__region')
+
+    @admin.display(description='ስልክ ሀ')
+    def phone_a(self, obj):
+        return obj.member_a.phone_number
+
+    @admin.display(description='ስልክ ለ')
+    def phone_b(self, obj):
+        return obj.member_b.phone_number
+
+    @admin.action(description='አዋህድ (ቀድሞ የተመዘገበው ይቀራል)')
+    def merge_into_older(self, request, queryset):
+        merged = 0
+        for candidate in queryset.filter(status=DuplicateCandidate.PENDING):
+            keep, drop = sorted((candidate.member_a, candidate.member_b), key=lambda member: (member.date_joined, member.pk))
+            if not (keep.is_active and drop.is_active):
+                continue
+            dedup.merge_members(keep, drop)
+            merged += 1
+        self.message_user(request, f"{merged} ጥንድ(ዶች) ተዋህደዋል።")
+
+    @admin.action(description='ተደጋጋሚ አይደሉም')
+    def dismiss(self, request, queryset):
+        count = queryset.filter(status=DuplicateCandidate.PENDING).update(status=DuplicateCandidate.DISMISSED)
+        self.message_user(request, f"{count} ጥንድ(ዶች) ተሰናብተዋል።")
+
+
+@admin.register(ChangeLogEntry)
+class ChangeLogEntryAdmin(ReplicaChangeListMixin, admin.ModelAdmin):
+    # append-only፤ የሚሰረዘው በ `prune_change_log` ብቻ ነው። የአንድ አባል ታሪክ፡ ?member_id=<id>
+    list_display = ('created_at', 'model', 'action', 'object_id', 'member_id', 'actor', 'changes')
+    list_filter = ('model', 'action')
+    list_per_page = 50
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    sortable_by = ()
+
+    def get_ordering(self, request):
+        # የአንድ አባል ታሪክ በ (member_id, -created_at) index፤ ሙሉው ዝርዝር በ pk (የተጨመሩበት ቅደም ተከተል)
+        return ('-created_at', '-pk') if 'member_id' in request.GET else ('-pk',)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        scope = scoping.scope_for_user(request.user)
+        if scope == scoping.ALL_REGIONS:
+            return queryset
+        # አስተባባሪዎች የራሳቸው ክልል አባላትን ታሪክ ብቻ
+        members = scoping.filter_by_scope(Member.objects.all(), scope).values('pk')
+        return queryset.filter(member_id__in=members)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,219 @@
+# members/analytics.py
+#
+# የአባላት ስነ-ሕዝብ ትንታኔ (columnar analytics snapshot)
+#
+# አመራሩ የሚጠይቃቸው ሰንጠረዦች (የዕድሜ ክልል × የትምህርት ደረጃ × የአባልነት ደረጃ × ክልል × ዓመት)
+# በ date_of_birth ላይ GROUP BY ስለሚፈልጉ ከአባላት ሠንጠረዥ ማስላቱ ከባድ ነው። ስለዚህ
+# `build_analytics_snapshot` (በየጊዜው፣ ለምሳሌ በየሌሊቱ በ cron) አባላቱን አንድ ጊዜ አንብቦ
+# (replica ካለ ከ replica) እያንዳንዱን መስክ እንደ NumPy array (አምድ) በ ANALYTICS_SNAPSHOT_PATH
+# (.npz) ይጽፋል። ሪፖርቱ እና JSON endpoint ፋይሉን ብቻ ያነባሉ (በ process ውስጥ ይቀመጣል)፤
+# ሰንጠረዦቹ በ np.bincount ይሰላሉ፣ ዳታቤዙ አይነካም። ቁጥሮቹ እስከ snapshot ጊዜ ድረስ ናቸው።
+#
+# numpy የሚያስፈልገው ለዚህ ሞጁል ብቻ ነው፤ ካልተጫነ ሌላው ስርዓት ይሰራል።
+
+import os
+import threading
+from datetime import datetime
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+from . import routing, scoping
+from .models import EDUCATION_LEVEL_CHOICES, GENDER_CHOICES, MEMBERSHIP_LEVEL_CHOICES, REGION_CHOICES, Member
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# (መስክ, ርዕስ, choices)፤ ኮዶቹ በ choices ቅደም ተከተል ናቸው
+CHOICE_DIMENSIONS = (
+    ('region', "ክልል", REGION_CHOICES),
+    ('gender', "ጾታ", GENDER_CHOICES),
+    ('education_level', "የትምህርት ደረጃ", EDUCATION_LEVEL_CHOICES),
+    ('membership_level', "የአባልነት ደረጃ", MEMBERSHIP_LEVEL_CHOICES),
+)
+CHOICE_LABELS = {field: dict(choices) for field, label, choices in CHOICE_DIMENSIONS}
+DIMENSIONS = {
+    'age_band': "የዕድሜ ክልል",
+    **{field: label for field, label, choices in CHOICE_DIMENSIONS},
+    'join_year': "የተመዘገበበት ዓመት",
+}
+# የዕድሜ ክልሎቹ የሚጀምሩበት ዕድሜ
+AGE_BAND_EDGES = (18, 25, 35, 45, 55, 65)
+AGE_BAND_LABELS = ('ከ18 በታች', '18–24', '25–34', '35–44', '45–54', '55–64', '65 እና በላይ')
+MAX_AGE = 100
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class AnalyticsError(ValueError):
+    """An unknown dimension or filter in a report request."""
+
+
+def _require_numpy():
+    if np is None:
+        raise ImproperlyConfigured('The analytics snapshot needs numpy (pip install numpy).')
+
+
+def snapshot_path():
+    return settings.ANALYTICS_SNAPSHOT_PATH
+
+
+# --- snapshot መፍጠር ---
+def build_snapshot(path=None, chunk_size=10000):
+    """Write every member's report fields as column arrays to `path` (.npz); returns the member count."""
+    _require_numpy()
+    path = path or snapshot_path()
+    values = {field: [value for value, label in choices] for field, label, choices in CHOICE_DIMENSIONS}
+    codes = {field: {value: code for code, value in enumerate(field_values)} for field, field_values in values.items()}
+    columns = {name: [] for name in (*values, 'birth_year', 'birth_md', 'join_year', 'is_active')}
+
+    fields = [field for field, label, choices in CHOICE_DIMENSIONS]
+    rows = Member.objects.order_by().values_list(*fields, 'date_of_birth', 'date_joined', 'is_active')
+    with routing.replica():
+        for row in rows.iterator(chunk_size=chunk_size):
+            for field, value in zip(fields, row):
+                code = codes[field].get(value)
+                if code is None:
+                    # choices ውስጥ የሌለ እሴት የራሱን ኮድ ያገኛል
+                    code = codes[field][value] = len(values[field])
+                    values[field].append(value)
+                columns[field].append(code)
+            birth, joined, is_active = row[len(fields):]
+            if timezone.is_aware(joined):
+                joined = timezone.localtime(joined)
+            columns['birth_year'].append(birth.year)
+            columns['birth_md'].append(birth.month * 100 + birth.day)
+            columns['join_year'].append(joined.year)
+            columns['is_active'].append(is_active)
+
+    arrays = {field: np.array(columns[field], dtype=np.uint8) for field in values}
+    arrays.update({f'{field}_values': np.array([str(value) for value in field_values]) for field, field_values in values.items()})
+    arrays.update({
+        'birth_year': np.array(columns['birth_year'], dtype=np.int16),
+        'birth_md': np.array(columns['birth_md'], dtype=np.int16),
+        'join_year': np.array(columns['join_year'], dtype=np.int16),
+        'is_active': np.array(columns['is_active'], dtype=bool),
+        'generated_at': np.array(timezone.now().isoformat()),
+    })
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # አንባቢዎች ግማሽ የተጻፈ ፋይል እንዳያገኙ
+    temporary = f'{path}.tmp'
+    with open(temporary, 'wb') as fp:
+        np.savez_compressed(fp, **arrays)
+    os.replace(temporary, path)
+    return len(columns['is_active'])
+
+
+# --- snapshot ማንበብ ---
+class Snapshot:
+    """The column arrays of one snapshot file."""
+
+    def __init__(self, arrays):
+        self.columns = arrays
+        self.generated_at = datetime.fromisoformat(str(arrays['generated_at']))
+        self.size = len(arrays['is_active'])
+
+    def ages(self, on=None):
+        """Each member's age in whole years on `on` (default: the snapshot date)."""
+        on = on or timezone.localtime(self.generated_at).date()
+        birthday_pending = self.columns['birth_md'] > on.month * 100 + on.day
+        return on.year - self.columns['birth_year'].astype(np.int32) - birthday_pending
+
+    def dimension(self, name, ages=None):
+        """(codes, labels) for a dimension: one code per member, indexing into labels."""
+        if name == 'age_band':
+            ages = self.ages() if ages is None else ages
+            return np.searchsorted(np.array(AGE_BAND_EDGES), ages, side='right'), list(AGE_BAND_LABELS)
+        if name == 'join_year':
+            years, codes = np.unique(self.columns['join_year'], return_inverse=True)
+            return codes, [str(year) for year in years]
+        if name in CHOICE_LABELS:
+            labels = CHOICE_LABELS[name]
+            return self.columns[name], [labels.get(value, value) for value in self.columns[f'{name}_values'].tolist()]
+        raise AnalyticsError(f'የማይታወቅ መለያ፡ {name}')
+
+    def mask(self, scope=scoping.ALL_REGIONS, filters=None):
+        """Active members in `scope` matching `filters` ({choice field: value})."""
+        selected = self.columns['is_active'].copy()
+        if scope == scoping.NO_REGIONS:
+            return np.zeros_like(selected)
+        if scope != scoping.ALL_REGIONS:
+            filters = {**(filters or {}), 'region': scope}
+        for field, value in (filters or {}).items():
+            if field not in CHOICE_LABELS:
+                raise AnalyticsError(f'የማይታወቅ ማጣሪያ፡ {field}')
+            field_values = self.columns[f'{field}_values'].tolist()
+            if value not in field_values:
+                return np.zeros_like(selected)
+            selected &= self.columns[field] == field_values.index(value)
+        return selected
+
+
+def load_snapshot(path=None):
+    """The current snapshot (re-read only when the file changes), or None before the first build."""
+    _require_numpy()
+    path = path or snapshot_path()
+    try:
+        modified = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is None or cached[0] != modified:
+            with np.load(path, allow_pickle=False) as data:
+                cached = _cache[path] = (modified, Snapshot({name: data[name] for name in data.files}))
+        return cached[1]
+
+
+# --- ሰንጠረዦች ---
+def crosstab(snapshot, rows, columns, selected, ages=None):
+    """Member counts for every (row, column) pair of two dimensions among the `selected` members."""
+    row_codes, row_labels = snapshot.dimension(rows, ages)
+    column_codes, column_labels = snapshot.dimension(columns, ages)
+    cells = row_codes[selected].astype(np.int64) * len(column_labels) + column_codes[selected]
+    counts = np.bincount(cells, minlength=len(row_labels) * len(column_labels)).reshape(len(row_labels), len(column_labels))
+    return {
+        'rows': {'dimension': rows, 'title': DIMENSIONS[rows], 'labels': row_labels},
+        'columns': {'dimension': columns, 'title': DIMENSIONS[columns], 'labels': column_labels},
+        'counts': counts.tolist(),
+        'row_totals': counts.sum(axis=1).tolist(),
+        'column_totals': counts.sum(axis=0).tolist(),
+        'total': int(counts.sum()),
+    }
+
+
+def age_distribution(snapshot, selected, ages=None):
+    """Members per year of age (capped at MAX_AGE) with the median and quartiles."""
+    ages = (snapshot.ages() if ages is None else ages)[selected]
+    if not len(ages):
+        return {'counts': [], 'median': None, 'quartiles': None, 'mean': None}
+    lower, median, upper = np.percentile(ages, [25, 50, 75])
+    return {
+        'counts': np.bincount(np.clip(ages, 0, MAX_AGE), minlength=MAX_AGE + 1).tolist(),
+        'median': float(median),
+        'quartiles': [float(lower), float(upper)],
+        'mean': round(float(ages.mean()), 1),
+    }
+
+
+def report(snapshot, scope, rows='age_band', columns='education_level', filters=None):
+    """The cross-tab and age distribution for the members `scope` may see, as plain data."""
+    for name in (rows, columns):
+        if name not in DIMENSIONS:
+            raise AnalyticsError(f'የማይታወቅ መለያ፡ {name}')
+    selected = snapshot.mask(scope, filters)
+    ages = snapshot.ages()
+    return {
+        'generated_at': snapshot.generated_at,
+        'crosstab': crosstab(snapshot, rows, columns, selected, ages),
+        'ages': age_distribution(snapshot, selected, ages),
+    }
+
+
+def filter_params(params):
+    # ?region=ADD&gender=F ... (ባዶ እሴቶች አይቆጠሩም)
+    return {field: params[field] for field in CHOICE_LABELS if params.get(field)}
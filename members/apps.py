@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class MembersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'members'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import signals  # noqa: F401
+        from .middleware import install_query_counter
+
+        # እያንዳንዱ thread የሚከፍተው connection (የ sync_to_async thread ጨምሮ) queries ይቆጥራል
+        connection_created.connect(install_query_counter, dispatch_uid='members.install_query_counter')
@@ -0,0 +1,169 @@
+# members/benchmark.py
+#
+# የዋና ዋና ገጾችን ፍጥነት በተለያየ የዳታ መጠን መለኪያ (view benchmarks)
+#
+# እያንዳንዱ ገጽ በ django.test.Client ይጠራል (middleware እና ቴምፕሌትን ጨምሮ)፤ streaming
+# ምላሾች እስከመጨረሻ ይነበባሉ። ውጤቱ JSON ስለሆነ የተለያዩ ሩጫዎችን ማነጻጸር ይቻላል።
+
+import platform
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils.http import urlencode
+
+from .middleware import count_queries
+from .models import Member
+
+# (ስም, URL name, kwargs ሰሪ, GET params)
+CASES = (
+    ('dashboard', 'dashboard', None, {}),
+    ('member_list', 'member_list', None, {}),
+    ('member_list_search', 'member_list', None, {'query': 'አበበ'}),
+    ('member_list_region', 'member_list', None, {'region': 'ORO'}),
+    ('member_detail', 'member_detail', 'member', {}),
+    ('export_members_csv', 'export_members_csv', None, {}),
+    ('member_id_card', 'member_id_card', 'member', {}),
+)
+
+BENCHMARK_USERNAME = 'benchmark-staff'
+
+
+def _staff_client():
+    user, created = User.objects.get_or_create(
+        username=BENCHMARK_USERNAME, defaults={'is_staff': True, 'is_superuser': True},
+    )
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def _sample_member():
+    # ከዝርዝሩ መሃል ያለ አባል (የመጀመሪያው/የመጨረሻው ረድፍ ልዩ ጥቅም እንዳያገኝ)
+    count = Member.objects.count()
+    return Member.objects.order_by('pk').values_list('pk', flat=True)[count // 2]
+
+
+def _timed_request(client, url, params):
+    with count_queries() as stats:
+        start = time.perf_counter()
+        response = client.get(url, params)
+        size = 0
+        if response.streaming:
+            for chunk in response.streaming_content:
+                size += len(chunk)
+        else:
+            size = len(response.content)
+        elapsed = time.perf_counter() - start
+    return elapsed * 1000, stats, response.status_code, size
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_views(repeat=5, warmup=1, cases=CASES):
+    """Time each case `repeat` times (after `warmup` untimed runs) and return one result dict per case."""
+    client = _staff_client()
+    member_pk = _sample_member()
+    results = []
+    for name, url_name, kwargs, params in cases:
+        url = reverse(url_name, kwargs={'pk': member_pk} if kwargs == 'member' else None)
+        for _ in range(warmup):
+            _timed_request(client, url, params)
+        timings = []
+        for _ in range(repeat):
+            elapsed, stats, status, size = _timed_request(client, url, params)
+            timings.append(elapsed)
+        results.append({
+            'view': name,
+            'url': url,
+            'params': params,
+            'status': status,
+            'runs': repeat,
+            'min_ms': round(min(timings), 2),
+            'median_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(_percentile(timings, 0.95), 2),
+            'max_ms': round(max(timings), 2),
+            'queries': stats.count,
+            'db_ms': round(stats.duration_ms, 2),
+            'response_bytes': size,
+        })
+    return results
+
+
+# የ WSGI/ASGI ንጽጽር (benchmark_servers)፡ ብዙ የሚነበቡት ገጾች
+LOAD_CASES = (
+    ('dashboard', 'dashboard', None, {}),
+    ('member_detail', 'member_detail', 'member', {}),
+    ('member_id_card', 'member_id_card', 'member', {}),
+    ('announcements', 'announcements', None, {}),
+    ('member_list', 'member_list', None, {}),
+)
+
+
+def load_targets(cases=LOAD_CASES):
+    """Return (name, path) pairs for `cases` and a session cookie for the benchmark staff user."""
+    client = _staff_client()
+    member_pk = _sample_member()
+    targets = []
+    for name, url_name, kwargs, params in cases:
+        path = reverse(url_name, kwargs={'pk': member_pk} if kwargs == 'member' else None)
+        targets.append((name, f'{path}?{urlencode(params)}' if params else path))
+    cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+    return targets, cookie
+
+
+def _fetch(url, cookie):
+    request = urllib.request.Request(url, headers={'Cookie': cookie})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return (time.perf_counter() - start) * 1000, ok
+
+
+def run_load(base_url, targets, cookie, requests=200, concurrency=20):
+    """Send `requests` GETs per target from `concurrency` threads; one result dict per target."""
+    results = []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for name, path in targets:
+            url = base_url.rstrip('/') + path
+            start = time.perf_counter()
+            samples = list(pool.map(lambda _: _fetch(url, cookie), range(requests)))
+            elapsed = time.perf_counter() - start
+            timings = [ms for ms, ok in samples]
+            results.append({
+                'view': name,
+                'url': path,
+                'requests': requests,
+                'concurrency': concurrency,
+                'errors': sum(1 for ms, ok in samples if not ok),
+                'requests_per_second': round(requests / elapsed, 1),
+                'median_ms': round(statistics.median(timings), 2),
+                'p95_ms': round(_percentile(timings, 0.95), 2),
+                'max_ms': round(max(timings), 2),
+            })
+    return results
+
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'database_version': '.'.join(map(str, connection.get_database_version())),
+        'machine': platform.machine(),
+    }
@@ -0,0 +1,105 @@
+# members/card_render.py
+#
+# የመታወቂያ ካርድ ሉሆችን መሳል። ይህ module በ process pool workers ውስጥ ይሰራል፤
+# 'spawn' worker Django'ን ከማስጀመሩ በፊት ስለሚያስመጣው ሞዴሎችን አያስመጣም።
+
+from functools import lru_cache
+from io import BytesIO
+
+from PIL import Image, ImageDraw, ImageFont, ImageOps
+
+# ካርድ፡ CR80 (85.6 × 54 ሚሜ) በ 300 DPI፤ ሉህ፡ A4
+DPI = 300
+CARD_SIZE = (1011, 638)
+SHEET_SIZE = (2480, 3508)
+SHEET_COLUMNS, SHEET_ROWS = 2, 5
+CARDS_PER_SHEET = SHEET_COLUMNS * SHEET_ROWS
+
+PARTY_NAME = "የኢትዮጵያ አንድነት እና ልማት ፓርቲ"
+HEADER_COLOR = (44, 62, 80)
+ACCENT_COLOR = (30, 132, 73)
+
+
+@lru_cache(maxsize=None)
+def _font(size):
+    # የግዕዝ ፊደላትን የሚደግፍ TTF (ለምሳሌ Abyssinica SIL ወይም Noto Sans Ethiopic) በ
+    # ID_CARD_FONT_PATH መገለጽ አለበት፤ ካልሆነ የ Pillow ነባሪ ፊደል ይጠቀማል።
+    from django.conf import settings
+
+    path = getattr(settings, 'ID_CARD_FONT_PATH', None)
+    if path:
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size)
+
+
+def _load_photo(name, size):
+    from django.core.files.storage import default_storage
+
+    if not name:
+        return None
+    try:
+        with default_storage.open(name) as fp:
+            photo = Image.open(fp)
+            photo = ImageOps.exif_transpose(photo).convert('RGB')
+            return ImageOps.fit(photo, size)
+    except (OSError, ValueError):
+        return None
+
+
+def render_card(row):
+    card = Image.new('RGB', CARD_SIZE, 'white')
+    draw = ImageDraw.Draw(card)
+    width, height = CARD_SIZE
+
+    draw.rectangle([0, 0, width, 90], fill=HEADER_COLOR)
+    draw.text((width // 2, 45), PARTY_NAME, font=_font(40), fill='white', anchor='mm')
+    draw.rectangle([0, height - 50, width, height], fill=HEADER_COLOR)
+
+    photo_box = (40, 120, 300, 440)
+    photo = _load_photo(row['photo'], (photo_box[2] - photo_box[0], photo_box[3] - photo_box[1]))
+    if photo is not None:
+        card.paste(photo, photo_box[:2])
+    else:
+        draw.rectangle(photo_box, outline=(189, 195, 199), width=4, fill=(236, 240, 241))
+    draw.text((170, 480), row['full_name'], font=_font(34), fill=HEADER_COLOR, anchor='mm')
+
+    label_font, value_font = _font(28), _font(30)
+    lines = [
+        ("ጾታ", row['gender']),
+        ("የትውልድ ቀን", row['date_of_birth'].strftime('%d-%m-%Y')),
+        ("ስልክ", row['phone_number']),
+        ("ክልል", row['region']),
+        ("የወጣበት ቀን", row['date_joined'].strftime('%d-%m-%Y')),
+    ]
+    y = 130
+    for label, value in lines:
+        draw.text((340, y), f"{label}:", font=label_font, fill=(52, 73, 94))
+        draw.text((560, y), str(value), font=value_font, fill='black')
+        y += 52
+
+    from .qr import get_qr_png
+
+    qr_image = Image.open(BytesIO(get_qr_png(row['full_name'], row['membership_id']))).convert('RGB')
+    qr_image = qr_image.resize((200, 200), Image.NEAREST)
+    card.paste(qr_image, (width - 240, height - 270))
+    draw.text((340, height - 100), row['membership_id'] or '', font=_font(32), fill=ACCENT_COLOR)
+    return card
+
+
+def render_sheet(rows):
+    sheet = Image.new('RGB', SHEET_SIZE, 'white')
+    margin_x = (SHEET_SIZE[0] - SHEET_COLUMNS * CARD_SIZE[0]) // (SHEET_COLUMNS + 1)
+    margin_y = (SHEET_SIZE[1] - SHEET_ROWS * CARD_SIZE[1]) // (SHEET_ROWS + 1)
+    for index, row in enumerate(rows):
+        column, line = index % SHEET_COLUMNS, index // SHEET_COLUMNS
+        x = margin_x + column * (CARD_SIZE[0] + margin_x)
+        y = margin_y + line * (CARD_SIZE[1] + margin_y)
+        sheet.paste(render_card(row), (x, y))
+    return sheet
+
+
+def render_sheet_bytes(rows, image_format='JPEG'):
+    buffer = BytesIO()
+    options = {'quality': 90, 'dpi': (DPI, DPI)} if image_format == 'JPEG' else {'dpi': (DPI, DPI)}
+    render_sheet(rows).save(buffer, format=image_format, **options)
+    return buffer.getvalue()
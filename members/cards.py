@@ -0,0 +1,145 @@
+# members/cards.py
+#
+# የመታወቂያ ካርዶችን በብዛት ለማተም (bulk ID card sheets)
+#
+# አባላቱ ከዳታቤዝ በ chunks ይነበባሉ፣ በ A4 ሉሆች (10 ካርዶች በሉህ) ይከፋፈላሉ፣ እያንዳንዱ
+# ሉህ በ process pool ውስጥ ይሳላል (QR + ፎቶ + ጽሑፍ)። ውጤቱ በቅደም ተከተል እንደ
+# PDF ገጾች (ወይም PNG ፋይሎች) ይጻፋል፤ ስለዚህ ማስታወሻው በአባላት ብዛት አያድግም።
+# ከድር ገጹ የሚታተሙት ቢበዛ WEB_PRINT_LIMIT ካርዶች ናቸው፣ በ request process ውስጥ ይሳላሉ፤
+# ትላልቅ ህትመቶች (ለምሳሌ የአንድ ክልል) በ `print_id_cards` command በ process pool ይሰራሉ።
+
+import os
+from collections import deque
+from io import BytesIO
+from itertools import islice
+
+from django.conf import settings
+from PIL import Image
+
+from .card_render import CARDS_PER_SHEET, DPI, render_sheet_bytes
+from .images import variant_name
+from .models import GENDER_CHOICES, REGION_CHOICES
+from .workers import process_pool
+
+CARD_FIELDS = (
+    'pk', 'full_name', 'membership_id', 'gender', 'region',
+    'phone_number', 'date_of_birth', 'date_joined', 'photo', 'photo_variants_ready',
+)
+# ድር ገጹ በአንድ request የሚያትማቸው ከፍተኛ የካርዶች ብዛት
+WEB_PRINT_LIMIT = 200
+GENDER_LABELS = dict(GENDER_CHOICES)
+REGION_LABELS = dict(REGION_CHOICES)
+
+
+def select_members(queryset, region=None, membership_level=None, ids=None):
+    queryset = queryset.filter(is_active=True)
+    if region:
+        queryset = queryset.filter(region=region)
+    if membership_level:
+        queryset = queryset.filter(membership_level=membership_level)
+    if ids:
+        queryset = queryset.filter(pk__in=ids)
+    return queryset.order_by('region', 'membership_id')
+
+
+def _card_row(row):
+    # workers ሞዴሎችን አያስመጡም፤ መለያዎቹ (labels) እዚሁ ይዘጋጃሉ
+    row['gender'] = GENDER_LABELS.get(row['gender'], row['gender'])
+    row['region'] = REGION_LABELS.get(row['region'], row['region'])
+    # ለህትመት የተዘጋጀው (600px) ቅጂ፤ ገና ካልተዘጋጀ ዋናው ፎቶ
+    if row.pop('photo_variants_ready') and row['photo']:
+        row['photo'] = variant_name(row['photo'], 'card', 'jpg')
+    return row
+
+
+def iter_sheets(queryset):
+    # ለ workers የሚላኩ ቀላል dicts (ORM objects አይደሉም)፣ በሉህ የተከፋፈሉ
+    rows = queryset.values(*CARD_FIELDS).iterator(chunk_size=1000)
+    while True:
+        batch = [_card_row(row) for row in islice(rows, CARDS_PER_SHEET)]
+        if not batch:
+            return
+        yield batch
+
+
+def render_sheets(sheets, image_format='JPEG'):
+    """Render each batch from `sheets` in this process, one sheet at a time."""
+    for rows in sheets:
+        yield render_sheet_bytes(rows, image_format)
+
+
+def render_sheets_parallel(sheets, image_format='JPEG', workers=None):
+    """
+    Render each batch from `sheets` in a process pool and yield the encoded
+    sheet images in input order. At most two sheets per worker are in flight,
+    so memory stays flat however many members are printed.
+    """
+    workers = workers or getattr(settings, 'ID_CARD_WORKERS', None) or os.cpu_count() or 1
+    if workers == 1:
+        yield from render_sheets(sheets, image_format)
+        return
+    with process_pool(workers) as executor:
+        pending = deque()
+        for rows in sheets:
+            pending.append(executor.submit(render_sheet_bytes, rows, image_format))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+# --- ቀላል PDF ጸሐፊ (እያንዳንዱ ሉህ አንድ JPEG ገጽ) ---
+
+def _jpeg_size(data):
+    with Image.open(BytesIO(data)) as image:
+        return image.size
+
+
+def pdf_stream(jpeg_pages):
+    """Yield a PDF document chunk by chunk, one page per JPEG, without holding earlier pages."""
+    offsets = {}
+    position = 0
+    page_ids = []
+
+    def emit(object_id, body):
+        nonlocal position
+        offsets[object_id] = position
+        chunk = b"%d 0 obj\n" % object_id + body + b"\nendobj\n"
+        position += len(chunk)
+        return chunk
+
+    header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+    position += len(header)
+    yield header
+
+    # 1 = Catalog፣ 2 = Pages (መጨረሻ ላይ ይጻፋሉ)፤ ለእያንዳንዱ ገጽ 3 objects
+    next_id = 3
+    for data in jpeg_pages:
+        width_px, height_px = _jpeg_size(data)
+        width_pt, height_pt = width_px * 72 / DPI, height_px * 72 / DPI
+        image_id, content_id, page_id = next_id, next_id + 1, next_id + 2
+        next_id += 3
+
+        yield emit(image_id, (
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB "
+            b"/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>\nstream\n" % (width_px, height_px, len(data))
+        ) + data + b"\nendstream")
+        content = b"q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q" % (width_pt, height_pt)
+        yield emit(content_id, b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+        yield emit(page_id, (
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] "
+            b"/Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>"
+            % (width_pt, height_pt, image_id, content_id)
+        ))
+        page_ids.append(page_id)
+
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    yield emit(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids)))
+    yield emit(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+    xref_position = position
+    lines = [b"xref\n0 %d\n" % next_id, b"0000000000 65535 f \n"]
+    for object_id in range(1, next_id):
+        lines.append(b"%010d 00000 n \n" % offsets[object_id])
+    lines.append(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (next_id, xref_position))
+    yield b"".join(lines)
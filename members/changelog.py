@@ -0,0 +1,180 @@
+# members/changelog.py
+#
+# የለውጥ መዝገብ (append-only change log)
+#
+# Member፣ Attendance እና Announcement ሲቀየሩ የተቀየሩት መስኮች ብቻ ({መስክ: [የቀድሞ, አዲስ]})
+# ይመዘገባሉ። የቀድሞዎቹ እሴቶች ከ Member._loaded_values (ያለ ተጨማሪ query) ወይም Attendance/
+# Announcement ከሚጭኑት ረድፍ ይመጣሉ። መዝገቦቹ ወዲያው አይጻፉም፡ ChangeLogMiddleware በ request
+# ውስጥ ይሰበስባቸዋል፣ መጨረሻ ላይ ከተጠቃሚው ስም ጋር በአንድ bulk INSERT ይጽፋቸዋል። transaction
+# rollback የተደረጉ ለውጦች አይመዘገቡም (on_commit)። ከ request ውጪ (commands, workers)
+# `buffered()` ካልተጠቀሙ እያንዳንዱ መዝገብ ወዲያው ይጻፋል።
+#
+# bulk writes (import፣ check-in) signals ስለማይጠሩ check-ins በ members/checkin.py በራሳቸው
+# ይመዘገባሉ፤ bulk import አይመዘገብም (የአባሉ ረድፍ ራሱ የመጀመሪያው ሁኔታ ነው)።
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+
+from .models import Announcement, ChangeLogEntry
+
+# የማይመዘገቡ (በራሳቸው የሚሰሉ ወይም ትርጉም የሌላቸው) የ Member መስኮች
+MEMBER_IGNORED_FIELDS = frozenset(['updated_at', 'photo_variants_ready', 'zone_unit', 'woreda_unit', 'kebele_unit'])
+ANNOUNCEMENT_FIELDS = ('title', 'content', 'date_posted')
+PRUNE_CHUNK_SIZE = 5000
+
+_buffer = ContextVar('changelog_buffer', default=None)
+
+
+def _value(value):
+    if isinstance(value, FieldFile):
+        return value.name or None
+    return value
+
+
+def diff(fields, old, new):
+    """{field: [old, new]} for the fields whose values differ; fields missing from `old` are skipped."""
+    return {
+        field: [_value(old[field]), _value(new[field])]
+        for field in fields
+        if field in old and _value(old[field]) != _value(new[field])
+    }
+
+
+def record(model, action, object_id=None, member_id=None, changes=None):
+    if action == ChangeLogEntry.UPDATED and not changes:
+        return
+    entry = ChangeLogEntry(
+        model=model, action=action, object_id=object_id, member_id=member_id, changes=changes or {},
+        created_at=timezone.now(),
+    )
+    buffer = _buffer.get()
+    if buffer is not None:
+        transaction.on_commit(lambda: buffer.append(entry))
+    else:
+        transaction.on_commit(entry.save)
+
+
+def record_many(entries):
+    # የተዘጋጁ (ያልተቀመጡ) ChangeLogEntry ዎች፤ ለ bulk writes
+    if entries:
+        ChangeLogEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+def flush(entries, user=None):
+    if not entries:
+        return
+    if user is not None and user.is_authenticated:
+        for entry in entries:
+            entry.actor_id, entry.actor = user.pk, user.get_username()
+    record_many(entries)
+    entries.clear()
+
+
+@contextmanager
+def collecting():
+    # ብሎኩ ውስጥ የሚመዘገቡት ይሰበሰባሉ እንጂ አይጻፉም፤ ጠሪው `flush` ያደርጋል (async middleware)
+    entries = []
+    token = _buffer.set(entries)
+    try:
+        yield entries
+    finally:
+        _buffer.reset(token)
+
+
+@contextmanager
+def buffered(get_user=None):
+    """Collect entries recorded inside the block and write them in one bulk insert at the end."""
+    with collecting() as entries:
+        try:
+            yield entries
+        finally:
+            flush(entries, get_user() if get_user and entries else None)
+
+
+# --- ሞዴሎቹ ---
+def member_saved(instance, created, update_fields=None):
+    if created:
+        record('member', ChangeLogEntry.CREATED, instance.pk, instance.pk)
+        return
+    fields = [
+        field.attname for field in instance._meta.concrete_fields
+        if field.name not in MEMBER_IGNORED_FIELDS
+        and (update_fields is None or field.name in update_fields or field.attname in update_fields)
+        and field.attname in instance.__dict__
+    ]
+    old = getattr(instance, '_loaded_values', {})
+    record('member', ChangeLogEntry.UPDATED, instance.pk, instance.pk, diff(fields, old, instance.__dict__))
+
+
+def member_deleted(instance):
+    record('member', ChangeLogEntry.DELETED, instance.pk, instance.pk)
+
+
+def attendance_saved(instance, old):
+    # old = (member_id, meeting_id, is_present) ወይም None (members/signals.py remember_attendance_row)
+    new = {'member_id': instance.member_id, 'meeting_id': instance.meeting_id, 'is_present': instance.is_present}
+    if old is None:
+        record('attendance', ChangeLogEntry.CREATED, instance.pk, instance.member_id,
+               {field: [None, value] for field, value in new.items() if field != 'member_id'})
+    else:
+        old = dict(zip(('member_id', 'meeting_id', 'is_present'), old))
+        record('attendance', ChangeLogEntry.UPDATED, instance.pk, instance.member_id, diff(new, old, new))
+
+
+def attendance_deleted(instance):
+    record('attendance', ChangeLogEntry.DELETED, instance.pk, instance.member_id,
+           {'meeting_id': [instance.meeting_id, None], 'is_present': [instance.is_present, None]})
+
+
+def attendance_checked_in(pairs):
+    # members/checkin.py፡ አዲስ ወይም ከ absent ወደ present የተቀየሩ (member_id, meeting_id, was_recorded)
+    now = timezone.now()
+    record_many([
+        ChangeLogEntry(
+            model='attendance', action=ChangeLogEntry.UPDATED if was_recorded else ChangeLogEntry.CREATED,
+            member_id=member_id, created_at=now,
+            changes={'meeting_id': [meeting_id, meeting_id] if was_recorded else [None, meeting_id],
+                     'is_present': [False if was_recorded else None, True]},
+        )
+        for member_id, meeting_id, was_recorded in pairs
+    ])
+
+
+def remember_announcement(instance):
+    instance._changelog_old = None
+    if instance.pk is not None:
+        instance._changelog_old = Announcement.objects.filter(pk=instance.pk).values(*ANNOUNCEMENT_FIELDS).first()
+
+
+def announcement_saved(instance, created):
+    old = instance.__dict__.pop('_changelog_old', None)
+    if created or old is None:
+        record('announcement', ChangeLogEntry.CREATED, instance.pk)
+    else:
+        record('announcement', ChangeLogEntry.UPDATED, instance.pk, changes=diff(ANNOUNCEMENT_FIELDS, old, instance.__dict__))
+
+
+def announcement_deleted(instance):
+    record('announcement', ChangeLogEntry.DELETED, instance.pk, changes={'title': [instance.title, None]})
+
+
+# --- ማጽዳት ---
+def prune(older_than_days, chunk_size=PRUNE_CHUNK_SIZE):
+    """Delete entries older than `older_than_days`, oldest first in primary-key chunks; returns the count."""
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    deleted = 0
+    while True:
+        # መዝገቦቹ በጊዜ ቅደም ተከተል ስለሚጨመሩ ከትንሹ pk ጀምረን በ pk index እንሄዳለን
+        rows = list(ChangeLogEntry.objects.order_by('pk').values_list('pk', 'created_at')[:chunk_size])
+        expired = [pk for pk, created_at in rows if created_at < cutoff]
+        if not expired:
+            break
+        deleted += ChangeLogEntry.objects.filter(pk__in=expired).delete()[0]
+        if len(expired) < len(rows):
+            break
+    return deleted
@@ -0,0 +1,210 @@
+# members/checkin.py
+#
+# የስብሰባ መግቢያ (meeting check-in)
+#
+# የመታወቂያ ካርዱ QR (members/qr.py) ወይም የመለያ ቁጥሮች ዝርዝር (ከ offline scanner) ይቀበላል።
+# መለያ ቁጥሮቹ በአንድ query ወደ Member ይቀየራሉ፤ የ Attendance ጽሑፉ ግን ወዲያው አይደረግም፡
+# በ process ውስጥ ባለ buffer ይሰበሰባል እና CHECKIN_FLUSH_SIZE ሲሞላ ወይም CHECKIN_FLUSH_INTERVAL
+# ሰከንድ ሲያልፍ በ bulk INSERT … ON CONFLICT DO NOTHING እና UPDATE … WHERE is_present = false ይጻፋል።
+# ስለዚህ በሺዎች የሚቆጠሩ ሰዎች በጥቂት ደቂቃዎች ሲገቡ የረድፍ-በረድፍ INSERT እና የ lock ውድድር የለም፣
+# ተመሳሳይ ሰው ሁለት ጊዜ ቢቃኝም አንድ ረድፍ ብቻ ይኖራል።
+
+import atexit
+import logging
+import re
+import threading
+
+from django.conf import settings
+from django.db import connections, router, transaction
+
+from . import changelog, engagement
+from .models import Attendance, Member
+
+logger = logging.getLogger(__name__)
+
+MEMBERSHIP_ID_RE = re.compile(r'EUDP-[A-Z]{2,3}-\d{2}-\d{4,}', re.IGNORECASE)
+MAX_SCANS_PER_REQUEST = 5000
+
+
+def parse_membership_id(scan):
+    """Extract the membership ID from a QR payload or a bare ID; None when there is none."""
+    match = MEMBERSHIP_ID_RE.search(scan or '')
+    return match.group(0).upper() if match else None
+
+
+def resolve_members(membership_ids):
+    # {membership_id: member pk}፤ ያልታወቁ መለያዎች አይካተቱም
+    return dict(
+        Member.objects.filter(membership_id__in=set(membership_ids), is_active=True)
+        .values_list('membership_id', 'pk')
+    )
+
+
+# በአንድ statement የሚላኩ ጥንዶች (እስከ ሶስት parameters በጥንድ)
+WRITE_BATCH_SIZE = 400
+
+
+def _returning(cursor, sql, params):
+    cursor.execute(sql, params)
+    return {(member_id, meeting_id) for member_id, meeting_id in cursor.fetchall()}
+
+
+@transaction.atomic
+def write_attendance(pairs):
+    """
+    Mark (member_id, meeting_id) pairs present, then apply the rows the
+    statements actually changed to the engagement rollups and the change log.
+    Returns the changed pairs as (member_id, meeting_id, was_recorded).
+    """
+    pairs = list(set(pairs))
+    connection = connections[router.db_for_write(Attendance)]
+    table = connection.ops.quote_name(Attendance._meta.db_table)
+    inserted, marked = set(), set()
+    # ለውጡ የሚሰላው ከ RETURNING ነው እንጂ አስቀድሞ ከተነበበ ሁኔታ አይደለም፡ ተመሳሳይ ጥንድ በሁለት
+    # workers በአንድ ጊዜ ቢጻፍ (ለምሳሌ በሁለት በሮች ቢቃኝ) ረድፉን የቀየረው አንዱ ብቻ ነው
+    with connection.cursor() as cursor:
+        for start in range(0, len(pairs), WRITE_BATCH_SIZE):
+            batch = pairs[start:start + WRITE_BATCH_SIZE]
+            # አዲስ ረድፎች፡ ተመዝግበው ተገኝተዋል
+            inserted |= _returning(
+                cursor,
+                f"INSERT INTO {table} (member_id, meeting_id, is_present) "
+                f"VALUES {', '.join(['(%s, %s, %s)'] * len(batch))} "
+                f"ON CONFLICT (member_id, meeting_id) DO NOTHING RETURNING member_id, meeting_id",
+                [value for member_id, meeting_id in batch for value in (member_id, meeting_id, True)],
+            )
+            values = ', '.join(['(%s, %s)'] * len(batch))
+            params = [value for pair in batch for value in pair]
+            # የነበሩ absent ረድፎች፡ ተገኝተዋል ብቻ፤ የነበሩ present ረድፎች አይነኩም
+            marked |= _returning(
+                cursor,
+                f"UPDATE {table} SET is_present = %s WHERE is_present = %s "
+                f"AND (member_id, meeting_id) IN (VALUES {values}) RETURNING member_id, meeting_id",
+                [True, False, *params],
+            )
+    changed = [(member_id, meeting_id, False) for member_id, meeting_id in inserted]
+    changed += [(member_id, meeting_id, True) for member_id, meeting_id in marked]
+    engagement.apply_deltas(
+        (member_id, meeting_id, 0 if was_recorded else 1, 1) for member_id, meeting_id, was_recorded in changed
+    )
+    changelog.attendance_checked_in(changed)
+    return changed
+
+
+class AttendanceBuffer:
+    """Collects check-ins in memory and flushes them by size or after a short delay."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = set()
+        # ጥንድ -> ያልተሳኩ ጽሑፎች ብዛት
+        self._failures = {}
+        self._timer = None
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, pairs):
+        if not pairs:
+            return
+        flush_size = settings.CHECKIN_FLUSH_SIZE
+        if flush_size <= 1:
+            write_attendance(pairs)
+            return
+        with self._lock:
+            self._pending.update(pairs)
+            full = len(self._pending) >= flush_size
+            if not full:
+                self._arm_timer()
+        if full:
+            self._flush_quietly()
+
+    def flush(self):
+        with self._lock:
+            pairs, self._pending = self._pending, set()
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            retried = {pair for pair in pairs if pair in self._failures}
+        if not pairs:
+            return 0
+        # ቀድሞ ያልተሳካላቸው ጥንዶች አንድ በአንድ ይጻፋሉ፡ የማይጻፍ ጥንድ (ለምሳሌ አባሉ ወይም ስብሰባው
+        # ተሰርዟል) አዲሶቹን check-ins አያግድም
+        written, failed, error = 0, set(), None
+        for group in [pairs - retried, *({pair} for pair in retried)]:
+            if not group:
+                continue
+            try:
+                write_attendance(group)
+            except Exception as exc:
+                failed |= group
+                error = exc
+            else:
+                written += len(group)
+                with self._lock:
+                    for pair in group:
+                        self._failures.pop(pair, None)
+        if failed:
+            logger.error("Flushing %d check-ins failed", len(failed), exc_info=error)
+            self._requeue(failed)
+            raise error
+        return written
+
+    def _requeue(self, pairs):
+        # እንዳይጠፉ ወደ buffer ይመለሳሉ፤ CHECKIN_MAX_ATTEMPTS ጊዜ ያልተሳካ ጥንድ ግን ይጣላል
+        with self._lock:
+            for pair in pairs:
+                attempts = self._failures.get(pair, 0) + 1
+                if attempts >= settings.CHECKIN_MAX_ATTEMPTS:
+                    self._failures.pop(pair, None)
+                    logger.error("Dropping check-in of member %s at meeting %s after %d failed writes", *pair, attempts)
+                else:
+                    self._failures[pair] = attempts
+                    self._pending.add(pair)
+            if self._pending:
+                # ሌላ scan ባይመጣም እንደገና ይሞከራሉ
+                self._arm_timer()
+
+    def _arm_timer(self):
+        # self._lock ተይዞ ይጠራል
+        if self._timer is None:
+            self._timer = threading.Timer(settings.CHECKIN_FLUSH_INTERVAL, self._flush_in_background)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_quietly(self):
+        # check-in ቀድሞ ተቀባይነት አግኝቷል፤ ጽሑፉ ካልተሳካ flush() አስመዝግቦ ረድፎቹን መልሷል
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+    def _flush_in_background(self):
+        try:
+            with self._lock:
+                self._timer = None
+            self._flush_quietly()
+        finally:
+            # የዚህ thread የዳታቤዝ ግንኙነት ብቻ ይዘጋል
+            connections.close_all()
+
+
+buffer = AttendanceBuffer()
+atexit.register(buffer.flush)
+
+
+def check_in(meeting, scans):
+    """
+    Check in the members named by `scans` (QR payloads or membership IDs).
+    Returns (accepted membership IDs, unrecognised scans).
+    """
+    parsed = [(scan, parse_membership_id(scan)) for scan in scans]
+    found = resolve_members(membership_id for scan, membership_id in parsed if membership_id)
+    accepted, unknown = [], []
+    for scan, membership_id in parsed:
+        if membership_id in found:
+            accepted.append(membership_id)
+        else:
+            unknown.append(scan)
+    buffer.add({(found[membership_id], meeting.pk) for membership_id in accepted})
+    return accepted, unknown
@@ -0,0 +1,215 @@
+# members/dedup.py
+#
+# ተደጋጋሚ አባላት ፍለጋ (duplicate member detection)
+#
+# ልዩ (unique) የሆነው ስልክ ቁጥሩ ብቻ ስለሆነ አንድ ሰው በሁለት ስልኮች ሁለት ጊዜ ሊመዘገብ ይችላል።
+# ሁሉንም ጥንዶች (all-pairs) ማነጻጸር ለ 500k አባላት አይቻልም፤ ስለዚህ፡
+#   1. እያንዳንዱ አባል ጥቂት blocking keys ያገኛል (MemberBlockingKey)፡ ለእያንዳንዱ የስም ክፍል
+#      የድምጽ ቁልፍ + የትውልድ ዓመት (members/text.py፤ ግዕዝም ላቲንም አንድ ቁልፍ ይሰጣሉ)፣ እና
+#      የትውልድ ቀን + ክልል።
+#   2. የሚነጻጸሩት ቢያንስ አንድ ቁልፍ የሚጋሩ አባላት ብቻ ናቸው፤ ከ MAX_BLOCK_SIZE በላይ አባላት
+#      ያሉት ቁልፍ (በጣም የተለመደ ስም) ይዘለላል፣ ጥንዶቹ በሌሎቹ ቁልፎች ይገኛሉ።
+#   3. ጥንዶቹ በስም (fuzzy)፣ በትውልድ ቀን እና በአድራሻ ይመዘናሉ፤ ከ DUPLICATE_THRESHOLD በላይ
+#      የሆኑት DuplicateCandidate ሆነው admin ውስጥ ለውሳኔ ይቀርባሉ።
+#
+# `find_duplicates` ቁልፍ የሌላቸውን (አዲስ የተመዘገቡ ወይም ስም/ቀን/አድራሻ የቀየሩ፤ signals
+# ቁልፎቻቸውን ይሰርዛሉ) አባላት ብቻ ያስኬዳል።
+
+from difflib import SequenceMatcher
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from . import engagement
+from .models import Attendance, DuplicateCandidate, Member, MemberBlockingKey
+from .text import name_tokens, phonetic_key
+
+DUPLICATE_THRESHOLD = 0.8
+MAX_BLOCK_SIZE = 500
+BATCH_SIZE = 1000
+
+# ቁልፎቹ እና ውጤቱ የሚመሰረቱባቸው መስኮች፤ ሲቀየሩ አባሉ እንደገና ይመረመራል
+KEY_FIELDS = ('full_name', 'date_of_birth', 'region', 'zone', 'woreda')
+_COMPARE_FIELDS = ('pk', 'full_name', 'date_of_birth', 'region', 'zone', 'woreda', 'email', 'is_active')
+
+
+def blocking_keys(member):
+    dob = member.date_of_birth
+    keys = {f"n:{phonetic_key(token)}:{dob.year}" for token in name_tokens(member.full_name) if len(token) > 1}
+    keys.add(f"d:{dob.isoformat()}:{member.region}")
+    return keys
+
+
+def name_similarity(name_a, name_b):
+    """0–1 similarity of two names in either script, tolerant of spelling variants and a missing grandfather's name."""
+    tokens_a, tokens_b = name_tokens(name_a), name_tokens(name_b)
+    if not tokens_a or not tokens_b:
+        return 0.0
+    if len(tokens_a) > len(tokens_b):
+        tokens_a, tokens_b = tokens_b, tokens_a
+    # ስሞቹ በቅደም ተከተል (ስም፣ የአባት ስም፣ የአያት ስም) ይነጻጸራሉ፤ የጎደለ የአያት ስም አይቀጣም
+    total = 0.0
+    for position, token in enumerate(tokens_a):
+        in_place = SequenceMatcher(None, token, tokens_b[position]).ratio()
+        anywhere = max(SequenceMatcher(None, token, other).ratio() for other in tokens_b)
+        total += max(in_place, 0.9 * anywhere)
+    return total / len(tokens_a)
+
+
+def _same_place(value_a, value_b):
+    return bool(value_a) and value_a.strip().casefold() == (value_b or '').strip().casefold()
+
+
+def score(a, b):
+    """Return (score, reasons) for members `a` and `b`; 1.0 means almost certainly the same person."""
+    reasons = []
+    names = name_similarity(a.full_name, b.full_name)
+    reasons.append(f"ስም {names:.2f}")
+    total = 0.6 * names
+
+    dob_a, dob_b = a.date_of_birth, b.date_of_birth
+    if dob_a == dob_b:
+        total += 0.25
+        reasons.append("የትውልድ ቀን")
+    elif dob_a.year == dob_b.year and (dob_a.month, dob_a.day) == (dob_b.day, dob_b.month):
+        # ቀን እና ወር ተቀያይረው የተጻፉ
+        total += 0.2
+        reasons.append("የትውልድ ቀን (ቀን/ወር ተቀያይሯል)")
+    elif dob_a.year == dob_b.year:
+        total += 0.1
+        reasons.append("የትውልድ ዓመት")
+
+    if a.region == b.region:
+        total += 0.05
+        reasons.append("ክልል")
+        for field, label in (('zone', "ዞን"), ('woreda', "ወረዳ")):
+            if _same_place(getattr(a, field), getattr(b, field)):
+                total += 0.05
+                reasons.append(label)
+
+    if a.email and b.email and a.email.strip().lower() == b.email.strip().lower():
+        total = max(total, 0.95)
+        reasons.append("ኢሜይል")
+    return round(min(total, 1.0), 3), ', '.join(reasons)
+
+
+def _usable_keys(keys):
+    sizes = dict(
+        MemberBlockingKey.objects.filter(key__in=keys).values('key').annotate(size=Count('id'))
+        .values_list('key', 'size').order_by()
+    )
+    return {key for key in keys if 1 < sizes.get(key, 0) <= MAX_BLOCK_SIZE}
+
+
+def process(members, threshold=DUPLICATE_THRESHOLD):
+    """
+    Index `members` (Member objects with the KEY_FIELDS loaded) and record
+    DuplicateCandidate rows for every pair above `threshold` that shares a
+    blocking key with one of them. Returns the number of new candidates.
+    """
+    member_keys = {member.pk: blocking_keys(member) for member in members}
+    if not member_keys:
+        return 0
+    with transaction.atomic():
+        MemberBlockingKey.objects.filter(member_id__in=member_keys).delete()
+        MemberBlockingKey.objects.bulk_create([
+            MemberBlockingKey(member_id=member_id, key=key)
+            for member_id, keys in member_keys.items() for key in keys
+        ])
+
+    keys = _usable_keys(set().union(*member_keys.values()))
+    blocks = {}
+    for key, member_id in (
+        MemberBlockingKey.objects.filter(key__in=keys, member__is_active=True).values_list('key', 'member_id')
+    ):
+        blocks.setdefault(key, []).append(member_id)
+    pairs = set()
+    for member_id, own_keys in member_keys.items():
+        for key in own_keys & keys:
+            pairs.update((min(member_id, other), max(member_id, other)) for other in blocks.get(key, ()) if other != member_id)
+    if not pairs:
+        return 0
+
+    ids = {member_id for pair in pairs for member_id in pair}
+    loaded = {member.pk: member for member in Member.objects.filter(pk__in=ids).only(*_COMPARE_FIELDS)}
+    candidates = []
+    for id_a, id_b in pairs:
+        a, b = loaded.get(id_a), loaded.get(id_b)
+        if a is None or b is None:
+            continue
+        value, reasons = score(a, b)
+        if value >= threshold:
+            candidates.append(DuplicateCandidate(member_a=a, member_b=b, score=value, reasons=reasons))
+    before = DuplicateCandidate.objects.count()
+    DuplicateCandidate.objects.bulk_create(candidates, ignore_conflicts=True)
+    return DuplicateCandidate.objects.count() - before
+
+
+def find_new(batch_size=BATCH_SIZE, threshold=DUPLICATE_THRESHOLD, progress=None):
+    """Process active members that have no blocking keys yet, in primary-key order; returns (members, candidates)."""
+    pending = (
+        Member.objects.filter(is_active=True, blocking_keys__isnull=True)
+        .only(*_COMPARE_FIELDS).order_by('pk')
+    )
+    last_pk = 0
+    totals = [0, 0]
+    while True:
+        chunk = list(pending.filter(pk__gt=last_pk)[:batch_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        totals[0] += len(chunk)
+        totals[1] += process(chunk, threshold)
+        if progress:
+            progress(*totals)
+    return tuple(totals)
+
+
+def clear_keys(member_ids=None):
+    keys = MemberBlockingKey.objects.all()
+    if member_ids is not None:
+        keys = keys.filter(member_id__in=member_ids)
+    keys.delete()
+
+
+@transaction.atomic
+def merge_members(keep, drop):
+    """
+    Fold `drop` into `keep`: move its attendance (keeping the better record for
+    meetings both attended), fill keep's blank optional fields, deactivate drop
+    and mark their pending candidates as resolved.
+    """
+    kept = dict(Attendance.objects.filter(member=keep).values_list('meeting_id', 'is_present'))
+    deltas = []
+    overlap = []
+    upgrade = []
+    for meeting_id, is_present in Attendance.objects.filter(member=drop).values_list('meeting_id', 'is_present'):
+        if meeting_id not in kept:
+            deltas += [(drop.pk, meeting_id, -1, -int(is_present)), (keep.pk, meeting_id, 1, int(is_present))]
+            continue
+        overlap.append(meeting_id)
+        if is_present and not kept[meeting_id]:
+            upgrade.append(meeting_id)
+            deltas.append((keep.pk, meeting_id, 0, 1))
+    Attendance.objects.filter(member=keep, meeting_id__in=upgrade).update(is_present=True)
+    # የሁለቱም የሆኑ ረድፎች ሲሰረዙ ድምሮቹ በ signals ይስተካከላሉ
+    Attendance.objects.filter(member=drop, meeting_id__in=overlap).delete()
+    Attendance.objects.filter(member=drop).update(member=keep)
+    engagement.apply_deltas(deltas)
+
+    changed = []
+    for field in ('email', 'kebele', 'photo'):
+        if not getattr(keep, field) and getattr(drop, field):
+            setattr(keep, field, getattr(drop, field))
+            changed.append(field)
+    if changed:
+        keep.save(update_fields=changed + ['updated_at'])
+    drop.is_active = False
+    drop.save(update_fields=['is_active', 'updated_at'])
+
+    involved = Q(member_a__in=[keep, drop]) & Q(member_b__in=[keep, drop])
+    DuplicateCandidate.objects.filter(involved).update(status=DuplicateCandidate.MERGED)
+    # ሌሎች በ drop ላይ ያሉ ጥንዶች ከእንግዲህ አይጠቅሙም
+    DuplicateCandidate.objects.filter(
+        Q(member_a=drop) | Q(member_b=drop), status=DuplicateCandidate.PENDING,
+    ).update(status=DuplicateCandidate.DISMISSED)
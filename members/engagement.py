@@ -0,0 +1,173 @@
+# members/engagement.py
+#
+# የስብሰባ ተሳትፎ ማጠቃለያዎች (attendance rollups)
+#
+# ለእያንዳንዱ አባል፣ ስብሰባ እና ክልል የተመዘገቡ/የተገኙ ብዛቶች በራሳቸው ሠንጠረዦች ይቀመጣሉ፤
+# ዳሽቦርዱ እና የአባል ገጹ ሙሉውን Attendance ሠንጠረዥ አይቆጥሩም። Attendance ሲጻፍ
+# (በ admin፣ በ signals) ወይም check-ins በ bulk ሲጻፉ (members/checkin.py) ለውጦቹ
+# (deltas) ተደምረው በጥቂት UPDATE ይተገበራሉ። `rebuild_engagement` ሁሉንም ከዜሮ ያሰላል።
+#
+# ክልሉ የአባሉ የአሁኑ ክልል ነው፤ አባሉ ክልል ሲቀይር ድምሩ ከአሮጌው ወደ አዲሱ ይዛወራል።
+
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import (
+    Attendance, Meeting, MeetingAttendanceStat, Member, MemberEngagement, RegionEngagement,
+)
+
+
+def _ensure_rows(model, field, values):
+    model.objects.bulk_create([model(**{field: value}) for value in values], ignore_conflicts=True)
+
+
+def _increment(queryset, recorded, attended, **extra):
+    if recorded or attended or extra:
+        queryset.update(recorded=F('recorded') + recorded, attended=F('attended') + attended, **extra)
+
+
+def refresh_last_attended(member_ids, exclude_meeting=None):
+    # መገኘት ሲቀነስ (ሲሰረዝ/absent ሲሆን) የመጨረሻው ቀን በ O(1) አይታወቅም፤ ለእነዚህ አባላት ብቻ እንደገና ይሰላል
+    rows = Attendance.objects.filter(member_id__in=member_ids, is_present=True)
+    if exclude_meeting is not None:
+        rows = rows.exclude(meeting_id=exclude_meeting)
+    latest = dict(
+        rows.values('member_id').annotate(last=Max('meeting__date')).values_list('member_id', 'last')
+        .order_by()
+    )
+    for member_id in member_ids:
+        MemberEngagement.objects.filter(member_id=member_id).update(last_attended=latest.get(member_id))
+
+
+@transaction.atomic
+def apply_deltas(deltas, exclude_meeting=None):
+    """
+    Apply attendance changes to the rollups. `deltas` is an iterable of
+    (member_id, meeting_id, recorded_delta, attended_delta) tuples.
+    """
+    net = defaultdict(lambda: [0, 0])
+    for member_id, meeting_id, recorded, attended in deltas:
+        net[(member_id, meeting_id)][0] += recorded
+        net[(member_id, meeting_id)][1] += attended
+    net = {key: value for key, value in net.items() if any(value)}
+    if not net:
+        return
+
+    member_ids = {member_id for member_id, meeting_id in net}
+    meeting_ids = {meeting_id for member_id, meeting_id in net}
+    regions = dict(Member.objects.filter(pk__in=member_ids).values_list('pk', 'region'))
+    meeting_dates = dict(Meeting.objects.filter(pk__in=meeting_ids).values_list('pk', 'date'))
+
+    _ensure_rows(MemberEngagement, 'member_id', regions)
+    _ensure_rows(MeetingAttendanceStat, 'meeting_id', meeting_dates)
+    _ensure_rows(RegionEngagement, 'region', set(regions.values()))
+
+    # አባላት፡ ተመሳሳይ ለውጥ ያላቸው በአንድ UPDATE (ለምሳሌ የአንድ ስብሰባ check-ins በሙሉ)
+    by_change = defaultdict(list)
+    lowered = set()
+    meeting_totals = defaultdict(lambda: [0, 0])
+    region_totals = defaultdict(lambda: [0, 0])
+    for (member_id, meeting_id), (recorded, attended) in net.items():
+        if member_id not in regions:
+            continue
+        attended_on = meeting_dates.get(meeting_id) if attended > 0 else None
+        by_change[(recorded, attended, attended_on)].append(member_id)
+        if attended < 0:
+            lowered.add(member_id)
+        if meeting_id in meeting_dates:
+            meeting_totals[meeting_id][0] += recorded
+            meeting_totals[meeting_id][1] += attended
+        region_totals[regions[member_id]][0] += recorded
+        region_totals[regions[member_id]][1] += attended
+
+    for (recorded, attended, attended_on), ids in by_change.items():
+        extra = {}
+        if attended_on is not None:
+            extra['last_attended'] = Greatest(Coalesce('last_attended', Value(attended_on)), Value(attended_on))
+        _increment(MemberEngagement.objects.filter(member_id__in=ids), recorded, attended, **extra)
+    for meeting_id, (recorded, attended) in meeting_totals.items():
+        _increment(MeetingAttendanceStat.objects.filter(meeting_id=meeting_id), recorded, attended)
+    for region, (recorded, attended) in region_totals.items():
+        _increment(RegionEngagement.objects.filter(region=region), recorded, attended)
+    if lowered:
+        refresh_last_attended(lowered, exclude_meeting)
+
+
+def attendance_deltas(old, new):
+    # old/new = (member_id, meeting_id, is_present) ወይም None
+    deltas = []
+    if old is not None:
+        deltas.append((old[0], old[1], -1, -int(old[2])))
+    if new is not None:
+        deltas.append((new[0], new[1], 1, int(new[2])))
+    return deltas
+
+
+def is_cascade(origin):
+    # Attendance በ Member/Meeting መሰረዝ ምክንያት ሲሰረዝ ለውጡ በ member_deleted/meeting_deleted ተቆጥሯል
+    model = origin.model if hasattr(origin, 'model') else type(origin)
+    return model is not Attendance
+
+
+def member_deleted(member):
+    rows = Attendance.objects.filter(member=member).values_list('meeting_id', 'is_present')
+    apply_deltas((member.pk, meeting_id, -1, -int(is_present)) for meeting_id, is_present in rows)
+
+
+def meeting_deleted(meeting):
+    rows = Attendance.objects.filter(meeting=meeting).values_list('member_id', 'is_present')
+    apply_deltas(
+        ((member_id, meeting.pk, -1, -int(is_present)) for member_id, is_present in rows),
+        exclude_meeting=meeting.pk,
+    )
+
+
+def move_member_region(member_id, old_region, new_region):
+    engagement = MemberEngagement.objects.filter(member_id=member_id).values_list('recorded', 'attended').first()
+    if not engagement or old_region == new_region:
+        return
+    recorded, attended = engagement
+    with transaction.atomic():
+        _ensure_rows(RegionEngagement, 'region', [new_region])
+        _increment(RegionEngagement.objects.filter(region=old_region), -recorded, -attended)
+        _increment(RegionEngagement.objects.filter(region=new_region), recorded, attended)
+
+
+@transaction.atomic
+def rebuild():
+    MemberEngagement.objects.all().delete()
+    MeetingAttendanceStat.objects.all().delete()
+    RegionEngagement.objects.all().delete()
+    present = Count('id', filter=Q(is_present=True))
+
+    members = (
+        Attendance.objects.values('member_id')
+        .annotate(recorded=Count('id'), attended=present, last_attended=Max('meeting__date', filter=Q(is_present=True)))
+        .order_by()
+    )
+    MemberEngagement.objects.bulk_create((MemberEngagement(**row) for row in members.iterator()), batch_size=2000)
+    meetings = Attendance.objects.values('meeting_id').annotate(recorded=Count('id'), attended=present).order_by()
+    MeetingAttendanceStat.objects.bulk_create(MeetingAttendanceStat(**row) for row in meetings)
+    regions = (
+        Attendance.objects.values(region=F('member__region'))
+        .annotate(recorded=Count('id'), attended=present).order_by()
+    )
+    RegionEngagement.objects.bulk_create(RegionEngagement(**row) for row in regions)
+    return MemberEngagement.objects.count()
+
+
+def engagement_summary(region_rows):
+    """Totals across RegionEngagement rows (at most one per region)."""
+    totals = Counter()
+    for recorded, attended in region_rows.values_list('recorded', 'attended'):
+        totals['recorded'] += recorded
+        totals['attended'] += attended
+    recorded = totals['recorded']
+    return {
+        'recorded': recorded,
+        'attended': totals['attended'],
+        'attendance_rate': round(100 * totals['attended'] / recorded, 1) if recorded > 0 else None,
+    }
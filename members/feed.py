@@ -0,0 +1,64 @@
+# members/feed.py
+#
+# የማስታወቂያዎች ገጽ (announcement feed) cache
+#
+# የእያንዳንዱ ገጽ የማስታወቂያ ዝርዝር አንዴ ተሰርቶ በ `default` cache ይቀመጣል። ቁልፉ
+# የ feed "version" ይይዛል፤ version ከዳታቤዝ ይሰላል (የመጨረሻው updated_at እና የማስታወቂያዎቹ
+# ብዛት፣ በአንድ ትንሽ aggregate query)፣ ስለዚህ ማስታወቂያ ሲቀመጥ/ሲሰረዝ ለሁሉም workers ወዲያው
+# ይቀየራል፣ የድሮዎቹ ገጾች በራሳቸው ጊዜ ያልፍባቸዋል (መሰረዝ አያስፈልግም)። የመጨረሻው ለውጥ ጊዜ
+# ለ Last-Modified/ETag ያገለግላል። የ'አዲስ' ባጆቹ በቀን ስለሚቀየሩ (`badge_day`) ቀኑም የቁልፉ
+# እና የ ETag አካል ነው።
+#
+# ማሳሰቢያ፡ QuerySet.update() updated_at ን ስለማይቀይር ማስታወቂያዎች በ save() መቀየር አለባቸው።
+
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count, Max
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import Announcement
+
+ANNOUNCEMENTS_PER_PAGE = 10
+NEW_BADGE_DAYS = 7
+
+
+def current_version():
+    """(Unix timestamp of the latest announcement change, announcement count), read from the database."""
+    latest = Announcement.objects.aggregate(updated=Max('updated_at'), count=Count('pk'))
+    return (latest['updated'].timestamp() if latest['updated'] else 0.0, latest['count'])
+
+
+def badge_day():
+    """Today's local midnight; the 'new' badges (and so the rendered pages) change only at this point."""
+    return timezone.make_aware(datetime.combine(timezone.localdate(), datetime.min.time()))
+
+
+def page_number(value):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return 1
+    return max(number, 1)
+
+
+def render_page(number, version=None, day=None):
+    """Return the rendered feed HTML for page `number`, from the cache when the version and day match."""
+    version = current_version() if version is None else version
+    day = day or badge_day()
+    updated, count = version
+    key = f"announcements:page:{updated:.6f}-{count}:{day.date().isoformat()}:{number}"
+    html = cache.get(key)
+    if html is None:
+        paginator = Paginator(Announcement.objects.order_by('-date_posted', '-id'), ANNOUNCEMENTS_PER_PAGE)
+        page = paginator.get_page(number)
+        html = render_to_string('members/announcement_feed.html', {
+            'announcements': page,
+            # ከ 7 ቀናት ወዲህ የተለጠፉት 'አዲስ' ይባላሉ (ባጁ የሚጠፋው እኩለ ሌሊት ላይ ነው)
+            'new_since': day - timedelta(days=NEW_BADGE_DAYS),
+        })
+        cache.set(key, html, settings.FEED_CACHE_TIMEOUT)
+    return html
@@ -0,0 +1,55 @@
+# members/filters.py
+
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+from .models import REGION_CHOICES
+from .search import search_members
+from .units import UNIT_FIELDS
+
+
+def resolve_region_codes(value):
+    # ክልል በኮድ (AMH) ወይም በስም (አማራ) ሊፈለግ ይችላል።
+    # ኮዶቹን ቀድመን በማግኘት `region__in` እንጠቀማለን፤ ይህም index ይጠቀማል።
+    needle = value.strip().casefold()
+    return [
+        code for code, label in REGION_CHOICES
+        if needle in code.casefold() or needle in label.casefold()
+    ]
+
+
+def _day_start(value):
+    try:
+        day = datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def filter_members(queryset, params, ranked=False):
+    """
+    Apply the member list filters (`query`, `region`, `zone_unit`/`woreda_unit`/
+    `kebele_unit`, `start_date`, `end_date`) from GET params. With `ranked=True`
+    a `query` orders the rows best match first.
+    """
+    query = (params.get('query') or '').strip()
+    region = (params.get('region') or '').strip()
+    start = _day_start(params.get('start_date'))
+    end = _day_start(params.get('end_date'))
+
+    if query:
+        queryset = search_members(queryset, query, ranked)
+    if region:
+        queryset = queryset.filter(region__in=resolve_region_codes(region))
+    # የዳሽቦርዱ drill-down አገናኞች፤ እያንዳንዱ የክፍል foreign key index አለው
+    for field in UNIT_FIELDS:
+        value = (params.get(field) or '').strip()
+        if value.isdigit():
+            queryset = queryset.filter(**{f'{field}_id': int(value)})
+    # የቀን ገደቦችን በ datetime ክልል እንገልጻለን (`__date` ሳይሆን) ስለዚህ index ይሰራል
+    if start:
+        queryset = queryset.filter(date_joined__gte=start)
+    if end:
+        queryset = queryset.filter(date_joined__lt=end + timedelta(days=1))
+    return queryset
@@ -0,0 +1,51 @@
+# members/identity.py
+#
+# የገባው ተጠቃሚ የአባልነት መገለጫ (request.member)
+#
+# MemberMiddleware request.member ን lazy አድርጎ ያዘጋጃል፡ መጀመሪያ ሲነካ ብቻ ይጫናል፣ በ user
+# object ላይ ለ request ይቀመጣል፣ በ `default` cache ደግሞ ለሚቀጥሉት requests። Member ሲቀመጥ/
+# ሲሰረዝ (ወይም ፎቶው በ members/images.py ሲዘምን) በ signals ይሰረዛል። ስለዚህ የአባል ገጾች
+# ከ session (cached_db) እና ከ user ውጪ ዳታቤዝ አይጠይቁም።
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from . import routing
+from .models import Member
+
+# መገለጫ የሌላቸው ተጠቃሚዎችም (ለምሳሌ staff) ይቀመጣሉ፤ cache ውስጥ None ከ "የለም" ለመለየት
+_MISSING = object()
+
+
+def _cache_key(user_id):
+    return f"member-profile:{user_id}"
+
+
+def get_member(user):
+    """Return the user's Member (or None), from the user object or the cache when possible."""
+    if not user.is_authenticated:
+        return None
+    if hasattr(user, '_member_profile'):
+        return user._member_profile
+    key = _cache_key(user.pk)
+    member = cache.get(key, _MISSING)
+    if member is _MISSING:
+        # cache ውስጥ ስለሚቆይ replica ላይ ካሉ views ቢጠራም ከ primary ይነበባል (members/routing.py)
+        with routing.primary():
+            member = Member.objects.filter(user_id=user.pk).first()
+        cache.set(key, member, settings.MEMBER_PROFILE_CACHE_TIMEOUT)
+    if member is not None:
+        # member.user ተጨማሪ query እንዳያስፈልገው (cache ውስጥ አይገባም)
+        member.user = user
+    user._member_profile = member
+    return member
+
+
+async def aget_member(request):
+    user = await request.auser()
+    return await sync_to_async(get_member)(user)
+
+
+def invalidate(user_ids):
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids if user_id is not None])
@@ -0,0 +1,141 @@
+# members/images.py
+#
+# የአባላት ፎቶ ማቀነባበሪያ (photo pipeline)
+#
+# አዲስ ፎቶ ሲጫን ከ request ውጪ (በ background thread) የሚከተሉት ይሰራሉ፡
+#   1. አቅጣጫ (EXIF orientation) ይስተካከላል፣ metadata (EXIF/GPS) ይወገዳል፣ ዋናው ፎቶ
+#      ቢበዛ ORIGINAL_MAX_SIZE ፒክሰል ወደሆነ JPEG ይቀየራል።
+#   2. ለእያንዳንዱ መጠን (VARIANTS) WebP እና JPEG ቅጂዎች ይፈጠራሉ።
+# ቴምፕሌቶቹ ቅጂዎቹን በ {% member_photo %} (srcset) ይጠቀማሉ፤ ገና ካልተዘጋጁ ዋናውን ፎቶ ያሳያሉ።
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from . import identity
+from .models import Member
+
+logger = logging.getLogger(__name__)
+
+ORIGINAL_MAX_SIZE = 1600
+# መጠን (ፒክሰል፣ ካሬ)፡ thumb/medium ለገጾች (1x/2x)፣ card ለሚታተም መታወቂያ
+VARIANTS = {
+    'thumb': 160,
+    'medium': 320,
+    'card': 600,
+}
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+VARIANT_DIR = 'member_photos/variants'
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='member-photos')
+
+
+def variant_name(photo_name, variant, extension):
+    stem = os.path.splitext(os.path.basename(photo_name))[0]
+    return f"{VARIANT_DIR}/{stem}_{variant}.{extension}"
+
+
+def variant_url(photo_name, variant, extension):
+    return default_storage.url(variant_name(photo_name, variant, extension))
+
+
+def _encode(image, extension):
+    image_format, options = FORMATS[extension]
+    buffer = BytesIO()
+    # metadata ሳይካተት እናስቀምጣለን (exif= አልተሰጠም)
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def _replace(name, data):
+    # ቅጂዎች ብቻ፤ ስማቸው ከዋናው ፎቶ ስለሚወሰድ ቋሚ መሆን አለበት (ከጠፉም እንደገና ይፈጠራሉ)
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(data))
+
+
+def _delete(names):
+    for name in names:
+        if default_storage.exists(name):
+            default_storage.delete(name)
+
+
+def _variant_names(photo_name):
+    return [variant_name(photo_name, variant, extension) for variant in VARIANTS for extension in FORMATS]
+
+
+def normalise(fp):
+    image = Image.open(fp)
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    image.thumbnail((ORIGINAL_MAX_SIZE, ORIGINAL_MAX_SIZE))
+    return image
+
+
+def process_member_photo(member_id):
+    member = Member.objects.filter(pk=member_id).only('id', 'photo', 'user').first()
+    if member is None or not member.photo:
+        return False
+    source_name = member.photo.name
+
+    with default_storage.open(source_name) as fp:
+        image = normalise(fp)
+
+    # ዋናው ፎቶ ያለ metadata በአዲስ ስም ይጻፋል (ያለው ፋይል አይተካም፤ ስሙ ከተያዘ storage ሌላ ስም
+    # ይመርጣል)፤ የድሮው ፋይል የሚሰረዘው መስኩ ወደ አዲሱ ከተቀየረ በኋላ ነው፣ ስለዚህ storage ቢወድቅ ፎቶው አይጠፋም
+    stem = os.path.splitext(source_name)[0]
+    cleaned_name = default_storage.save(f"{stem}.jpg", ContentFile(_encode(image.convert('RGB'), 'jpg')))
+
+    for variant, size in VARIANTS.items():
+        square = ImageOps.fit(image, (size, size), Image.LANCZOS).convert('RGB')
+        for extension in FORMATS:
+            _replace(variant_name(cleaned_name, variant, extension), _encode(square, extension))
+
+    # update() signals አይጠራም፤ ፎቶው በመሃል ከተቀየረ (ሌላ upload) ምንም አንቀይርም
+    updated = Member.objects.filter(pk=member_id, photo=source_name).update(
+        photo=cleaned_name, photo_variants_ready=True, updated_at=timezone.now(),
+    )
+    if not updated:
+        _delete([cleaned_name, *_variant_names(cleaned_name)])
+        return False
+    identity.invalidate([member.user_id])
+    _delete([source_name])
+    # የድሮው ስም ቅጂዎች (ከቀድሞ ሂደት)፤ ስሙ ተመሳሳይ ከሆነ (a.png -> a.jpg) አዲሶቹ ናቸው
+    old_variants = set(_variant_names(source_name)) - set(_variant_names(cleaned_name))
+    _delete(old_variants)
+    return True
+
+
+def _run(member_id):
+    try:
+        process_member_photo(member_id)
+    except Exception:
+        logger.exception("Processing photo for member %s failed", member_id)
+
+
+def _run_in_background(member_id):
+    try:
+        _run(member_id)
+    finally:
+        # የዚህ thread የዳታቤዝ ግንኙነት ብቻ ይዘጋል
+        connections.close_all()
+
+
+def schedule(member_id):
+    """Process the member's photo in the background once the current transaction commits."""
+    if getattr(settings, 'PHOTO_PROCESSING_SYNC', False):
+        transaction.on_commit(lambda: _run(member_id))
+    else:
+        transaction.on_commit(lambda: _executor.submit(_run_in_background, member_id))
@@ -0,0 +1,134 @@
+# members/importing.py
+#
+# የወረቀት ምዝገባዎችን በብዛት ለማስገባት (bulk member import)
+#
+# ረድፎች እንደ MemberCreationForm ይረጋገጣሉ፣ ነገር ግን የስልክ ቁጥር ድግግሞሽ በ batch
+# አንድ ጊዜ ብቻ ይጠየቃል። User እና Member በ bulk_create ይፈጠራሉ፤ የይለፍ ቃል
+# hashing በ process pool ይሰራል። bulk_create signals ስለማይጠራ የፍለጋ index እና
+# የዳሽቦርድ ስታቲስቲክስ (የአስተዳደር ክፍሎች ብዛትም) እዚሁ ይታደሳሉ።
+
+from collections import defaultdict
+
+from django import forms
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from . import search, stats, units
+from .forms import MemberCreationForm
+from .models import Member, MembershipCounter
+
+
+class MemberImportForm(MemberCreationForm):
+    # ፎቶ በ import አይመጣም፤ የይለፍ ቃል ከሌለ አባሉ በ "የይለፍ ቃል ረሳሁ" ያዘጋጃል
+    password = forms.CharField(required=False)
+    confirm_password = forms.CharField(required=False)
+
+    class Meta(MemberCreationForm.Meta):
+        fields = [name for name in MemberCreationForm.Meta.fields if name != 'photo']
+
+    def clean_phone_number(self):
+        # ድግግሞሽ በ find_existing_phones() በ batch ይረጋገጣል
+        return self.cleaned_data.get('phone_number')
+
+    def validate_unique(self):
+        pass
+
+
+def validate_row(data):
+    data = {key: (value.strip() if isinstance(value, str) else value) for key, value in data.items()}
+    if data.get('password') and not data.get('confirm_password'):
+        data['confirm_password'] = data['password']
+    form = MemberImportForm(data)
+    if form.is_valid():
+        return form, None
+    errors = '; '.join(
+        f"{field}: {' '.join(messages)}" for field, messages in form.errors.items()
+    )
+    return None, errors
+
+
+def find_existing_phones(phones):
+    phones = list(phones)
+    existing = set(User.objects.filter(username__in=phones).values_list('username', flat=True))
+    existing.update(Member.objects.filter(phone_number__in=phones).values_list('phone_number', flat=True))
+    return existing
+
+
+def validate_rows(rows, seen_phones=None):
+    """
+    Validate (key, data) rows. Returns (valid [(key, form)], errors [(key,
+    phone, message)]); phone numbers are checked against the database in one
+    query and against each other (and `seen_phones`, which is updated).
+    """
+    seen_phones = set() if seen_phones is None else seen_phones
+    valid, errors = [], []
+    for key, data in rows:
+        if '__error__' in data:
+            errors.append((key, '', data['__error__']))
+            continue
+        form, message = validate_row(data)
+        if form is None:
+            errors.append((key, data.get('phone_number', ''), message))
+        else:
+            valid.append((key, form))
+
+    # ስልክ ቁጥሮችን በአንድ query እናረጋግጣለን (በ batch ውስጥ የተደጋገሙትንም)
+    existing = find_existing_phones(form.cleaned_data['phone_number'] for key, form in valid)
+    unique = []
+    for key, form in valid:
+        phone = form.cleaned_data['phone_number']
+        if phone in existing or phone in seen_phones:
+            errors.append((key, phone, 'phone_number: ይህ ስልክ ቁጥር ቀደም ብሎ ተመዝግቧል!'))
+            continue
+        seen_phones.add(phone)
+        unique.append((key, form))
+    return unique, errors
+
+
+def hash_passwords(passwords, executor=None):
+    # ባዶ የይለፍ ቃል -> unusable password (hashing አያስፈልገውም)
+    hashed = [None] * len(passwords)
+    todo = [(index, password) for index, password in enumerate(passwords) if password]
+    if todo:
+        values = [password for index, password in todo]
+        results = executor.map(make_password, values, chunksize=32) if executor else map(make_password, values)
+        for (index, password), value in zip(todo, results):
+            hashed[index] = value
+    return [value or make_password(None) for value in hashed]
+
+
+def create_members(forms, password_hashes):
+    """Insert one batch of validated forms: one bulk INSERT for users, one for members."""
+    users = [
+        User(username=form.cleaned_data['phone_number'], password=password_hash)
+        for form, password_hash in zip(forms, password_hashes)
+    ]
+    return insert_members(users, [form.save(commit=False) for form in forms])
+
+
+@transaction.atomic
+def insert_members(users, members):
+    """
+    Bulk insert unsaved users and their members (paired by position), allocating
+    membership IDs per (region, year) and updating the search index, stats and
+    administrative unit counts.
+    """
+    users = User.objects.bulk_create(users)
+    for member, user in zip(members, users):
+        member.user = user
+
+    # መለያ ቁጥሮች ለእያንዳንዱ (ክልል, ዓመት) በአንድ ጊዜ ይያዛሉ፤ ከዚያ አንድ INSERT ብቻ
+    groups = defaultdict(list)
+    for member in members:
+        groups[(member.region, member.date_joined.year)].append(member)
+    for (region, year), group in groups.items():
+        for member, number in zip(group, MembershipCounter.allocate(region, year, len(group))):
+            member.membership_id = member.build_membership_id(number)
+    units.assign_members(members)
+    members = Member.objects.bulk_create(members)
+
+    search.index_members(members, replace=False)
+    stats.apply_members(members)
+    units.apply_members(members)
+    return members
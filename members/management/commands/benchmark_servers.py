@@ -0,0 +1,93 @@
+# members/management/commands/benchmark_servers.py
+
+import json
+import os
+import socket
+import subprocess
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from members import benchmark
+
+SERVER_MODES = ('wsgi', 'asgi')
+
+
+def _wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError(f'gunicorn exited with status {process.returncode}')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f'gunicorn did not start listening on port {port}')
+
+
+class Command(BaseCommand):
+    help = (
+        'Starts gunicorn in WSGI and ASGI mode (gunicorn.conf.py) against the configured database, '
+        'loads the read-heavy pages concurrently and prints the comparison as JSON. '
+        'Creates a staff user named "benchmark-staff"; run it against a seeded staging database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--modes', default=','.join(SERVER_MODES), help='Comma-separated: wsgi,asgi.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per page.')
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--workers', type=int, default=2, help='gunicorn worker processes.')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--url', help='Load an already running server instead of starting gunicorn.')
+        parser.add_argument('--output', help='Write the JSON here instead of stdout.')
+
+    def handle(self, *args, **options):
+        modes = [mode.strip() for mode in options['modes'].split(',') if mode.strip()]
+        if not options['url'] and (not modes or set(modes) - set(SERVER_MODES)):
+            raise CommandError(f"--modes must be chosen from {', '.join(SERVER_MODES)}.")
+        if options['requests'] < 1 or options['concurrency'] < 1:
+            raise CommandError('--requests and --concurrency must be positive.')
+
+        targets, cookie = benchmark.load_targets()
+        report = {
+            'started_at': timezone.now().isoformat(),
+            'environment': benchmark.environment(),
+            'workers': options['workers'],
+            'results': [],
+        }
+        if options['url']:
+            report['results'].append({'server': options['url'], 'views': self.load(options['url'], targets, cookie, options)})
+        for mode in [] if options['url'] else modes:
+            self.stderr.write(f'Starting gunicorn ({mode})...')
+            report['results'].append({'server': mode, 'views': self.run_server(mode, targets, cookie, options)})
+        report['finished_at'] = timezone.now().isoformat()
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fp:
+                fp.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(output)
+
+    def run_server(self, mode, targets, cookie, options):
+        port = options['port']
+        env = dict(os.environ, SERVER_MODE=mode, WEB_CONCURRENCY=str(options['workers']))
+        process = subprocess.Popen(
+            ['gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}', '--log-level', 'warning'],
+            cwd=settings.BASE_DIR, env=env,
+        )
+        try:
+            _wait_for_port(port, process)
+            return self.load(f'http://127.0.0.1:{port}', targets, cookie, options)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    def load(self, base_url, targets, cookie, options):
+        # ሙቀት ማሟሻ (caches, ግንኙነቶች)፤ አይቆጠርም
+        benchmark.run_load(base_url, targets, cookie, requests=options['concurrency'], concurrency=options['concurrency'])
+        return benchmark.run_load(base_url, targets, cookie, options['requests'], options['concurrency'])
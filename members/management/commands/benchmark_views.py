@@ -0,0 +1,71 @@
+# members/management/commands/benchmark_views.py
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from members import benchmark, seeding
+from members.models import Member
+
+
+class Command(BaseCommand):
+    help = (
+        'Times the main member views at several data sizes on a throwaway test database '
+        'and prints the results as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000', help='Comma-separated member counts.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--warmup', type=int, default=1)
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--output', help='Write the JSON here instead of stdout.')
+        parser.add_argument('--keepdb', action='store_true', help='Reuse (and keep) the test database.')
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted({int(value) for value in options['sizes'].split(',') if value.strip()})
+        except ValueError:
+            raise CommandError('--sizes must be a comma-separated list of integers.')
+        if not sizes or sizes[0] < 1:
+            raise CommandError('--sizes must contain positive member counts.')
+
+        setup_test_environment()
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        try:
+            report = {
+                'started_at': timezone.now().isoformat(),
+                'environment': benchmark.environment(),
+                'repeat': options['repeat'],
+                'results': [],
+            }
+            for size in sizes:
+                # የጎደሉትን ብቻ እንጨምራለን፤ ትልቁ መጠን የትንሹን ዳታ ይጨምራል
+                missing = size - Member.objects.count()
+                if missing > 0:
+                    self.stderr.write(f'Seeding {missing} members (total {size})...')
+                    pks = seeding.seed_members(missing, options['batch_size'], options['seed'] + size)
+                    seeding.seed_meetings(pks, max(1, missing // 5000), 200, options['seed'] + size)
+                self.stderr.write(f'Benchmarking at {size} members...')
+                report['results'].append({
+                    'members': Member.objects.count(),
+                    'views': benchmark.run_views(options['repeat'], options['warmup']),
+                })
+            report['finished_at'] = timezone.now().isoformat()
+        finally:
+            if not options['keepdb']:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fp:
+                fp.write(output + '\n')
+            self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(output)
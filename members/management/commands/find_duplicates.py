@@ -0,0 +1,38 @@
+# members/management/commands/find_duplicates.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from members import dedup
+
+
+class Command(BaseCommand):
+    help = (
+        'Finds likely duplicate members among those registered (or renamed/moved) since the last run and '
+        'lists them for review in the admin. Only members sharing a name/birth-date blocking key are compared.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=dedup.BATCH_SIZE, help='Members processed per batch.')
+        parser.add_argument(
+            '--threshold', type=float, default=dedup.DUPLICATE_THRESHOLD,
+            help='Minimum score (0-1) for a pair to be listed.',
+        )
+        parser.add_argument('--rebuild', action='store_true', help='Drop all blocking keys and re-check every member.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        if not 0 < options['threshold'] <= 1:
+            raise CommandError('--threshold must be between 0 and 1.')
+        if options['rebuild']:
+            dedup.clear_keys()
+
+        def progress(members, candidates):
+            self.stdout.write(f'  {members} members checked, {candidates} candidates')
+
+        members, candidates = dedup.find_new(
+            batch_size=options['batch_size'],
+            threshold=options['threshold'],
+            progress=progress if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Checked {members} members, found {candidates} new duplicate candidates.'))
@@ -0,0 +1,101 @@
+# members/management/commands/import_members.py
+
+import csv
+import json
+import os
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from members import importing
+from members.workers import process_pool
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports members from a CSV (with a header row) or JSONL file. Rows are validated like the '
+        'registration form, created in batches with bulk_create, and failures are written to an error report.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Defaults to the file extension.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=None, help='Password hashing processes.')
+        parser.add_argument('--errors', help='Error report CSV (default: <path>.errors.csv).')
+        parser.add_argument('--checkpoint', help='Checkpoint file (default: <path>.checkpoint.json).')
+        parser.add_argument('--resume', action='store_true', help='Skip rows committed by a previous run.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'{path} does not exist.')
+        file_format = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+        checkpoint_path = options['checkpoint'] or f'{path}.checkpoint.json'
+        errors_path = options['errors'] or f'{path}.errors.csv'
+
+        start_line = 0
+        if options['resume'] and os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as fp:
+                start_line = json.load(fp)['line']
+            self.stdout.write(f'Resuming after line {start_line}.')
+
+        created = failed = 0
+        seen_phones = set()
+        with open(path, newline='', encoding='utf-8-sig') as source, \
+                open(errors_path, 'a' if options['resume'] else 'w', newline='', encoding='utf-8') as error_file, \
+                process_pool(options['workers']) as executor:
+            error_writer = csv.writer(error_file)
+            if error_file.tell() == 0:
+                error_writer.writerow(['line', 'phone_number', 'errors'])
+
+            rows = self._read_rows(source, file_format)
+            rows = ((line, data) for line, data in rows if line > start_line)
+            while True:
+                batch = list(islice(rows, options['batch_size']))
+                if not batch:
+                    break
+
+                valid, errors = self._validate(batch, seen_phones)
+                if valid:
+                    hashes = importing.hash_passwords([form.cleaned_data['password'] for line, form in valid], executor)
+                    importing.create_members([form for line, form in valid], hashes)
+                for line, phone, message in errors:
+                    error_writer.writerow([line, phone, message])
+                error_file.flush()
+
+                created += len(valid)
+                failed += len(errors)
+                # batch ከተቀመጠ (commit) በኋላ ብቻ checkpoint እንጽፋለን
+                self._write_checkpoint(checkpoint_path, batch[-1][0], path)
+                self.stdout.write(f'Line {batch[-1][0]}: {created} created, {failed} failed.')
+
+        self.stdout.write(self.style.SUCCESS(f'Imported {created} members; {failed} rows failed (see {errors_path}).'))
+
+    def _read_rows(self, source, file_format):
+        if file_format == 'csv':
+            # line 1 ራስጌው (header) ነው
+            for line, data in enumerate(csv.DictReader(source), start=2):
+                yield line, data
+            return
+        for line, text in enumerate(source, start=1):
+            if not text.strip():
+                continue
+            try:
+                data = json.loads(text)
+            except ValueError as exc:
+                yield line, {'__error__': f'invalid JSON: {exc}'}
+                continue
+            # [] ፣ 1 ወይም "x" JSON ቢሆኑም ረድፍ አይደሉም
+            yield line, data if isinstance(data, dict) else {'__error__': 'expected a JSON object'}
+
+    def _validate(self, batch, seen_phones):
+        valid, errors = importing.validate_rows(batch, seen_phones)
+        errors.sort()
+        return valid, errors
+
+    def _write_checkpoint(self, checkpoint_path, line, path):
+        temporary = f'{checkpoint_path}.tmp'
+        with open(temporary, 'w') as fp:
+            json.dump({'source': os.path.abspath(path), 'line': line}, fp)
+        os.replace(temporary, checkpoint_path)
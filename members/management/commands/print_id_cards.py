@@ -0,0 +1,56 @@
+# members/management/commands/print_id_cards.py
+
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from members import cards
+from members.models import MEMBERSHIP_LEVEL_CHOICES, REGION_CHOICES, Member
+
+
+class Command(BaseCommand):
+    help = 'Renders print-ready ID card sheets (A4, 10 cards per sheet) as a PDF or as tiled PNG files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--region', choices=[code for code, label in REGION_CHOICES])
+        parser.add_argument('--level', choices=[code for code, label in MEMBERSHIP_LEVEL_CHOICES])
+        parser.add_argument('--ids', help='Comma-separated member IDs.')
+        parser.add_argument('--format', choices=['pdf', 'png'], default='pdf')
+        parser.add_argument('--output', required=True, help='PDF file path, or a directory for PNG sheets.')
+        parser.add_argument('--workers', type=int, default=None)
+
+    def handle(self, *args, **options):
+        values = [value.strip() for value in (options['ids'] or '').split(',') if value.strip()]
+        if not all(value.isdigit() for value in values):
+            raise CommandError('--ids must be comma-separated member IDs (numbers).')
+        ids = [int(value) for value in values]
+        if not (options['region'] or options['level'] or ids):
+            raise CommandError('Select members with --region, --level or --ids.')
+
+        queryset = cards.select_members(
+            Member.objects.all(), region=options['region'], membership_level=options['level'], ids=ids,
+        )
+        image_format = 'JPEG' if options['format'] == 'pdf' else 'PNG'
+        pages = cards.render_sheets_parallel(cards.iter_sheets(queryset), image_format, options['workers'])
+
+        sheet_count = 0
+        if options['format'] == 'pdf':
+            with open(options['output'], 'wb') as fp:
+                for chunk in cards.pdf_stream(self._counted(pages)):
+                    fp.write(chunk)
+            sheet_count = self._sheets
+        else:
+            os.makedirs(options['output'], exist_ok=True)
+            for sheet_count, data in enumerate(pages, start=1):
+                with open(os.path.join(options['output'], f'sheet_{sheet_count:05d}.png'), 'wb') as fp:
+                    fp.write(data)
+
+        self.stdout.write(self.style.SUCCESS(f'Wrote {sheet_count} sheets to {options["output"]}.'))
+
+    def _counted(self, pages):
+        self._sheets = 0
+        for data in pages:
+            self._sheets += 1
+            if self._sheets % 100 == 0:
+                self.stdout.write(f'{self._sheets} sheets rendered...')
+            yield data
@@ -0,0 +1,28 @@
+# members/management/commands/process_member_photos.py
+
+from django.core.management.base import BaseCommand
+
+from members import images
+from members.models import Member
+
+
+class Command(BaseCommand):
+    help = 'Normalises member photos and generates their thumbnail/card variants (for photos not yet processed).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Reprocess photos that already have variants.')
+
+    def handle(self, *args, **options):
+        queryset = Member.objects.exclude(photo='').exclude(photo=None)
+        if not options['all']:
+            queryset = queryset.filter(photo_variants_ready=False)
+
+        processed = failed = 0
+        for member_id in queryset.values_list('pk', flat=True).iterator():
+            try:
+                images.process_member_photo(member_id)
+                processed += 1
+            except (OSError, ValueError) as exc:
+                failed += 1
+                self.stderr.write(f'Member {member_id}: {exc}')
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} photos, {failed} failed.'))
@@ -0,0 +1,22 @@
+# members/management/commands/prune_change_log.py
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from members import changelog
+
+
+class Command(BaseCommand):
+    help = 'Deletes change log entries older than the retention period (CHANGE_LOG_RETENTION_DAYS), oldest first.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than', type=int, default=None, metavar='DAYS',
+            help='Retention in days (default: CHANGE_LOG_RETENTION_DAYS).',
+        )
+        parser.add_argument('--chunk-size', type=int, default=changelog.PRUNE_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        days = options['older_than'] if options['older_than'] is not None else settings.CHANGE_LOG_RETENTION_DAYS
+        deleted = changelog.prune(days, options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} change log entries older than {days} days.'))
@@ -0,0 +1,19 @@
+# members/management/commands/rebuild_administrative_units.py
+
+from django.core.management.base import BaseCommand
+
+from members import units
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the active member count of every administrative unit (zone, woreda, kebele).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reassign', action='store_true',
+            help="Also re-match every member's zone/woreda/kebele text to units (after changing the matching rules).",
+        )
+
+    def handle(self, *args, **options):
+        count = units.rebuild(reassign=options['reassign'])
+        self.stdout.write(self.style.SUCCESS(f'Recounted {count} administrative units.'))
@@ -0,0 +1,13 @@
+# members/management/commands/rebuild_engagement.py
+
+from django.core.management.base import BaseCommand
+
+from members import engagement
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the attendance rollups (per member, meeting and region) from the Attendance table.'
+
+    def handle(self, *args, **options):
+        count = engagement.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt attendance rollups for {count} members.'))
@@ -0,0 +1,13 @@
+# members/management/commands/rebuild_member_stats.py
+
+from django.core.management.base import BaseCommand
+
+from members import stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the dashboard statistics table (MemberStat) from the Member table.'
+
+    def handle(self, *args, **options):
+        count = stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} statistics rows.'))
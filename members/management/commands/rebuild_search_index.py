@@ -0,0 +1,18 @@
+# members/management/commands/rebuild_search_index.py
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from members import search
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the SQLite FTS5 member search table (PostgreSQL indexes are maintained by the database).'
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            self.stdout.write('Search indexes are maintained by the database, nothing to rebuild.')
+            return
+        with transaction.atomic():
+            count = search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} members.'))
@@ -0,0 +1,33 @@
+# members/management/commands/seed_members.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from members import seeding
+
+
+class Command(BaseCommand):
+    help = 'Generates synthetic members (with meetings and attendance) for load and benchmark testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help='Number of members to create.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=None, help='Random seed, for repeatable data sets.')
+        parser.add_argument('--meetings', type=int, default=None, help='Meetings to create (default: one per 5000 members).')
+        parser.add_argument('--attendees', type=int, default=200, help='Attendance rows per meeting.')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        if count < 1 or options['batch_size'] < 1:
+            raise CommandError('count and --batch-size must be positive.')
+
+        def progress(done):
+            self.stdout.write(f'  {done}/{count} members')
+
+        pks = seeding.seed_members(count, options['batch_size'], options['seed'], progress)
+        meetings = options['meetings']
+        if meetings is None:
+            meetings = max(1, count // 5000)
+        meeting_count, attendance_count = seeding.seed_meetings(pks, meetings, options['attendees'], options['seed'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {len(pks)} members, {meeting_count} meetings and {attendance_count} attendance records.'
+        ))
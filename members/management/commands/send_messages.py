@@ -0,0 +1,42 @@
+# members/management/commands/send_messages.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from members import messaging
+
+
+class Command(BaseCommand):
+    help = (
+        'Worker for announcement broadcasts: queues pending broadcasts and sends due SMS/email '
+        'messages in rate-limited batches, retrying failures. Runs until stopped unless --once is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit when no message is due.')
+        parser.add_argument('--batch-size', type=int, default=None, help='Messages claimed per batch (default: MESSAGE_BATCH_SIZE).')
+        parser.add_argument('--rate', type=float, default=None, help='Messages per second, 0 for no limit (default: MESSAGE_RATE_PER_SECOND).')
+        parser.add_argument('--idle-sleep', type=float, default=5.0, help='Seconds to wait when nothing is due.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] is not None and options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        if options['rate'] is not None and options['rate'] < 0:
+            raise CommandError('--rate cannot be negative.')
+
+        def progress(totals):
+            self.stdout.write(f"  sent {totals['sent']}, failed {totals['failed']}")
+
+        try:
+            totals = messaging.work(
+                batch_size=options['batch_size'],
+                rate=options['rate'],
+                once=options['once'],
+                idle_sleep=options['idle_sleep'],
+                progress=progress if options['verbosity'] > 1 else None,
+            )
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped.')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Queued {totals['queued']} messages, sent {totals['sent']}, failed {totals['failed']}."
+        ))
@@ -0,0 +1,24 @@
+# members/management/commands/sync_replica.py
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from members import routing
+
+
+class Command(BaseCommand):
+    help = (
+        'Copies the primary SQLite database over the replica (development stand-in for replication). '
+        'Run it to make the replica catch up; until then replica reads show the old data.'
+    )
+
+    def handle(self, *args, **options):
+        if not routing.replica_configured():
+            raise CommandError('No replica configured (set REPLICA_DATABASE_URL).')
+        primary, replica = connections['default'], connections[routing.REPLICA]
+        if primary.vendor != 'sqlite' or replica.vendor != 'sqlite':
+            raise CommandError('Only SQLite databases can be copied; use real replication for other databases.')
+        primary.ensure_connection()
+        replica.ensure_connection()
+        primary.connection.backup(replica.connection)
+        self.stdout.write(self.style.SUCCESS(f"Copied {primary.settings_dict['NAME']} to {replica.settings_dict['NAME']}."))
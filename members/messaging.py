@@ -0,0 +1,297 @@
+# members/messaging.py
+#
+# ማስታወቂያዎችን ለአባላት በ SMS/ኢሜይል መላክ (announcement fan-out)
+#
+# admin ውስጥ Broadcast ሲፈጠር (ማስታወቂያ + መላኪያ + ክልል/የአባልነት ደረጃ) የሚቀመጠው አንድ ረድፍ ብቻ
+# ነው፤ request አይጠብቅም። `send_messages` worker፡
+#   1. ያልተዘጋጁ Broadcasts ን በ member id ቅደም ተከተል በ chunks ወደ OutboundMessage ረድፎች
+#      ይከፋፍላል (bulk_create)፤ ቢቋረጥ ከ `last_member_id` ይቀጥላል። እያንዳንዱ Broadcast መጀመሪያ
+#      ይያዛል (PENDING -> ENQUEUING፣ ከ lease ጋር)፤ ስለዚህ የሚሞላው አንድ worker ብቻ ነው።
+#   2. የደረሱትን መልዕክቶች በ batches ይወስዳል (PostgreSQL ላይ SKIP LOCKED፣ ስለዚህ ብዙ workers
+#      መሮጥ ይችላሉ)፣ በ MESSAGE_RATE_PER_SECOND ገደብ ይልካል፣ ያልተሳኩትን እየጨመረ በሚሄድ
+#      ክፍተት (backoff) እንደገና ይሞክራል፤ MESSAGE_MAX_ATTEMPTS ሲደርስ FAILED ይሆናሉ።
+# ማስታወሻ ውስጥ የሚኖረው አንድ chunk/batch ብቻ ነው፤ 500k ተቀባዮችም ቢሆኑ።
+#
+# መላኪያዎቹ (senders) በ MESSAGE_SENDERS ይመረጣሉ፤ ለሙከራ ConsoleSender/FileSender፣ ለእውነተኛ
+# SMS gateway BaseSender ን ወርሶ `send()` መጻፍ በቂ ነው።
+
+import json
+import logging
+import sys
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Broadcast, Member, OutboundMessage
+
+logger = logging.getLogger(__name__)
+
+ENQUEUE_CHUNK_SIZE = 2000
+# አማርኛ SMS በ UCS-2 ይላካል፡ በአንድ ክፍል 67 ፊደላት (ሲያያዝ)፤ ቢበዛ 5 ክፍሎች
+SMS_MAX_LENGTH = 335
+
+
+def message_text(announcement, channel):
+    """Return (subject, body) for sending `announcement` over `channel`."""
+    if channel == 'sms':
+        body = f"{announcement.title}\n{announcement.content}"
+        if len(body) > SMS_MAX_LENGTH:
+            body = body[:SMS_MAX_LENGTH - 1] + '…'
+        return '', body
+    return announcement.title, announcement.content
+
+
+# --- መላኪያዎች (senders) ---
+class BaseSender:
+    """Sends messages for one channel. Subclasses implement `send()` and raise on failure."""
+
+    def __init__(self, channel):
+        self.channel = channel
+
+    def send(self, recipient, subject, body):
+        raise NotImplementedError
+
+    def send_batch(self, items):
+        # items = [(recipient, subject, body)]፤ ለእያንዳንዱ None (ተሳክቷል) ወይም የስህተት መልዕክት
+        errors = []
+        for recipient, subject, body in items:
+            try:
+                self.send(recipient, subject, body)
+            except Exception as exc:
+                errors.append(str(exc) or exc.__class__.__name__)
+            else:
+                errors.append(None)
+        return errors
+
+    def close(self):
+        pass
+
+
+class ConsoleSender(BaseSender):
+    """Prints each message to stdout instead of sending it (development)."""
+
+    def send(self, recipient, subject, body):
+        sys.stdout.write(f"[{self.channel}] {recipient}: {subject or body}\n")
+
+
+class FileSender(BaseSender):
+    """Appends each message as a JSON line to MESSAGE_OUTBOX_PATH (testing, dry runs)."""
+
+    def send_batch(self, items):
+        with open(settings.MESSAGE_OUTBOX_PATH, 'a', encoding='utf-8') as fp:
+            for recipient, subject, body in items:
+                fp.write(json.dumps(
+                    {'channel': self.channel, 'recipient': recipient, 'subject': subject, 'body': body},
+                    ensure_ascii=False,
+                ) + '\n')
+        return [None] * len(items)
+
+
+class EmailSender(BaseSender):
+    """Sends through Django's email backend, reusing one connection per batch."""
+
+    def send_batch(self, items):
+        errors = []
+        with get_connection() as connection:
+            for recipient, subject, body in items:
+                try:
+                    EmailMessage(subject, body, to=[recipient], connection=connection).send()
+                except Exception as exc:
+                    errors.append(str(exc) or exc.__class__.__name__)
+                else:
+                    errors.append(None)
+        return errors
+
+
+def get_sender(channel):
+    return import_string(settings.MESSAGE_SENDERS[channel])(channel)
+
+
+# --- ወረፋ (queue) ---
+def recipients(broadcast):
+    members = Member.objects.filter(is_active=True)
+    if broadcast.region:
+        members = members.filter(region=broadcast.region)
+    if broadcast.membership_level:
+        members = members.filter(membership_level=broadcast.membership_level)
+    if broadcast.channel == 'email':
+        return members.exclude(Q(email__isnull=True) | Q(email='')).values_list('pk', 'email')
+    return members.values_list('pk', 'phone_number')
+
+
+def _lease(now=None):
+    return (now or timezone.now()) + timedelta(seconds=settings.MESSAGE_LEASE_SECONDS)
+
+
+def _claimable(now):
+    # ገና ያልተጀመሩ፣ ወይም የሞላቸው worker lease አልቆበት የቆሙ
+    return Q(status=Broadcast.PENDING) | Q(status=Broadcast.ENQUEUING, claimed_until__lt=now)
+
+
+def claim_broadcast(broadcast):
+    """Lease `broadcast` to this worker for enqueueing; False when another worker holds it or it is queued."""
+    now = timezone.now()
+    claimed = Broadcast.objects.filter(_claimable(now), pk=broadcast.pk).update(
+        status=Broadcast.ENQUEUING, claimed_until=_lease(now),
+    )
+    if claimed:
+        broadcast.refresh_from_db(fields=['status', 'claimed_until', 'last_member_id', 'recipient_count'])
+    return bool(claimed)
+
+
+def enqueue(broadcast, chunk_size=ENQUEUE_CHUNK_SIZE):
+    """Claim the broadcast and write its OutboundMessage rows chunk by chunk; returns how many were added."""
+    if not claim_broadcast(broadcast):
+        return 0
+    rows = recipients(broadcast).order_by('pk')
+    added = 0
+    while True:
+        chunk = list(rows.filter(pk__gt=broadcast.last_member_id)[:chunk_size])
+        if not chunk:
+            break
+        lease = _lease()
+        with transaction.atomic():
+            OutboundMessage.objects.bulk_create(
+                [
+                    OutboundMessage(broadcast=broadcast, member_id=member_id, channel=broadcast.channel, recipient=recipient)
+                    for member_id, recipient in chunk
+                ],
+                ignore_conflicts=True,
+            )
+            # lease ው በእያንዳንዱ chunk ይታደሳል፤ አልቆ ሌላ worker ከወሰደው ይህ chunk ይሻራል
+            renewed = Broadcast.objects.filter(pk=broadcast.pk, claimed_until=broadcast.claimed_until).update(
+                last_member_id=chunk[-1][0], recipient_count=F('recipient_count') + len(chunk), claimed_until=lease,
+            )
+            if not renewed:
+                transaction.set_rollback(True)
+                logger.warning("Lost the claim on broadcast %s; another worker continues it", broadcast.pk)
+                return added
+        broadcast.last_member_id = chunk[-1][0]
+        broadcast.recipient_count += len(chunk)
+        broadcast.claimed_until = lease
+        added += len(chunk)
+    now = timezone.now()
+    Broadcast.objects.filter(pk=broadcast.pk, claimed_until=broadcast.claimed_until).update(
+        status=Broadcast.QUEUED, queued_at=now, claimed_until=None,
+    )
+    broadcast.status, broadcast.queued_at, broadcast.claimed_until = Broadcast.QUEUED, now, None
+    return added
+
+
+def enqueue_pending(chunk_size=ENQUEUE_CHUNK_SIZE):
+    broadcasts = Broadcast.objects.filter(_claimable(timezone.now())).order_by('pk')
+    return sum(enqueue(broadcast, chunk_size) for broadcast in broadcasts)
+
+
+def claim(batch_size):
+    """Mark up to `batch_size` due messages as SENDING (leased to this worker) and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboundMessage.objects.select_for_update(skip_locked=True)
+            .filter(status__in=[OutboundMessage.PENDING, OutboundMessage.SENDING], next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        # worker ቢቋረጥ lease ሲያልቅ ሌላ worker ይወስዳቸዋል
+        OutboundMessage.objects.filter(pk__in=ids).update(
+            status=OutboundMessage.SENDING,
+            next_attempt_at=now + timedelta(seconds=settings.MESSAGE_LEASE_SECONDS),
+            attempts=F('attempts') + 1,
+        )
+    return list(OutboundMessage.objects.filter(pk__in=ids).select_related('broadcast__announcement'))
+
+
+def retry_delay(attempts):
+    return timedelta(seconds=settings.MESSAGE_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def deliver(messages, sender):
+    """Send claimed `messages` and record the outcome; returns (sent, failed for good)."""
+    items = [(message.recipient, *message_text(message.broadcast.announcement, message.channel)) for message in messages]
+    try:
+        errors = sender.send_batch(items)
+    except Exception as exc:
+        # ለምሳሌ ከ gateway/SMTP ጋር መገናኘት ካልተቻለ፤ ሁሉም እንደ ስህተት ተቆጥረው እንደገና ይሞከራሉ
+        logger.exception("Sending a batch of %d %s messages failed", len(items), sender.channel)
+        errors = [str(exc) or exc.__class__.__name__] * len(items)
+    now = timezone.now()
+    sent_ids = [message.pk for message, error in zip(messages, errors) if error is None]
+    OutboundMessage.objects.filter(pk__in=sent_ids).update(status=OutboundMessage.SENT, sent_at=now, last_error='')
+    given_up = 0
+    for message, error in zip(messages, errors):
+        if error is None:
+            continue
+        if message.attempts >= settings.MESSAGE_MAX_ATTEMPTS:
+            status, next_attempt_at = OutboundMessage.FAILED, now
+            given_up += 1
+            logger.warning("Giving up on message %s to %s: %s", message.pk, message.recipient, error)
+        else:
+            status, next_attempt_at = OutboundMessage.PENDING, now + retry_delay(message.attempts)
+        OutboundMessage.objects.filter(pk=message.pk).update(
+            status=status, next_attempt_at=next_attempt_at, last_error=error[:1000],
+        )
+    return len(sent_ids), given_up
+
+
+class RateLimiter:
+    """Spaces sends so the long-run rate stays at `rate` messages per second (None = unlimited)."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.next_time = time.monotonic()
+
+    def wait(self, count):
+        if not self.rate:
+            return
+        now = time.monotonic()
+        if self.next_time > now:
+            time.sleep(self.next_time - now)
+            now = self.next_time
+        self.next_time = now + count / self.rate
+
+
+def work(batch_size=None, rate=None, once=False, idle_sleep=5.0, progress=None):
+    """
+    Run the worker loop: enqueue pending broadcasts, then claim and send due
+    messages in batches. With `once=True` it returns when nothing is due.
+    """
+    batch_size = batch_size or settings.MESSAGE_BATCH_SIZE
+    rate = settings.MESSAGE_RATE_PER_SECOND if rate is None else rate
+    # ትልቅ batch የፍጥነት ገደቡን በአንድ ጊዜ እንዳያልፍ
+    if rate:
+        batch_size = max(1, min(batch_size, int(rate)))
+    limiter = RateLimiter(rate)
+    senders = {}
+    totals = {'queued': 0, 'sent': 0, 'failed': 0}
+    try:
+        while True:
+            totals['queued'] += enqueue_pending()
+            messages = claim(batch_size)
+            if not messages:
+                if once:
+                    break
+                time.sleep(idle_sleep)
+                continue
+            by_channel = {}
+            for message in messages:
+                by_channel.setdefault(message.channel, []).append(message)
+            for channel, group in by_channel.items():
+                if channel not in senders:
+                    senders[channel] = get_sender(channel)
+                limiter.wait(len(group))
+                sent, failed = deliver(group, senders[channel])
+                totals['sent'] += sent
+                totals['failed'] += failed
+            if progress:
+                progress(totals)
+    finally:
+        for sender in senders.values():
+            sender.close()
+    return totals
@@ -0,0 +1,274 @@
+# members/middleware.py
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+import whitenoise.middleware
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from django.utils.functional import SimpleLazyObject
+
+from . import changelog, identity, routing
+
+logger = logging.getLogger('members.queries')
+
+
+class QueryStats:
+    """Counts the queries recorded into it and keeps the total and slowest timing."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = ''
+
+    def record(self, sql, elapsed):
+        self.count += 1
+        self.duration += elapsed
+        if elapsed >= self.slowest_duration:
+            self.slowest_duration = elapsed
+            self.slowest_sql = sql
+
+    @property
+    def duration_ms(self):
+        return self.duration * 1000
+
+
+# የሚሰሩ count_queries() ብሎኮች (ሊደራረቡ ይችላሉ)። ContextVar ስለሆነ sync_to_async እና
+# async ORM በሌላ thread ላይ የሚያሄዷቸው queries ለጠየቃቸው request ይቆጠራሉ።
+_active_stats = ContextVar('query_stats', default=())
+
+
+def _record_query(execute, sql, params, many, context):
+    active = _active_stats.get()
+    if not active:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        for stats in active:
+            stats.record(sql, elapsed)
+
+
+def install_query_counter(connection, **kwargs):
+    # connection በ thread አንድ ነው (asgiref Local)፤ wrapper ው በቋሚነት ይቀመጣል፣ ምንም
+    # count_queries() በማይሰራበት ጊዜ ወጪው አንድ ContextVar ንባብ ብቻ ነው
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@contextmanager
+def count_queries():
+    # በሁሉም የዳታቤዝ ግንኙነቶች ላይ (replica ካለም፣ በሌላ thread ቢሆንም) የሚሰሩትን queries ይቆጥራል
+    stats = QueryStats()
+    for connection in connections.all(initialized_only=True):
+        install_query_counter(connection)
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+class QueryCountMiddleware:
+    """
+    Record the number of queries, total DB time and the slowest statement for
+    each request. Figures are logged to `members.queries` and, for staff (or
+    with DEBUG on), returned as X-DB-Query-Count / X-DB-Time-ms headers.
+
+    Streaming responses (CSV export, ID card sheets) run most of their queries
+    after the view returns, so only the view's own queries are counted there.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.warn_count = getattr(settings, 'QUERY_COUNT_WARNING', 50)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with count_queries() as stats:
+            response = self.get_response(request)
+        self.report(request, stats)
+        if self.show_headers(getattr(request, 'user', None)):
+            self.add_headers(response, stats)
+        return response
+
+    async def __acall__(self, request):
+        with count_queries() as stats:
+            response = await self.get_response(request)
+        self.report(request, stats)
+        user = await request.auser() if hasattr(request, 'auser') else None
+        if self.show_headers(user):
+            self.add_headers(response, stats)
+        return response
+
+    def report(self, request, stats):
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else request.path
+        level = logging.WARNING if stats.count > self.warn_count else logging.DEBUG
+        if logger.isEnabledFor(level):
+            logger.log(
+                level, "%s: %d queries in %.1f ms (slowest %.1f ms: %s)",
+                view_name, stats.count, stats.duration_ms,
+                stats.slowest_duration * 1000, stats.slowest_sql,
+            )
+
+    def show_headers(self, user):
+        return settings.DEBUG or (user is not None and user.is_staff)
+
+    def add_headers(self, response, stats):
+        response['X-DB-Query-Count'] = str(stats.count)
+        response['X-DB-Time-ms'] = f"{stats.duration_ms:.1f}"
+
+
+class MemberMiddleware:
+    """
+    Set `request.member` to the logged-in user's Member (or None), loaded lazily
+    and cached across requests (members/identity.py). Async views use
+    `await request.amember()`. Must come after AuthenticationMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        request.member = SimpleLazyObject(lambda: identity.get_member(request.user))
+        request.amember = partial(identity.aget_member, request)
+        return self.get_response(request)
+
+
+class ChangeLogMiddleware:
+    """
+    Collect the change log entries a request records (members/changelog.py) and
+    write them in one bulk insert when it finishes, stamped with the user.
+    Must come after AuthenticationMiddleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with changelog.buffered(lambda: request.user):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with changelog.collecting() as entries:
+            try:
+                return await self.get_response(request)
+            finally:
+                if entries:
+                    user = await request.auser()
+                    await sync_to_async(changelog.flush)(entries, user)
+
+
+class ReplicaPinningMiddleware:
+    """
+    Keep users who just wrote something (any unsafe method) on the primary
+    database for REPLICA_PIN_SECONDS, so replica lag never hides their own
+    changes (members/routing.py). The pin is a cookie; nothing is stored.
+    """
+
+    sync_capable = True
+    async_capable = True
+    unsafe_methods = frozenset(['POST', 'PUT', 'PATCH', 'DELETE'])
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with routing.pinned(self.is_pinned(request)):
+            response = self.get_response(request)
+        return self.pin(request, response)
+
+    async def __acall__(self, request):
+        with routing.pinned(self.is_pinned(request)):
+            response = await self.get_response(request)
+        return self.pin(request, response)
+
+    def is_pinned(self, request):
+        try:
+            return float(request.COOKIES.get(routing.PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def pin(self, request, response):
+        if request.method in self.unsafe_methods and routing.replica_configured():
+            seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                routing.PIN_COOKIE, f"{time.time() + seconds:.0f}", max_age=seconds, httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class WhiteNoiseMiddleware(whitenoise.middleware.WhiteNoiseMiddleware):
+    """
+    WhiteNoise that can also sit in an async (ASGI) middleware stack, so the
+    async views below it are not forced through a sync thread on every request.
+    Static files are read in a worker thread and sent as a plain response.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is None:
+            return await self.get_response(request)
+        return await sync_to_async(self.serve_buffered, thread_sensitive=False)(static_file, request)
+
+    @staticmethod
+    def serve_buffered(static_file, request):
+        # ASGI ላይ sync file iterator ያለው streaming ምላሽ በ Django ሙሉ በሙሉ ይነበባል (ከማስጠንቀቂያ ጋር)፤
+        # static ፋይሎቹ ትንንሽ ስለሆኑ እዚሁ አንብበን እንልካለን
+        response = static_file.get_response(request.method, request.META)
+        content = b''
+        if response.file is not None:
+            with response.file as fp:
+                content = fp.read()
+        http_response = HttpResponse(content, status=int(response.status))
+        del http_response['content-type']
+        for key, value in response.headers:
+            http_response[key] = value
+        return http_response
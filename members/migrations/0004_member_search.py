@@ -0,0 +1,64 @@
+# Member search indexes: pg_trgm on PostgreSQL, an FTS5 shadow table on SQLite.
+
+from django.db import migrations
+
+POSTGRESQL_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    # Django `icontains` የሚያመነጨው UPPER("col"::text) LIKE UPPER(...) ስለሆነ index በዚያው expression ላይ ነው
+    "CREATE INDEX IF NOT EXISTS member_full_name_trgm_idx ON members_member USING gin (UPPER(full_name::text) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS member_city_trgm_idx ON members_member USING gin (UPPER(city::text) gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS member_membership_id_prefix_idx ON members_member (UPPER(membership_id::text) text_pattern_ops)",
+    "CREATE INDEX IF NOT EXISTS member_phone_prefix_idx ON members_member (phone_number varchar_pattern_ops)",
+]
+
+POSTGRESQL_REVERSE = [
+    "DROP INDEX IF EXISTS member_full_name_trgm_idx",
+    "DROP INDEX IF EXISTS member_city_trgm_idx",
+    "DROP INDEX IF EXISTS member_membership_id_prefix_idx",
+    "DROP INDEX IF EXISTS member_phone_prefix_idx",
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS members_member_search USING fts5("
+    "full_name, membership_id, phone_number, city, "
+    "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')",
+    "INSERT INTO members_member_search (rowid, full_name, membership_id, phone_number, city) "
+    "SELECT id, COALESCE(full_name, ''), COALESCE(membership_id, ''), COALESCE(phone_number, ''), COALESCE(city, '') "
+    "FROM members_member",
+]
+
+SQLITE_REVERSE = [
+    "DROP TABLE IF EXISTS members_member_search",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, POSTGRESQL_FORWARD)
+    elif vendor == 'sqlite':
+        _run(schema_editor, SQLITE_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        _run(schema_editor, POSTGRESQL_REVERSE)
+    elif vendor == 'sqlite':
+        _run(schema_editor, SQLITE_REVERSE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0003_member_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:02
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+
+
+def backfill_member_stats(apps, schema_editor):
+    Member = apps.get_model('members', 'Member')
+    MemberStat = apps.get_model('members', 'MemberStat')
+    rows = (
+        Member.objects.filter(is_active=True)
+        .annotate(join_year=ExtractYear('date_joined'))
+        .values('region', 'gender', 'join_year')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    MemberStat.objects.bulk_create([MemberStat(**row) for row in rows])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0004_member_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('region', models.CharField(choices=[('ADD', 'አዲስ አበባ'), ('TIG', 'ትግራይ'), ('AMH', 'አማራ'), ('DD', 'ድሬዳዋ'), ('ORO', 'ኦሮሚያ'), ('SET', 'ደቡብ ኢትዮጵያ'), ('SWE', 'ደቡብ ምዕራብ ኢትዮጵያ'), ('SOM', 'ሶማሌ'), ('GAM', 'ጋምቤላ'), ('HAR', 'ሀረሪ'), ('AFS', 'አፋር'), ('BEN', 'ቤኒሻንጉል ጉሙዝ'), ('SID', 'ሲዳማ')], max_length=3, verbose_name='ክልል')),
+                ('gender', models.CharField(choices=[('M', 'ወንድ'), ('F', 'ሴት')], max_length=1, verbose_name='ጾታ')),
+                ('join_year', models.PositiveSmallIntegerField(verbose_name='የተመዘገበበት ዓመት')),
+                ('count', models.IntegerField(default=0, verbose_name='ብዛት')),
+            ],
+            options={
+                'unique_together': {('region', 'gender', 'join_year')},
+            },
+        ),
+        migrations.RunPython(backfill_member_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0005_member_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='መጨረሻ የተሻሻለበት ቀን'),
+        ),
+    ]
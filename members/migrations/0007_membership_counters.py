@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:08
+
+import re
+
+from django.db import migrations, models
+
+MEMBERSHIP_ID_RE = re.compile(r'^EUDP-(?P<region>[A-Z]+)-(?P<year>\d{2})-(?P<number>\d+)$')
+
+
+def backfill_counters(apps, schema_editor):
+    # ቆጣሪዎቹ ካሉት መለያ ቁጥሮች ከፍተኛው ይጀምራሉ፤ ስለዚህ አዲስ ቁጥር ከነባሩ ጋር አይጋጭም
+    Member = apps.get_model('members', 'Member')
+    MembershipCounter = apps.get_model('members', 'MembershipCounter')
+    highest = {}
+    for membership_id in Member.objects.exclude(membership_id=None).values_list('membership_id', flat=True).iterator():
+        match = MEMBERSHIP_ID_RE.match(membership_id)
+        if not match:
+            continue
+        key = (match['region'], 2000 + int(match['year']))
+        highest[key] = max(highest.get(key, 0), int(match['number']))
+    MembershipCounter.objects.bulk_create([
+        MembershipCounter(region=region, year=year, last_number=number)
+        for (region, year), number in highest.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0006_member_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MembershipCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('region', models.CharField(choices=[('ADD', 'አዲስ አበባ'), ('TIG', 'ትግራይ'), ('AMH', 'አማራ'), ('DD', 'ድሬዳዋ'), ('ORO', 'ኦሮሚያ'), ('SET', 'ደቡብ ኢትዮጵያ'), ('SWE', 'ደቡብ ምዕራብ ኢትዮጵያ'), ('SOM', 'ሶማሌ'), ('GAM', 'ጋምቤላ'), ('HAR', 'ሀረሪ'), ('AFS', 'አፋር'), ('BEN', 'ቤኒሻንጉል ጉሙዝ'), ('SID', 'ሲዳማ')], max_length=3, verbose_name='ክልል')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='ዓመት')),
+                ('last_number', models.PositiveIntegerField(default=0, verbose_name='የመጨረሻ ቁጥር')),
+            ],
+            options={
+                'unique_together': {('region', 'year')},
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0007_membership_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='photo_variants_ready',
+            field=models.BooleanField(default=False, editable=False, verbose_name='የፎቶ ቅጂዎች ተዘጋጅተዋል'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0008_member_photo_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='coordinator_region',
+            field=models.CharField(blank=True, choices=[('ADD', 'አዲስ አበባ'), ('TIG', 'ትግራይ'), ('AMH', 'አማራ'), ('DD', 'ድሬዳዋ'), ('ORO', 'ኦሮሚያ'), ('SET', 'ደቡብ ኢትዮጵያ'), ('SWE', 'ደቡብ ምዕራብ ኢትዮጵያ'), ('SOM', 'ሶማሌ'), ('GAM', 'ጋምቤላ'), ('HAR', 'ሀረሪ'), ('AFS', 'አፋር'), ('BEN', 'ቤኒሻንጉል ጉሙዝ'), ('SID', 'ሲዳማ')], max_length=3, null=True, verbose_name='የሚያስተባብሩት ክልል'),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='is_coordinator',
+            field=models.BooleanField(default=False, verbose_name='የክልል አስተባባሪ'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Max, Q
+
+
+def backfill_attendance_rollups(apps, schema_editor):
+    Attendance = apps.get_model('members', 'Attendance')
+    MemberEngagement = apps.get_model('members', 'MemberEngagement')
+    MeetingAttendanceStat = apps.get_model('members', 'MeetingAttendanceStat')
+    RegionEngagement = apps.get_model('members', 'RegionEngagement')
+    present = Count('id', filter=Q(is_present=True))
+
+    members = (
+        Attendance.objects.values('member_id')
+        .annotate(recorded=Count('id'), attended=present, last_attended=Max('meeting__date', filter=Q(is_present=True)))
+        .order_by()
+    )
+    MemberEngagement.objects.bulk_create([MemberEngagement(**row) for row in members], batch_size=2000)
+    meetings = Attendance.objects.values('meeting_id').annotate(recorded=Count('id'), attended=present).order_by()
+    MeetingAttendanceStat.objects.bulk_create([MeetingAttendanceStat(**row) for row in meetings])
+    regions = Attendance.objects.values(region=F('member__region')).annotate(recorded=Count('id'), attended=present).order_by()
+    RegionEngagement.objects.bulk_create([RegionEngagement(**row) for row in regions])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0009_member_coordinator_scope'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MeetingAttendanceStat',
+            fields=[
+                ('recorded', models.IntegerField(default=0, verbose_name='የተመዘገቡ')),
+                ('attended', models.IntegerField(default=0, verbose_name='የተገኙ')),
+                ('meeting', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='attendance_stat', serialize=False, to='members.meeting', verbose_name='ስብሰባ')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='MemberEngagement',
+            fields=[
+                ('recorded', models.IntegerField(default=0, verbose_name='የተመዘገቡ')),
+                ('attended', models.IntegerField(default=0, verbose_name='የተገኙ')),
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='engagement', serialize=False, to='members.member', verbose_name='አባል')),
+                ('last_attended', models.DateTimeField(blank=True, null=True, verbose_name='መጨረሻ የተገኘበት ስብሰባ')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='RegionEngagement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recorded', models.IntegerField(default=0, verbose_name='የተመዘገቡ')),
+                ('attended', models.IntegerField(default=0, verbose_name='የተገኙ')),
+                ('region', models.CharField(choices=[('ADD', 'አዲስ አበባ'), ('TIG', 'ትግራይ'), ('AMH', 'አማራ'), ('DD', 'ድሬዳዋ'), ('ORO', 'ኦሮሚያ'), ('SET', 'ደቡብ ኢትዮጵያ'), ('SWE', 'ደቡብ ምዕራብ ኢትዮጵያ'), ('SOM', 'ሶማሌ'), ('GAM', 'ጋምቤላ'), ('HAR', 'ሀረሪ'), ('AFS', 'አፋር'), ('BEN', 'ቤኒሻንጉል ጉሙዝ'), ('SID', 'ሲዳማ')], max_length=3, unique=True, verbose_name='ክልል')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(backfill_attendance_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0010_attendance_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Broadcast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('sms', 'SMS'), ('email', 'ኢሜይል')], default='sms', max_length=10, verbose_name='መላኪያ')),
+                ('region', models.CharField(blank=True, choices=[('ADD', 'አዲስ አበባ'), ('TIG', 'ትግራይ'), ('AMH', 'አማራ'), ('DD', 'ድሬዳዋ'), ('ORO', 'ኦሮሚያ'), ('SET', 'ደቡብ ኢትዮጵያ'), ('SWE', 'ደቡብ ምዕራብ ኢትዮጵያ'), ('SOM', 'ሶማሌ'), ('GAM', 'ጋምቤላ'), ('HAR', 'ሀረሪ'), ('AFS', 'አፋር'), ('BEN', 'ቤኒሻንጉል ጉሙዝ'), ('SID', 'ሲዳማ')], max_length=3, verbose_name='ክልል')),
+                ('membership_level', models.CharField(blank=True, choices=[('REGULAR', 'አባል'), ('COMMITTEE', 'የኮሚቴ አባል'), ('LEADERSHIP', 'አመራር')], max_length=15, verbose_name='የአባልነት ደረጃ')),
+                ('status', models.CharField(choices=[('pending', 'በመዘጋጀት ላይ'), ('queued', 'ወረፋ ላይ ገብቷል')], default='pending', editable=False, max_length=10, verbose_name='ሁኔታ')),
+                ('last_member_id', models.BigIntegerField(default=0, editable=False)),
+                ('recipient_count', models.IntegerField(default=0, editable=False, verbose_name='ተቀባዮች')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='የተፈጠረበት ቀን')),
+                ('queued_at', models.DateTimeField(blank=True, editable=False, null=True, verbose_name='ወረፋ የገባበት ቀን')),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='broadcasts', to='members.announcement', verbose_name='ማስታወቂያ')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='OutboundMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('channel', models.CharField(choices=[('sms', 'SMS'), ('email', 'ኢሜይል')], max_length=10, verbose_name='መላኪያ')),
+                ('recipient', models.CharField(max_length=255, verbose_name='ተቀባይ')),
+                ('status', models.CharField(choices=[('pending', 'ይጠብቃል'), ('sending', 'በመላክ ላይ'), ('sent', 'ተልኳል'), ('failed', 'አልተሳካም')], default='pending', max_length=10, verbose_name='ሁኔታ')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='ሙከራዎች')),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='ቀጣይ ሙከራ')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='የተላከበት ጊዜ')),
+                ('last_error', models.TextField(blank=True, verbose_name='የመጨረሻ ስህተት')),
+                ('broadcast', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='messages', to='members.broadcast', verbose_name='ስርጭት')),
+                ('member', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='members.member', verbose_name='አባል')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbound_due_idx')],
+                'unique_together': {('broadcast', 'member')},
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0011_announcement_broadcasts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberBlockingKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(db_index=True, max_length=64, verbose_name='ቁልፍ')),
+                ('member', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blocking_keys', to='members.member', verbose_name='አባል')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DuplicateCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='ተመሳሳይነት')),
+                ('reasons', models.CharField(blank=True, max_length=255, verbose_name='ምክንያቶች')),
+                ('status', models.CharField(choices=[('pending', 'ይጠብቃል'), ('merged', 'ተዋህዷል'), ('dismissed', 'ተደጋጋሚ አይደለም')], default='pending', max_length=10, verbose_name='ሁኔታ')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='የተገኘበት ቀን')),
+                ('member_a', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='members.member', verbose_name='አባል ሀ')),
+                ('member_b', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='members.member', verbose_name='አባል ለ')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', '-score'], name='duplicate_review_idx')],
+                'unique_together': {('member_a', 'member_b')},
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_administrative_units(apps, schema_editor):
+    # ያሉትን የአድራሻ ጽሁፎች ወደ ክፍሎች ያዛምዳል እና ብዛቶቹን ያሰላል (ተመሳሳይ አሰራር በ rebuild_administrative_units)
+    from members.units import backfill
+    backfill(apps.get_model('members', 'Member'), apps.get_model('members', 'AdministrativeUnit'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0012_duplicate_detection'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdministrativeUnit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('region', models.CharField(choices=[('ADD', 'አዲስ አበባ'), ('TIG', 'ትግራይ'), ('AMH', 'አማራ'), ('DD', 'ድሬዳዋ'), ('ORO', 'ኦሮሚያ'), ('SET', 'ደቡብ ኢትዮጵያ'), ('SWE', 'ደቡብ ምዕራብ ኢትዮጵያ'), ('SOM', 'ሶማሌ'), ('GAM', 'ጋምቤላ'), ('HAR', 'ሀረሪ'), ('AFS', 'አፋር'), ('BEN', 'ቤኒሻንጉል ጉሙዝ'), ('SID', 'ሲዳማ')], max_length=3, verbose_name='ክልል')),
+                ('level', models.PositiveSmallIntegerField(choices=[(0, 'ክልል'), (1, 'ዞን'), (2, 'ወረዳ'), (3, 'ቀበሌ')], verbose_name='ደረጃ')),
+                ('name', models.CharField(max_length=100, verbose_name='ስም')),
+                ('match_key', models.CharField(max_length=100, verbose_name='የማዛመጃ ቁልፍ')),
+                ('member_count', models.IntegerField(default=0, verbose_name='የአባላት ብዛት')),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='children', to='members.administrativeunit', verbose_name='የበላይ ክፍል')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='kebele_unit',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='members.administrativeunit', verbose_name='ቀበሌ (ክፍል)'),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='woreda_unit',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='members.administrativeunit', verbose_name='ወረዳ (ክፍል)'),
+        ),
+        migrations.AddField(
+            model_name='member',
+            name='zone_unit',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='members.administrativeunit', verbose_name='ዞን (ክፍል)'),
+        ),
+        migrations.AddIndex(
+            model_name='administrativeunit',
+            index=models.Index(fields=['parent', '-member_count'], name='admin_unit_children_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='administrativeunit',
+            constraint=models.UniqueConstraint(fields=('parent', 'match_key'), name='admin_unit_unique_child'),
+        ),
+        migrations.AddConstraint(
+            model_name='administrativeunit',
+            constraint=models.UniqueConstraint(condition=models.Q(('parent__isnull', True)), fields=('match_key',), name='admin_unit_unique_region'),
+        ),
+        migrations.RunPython(backfill_administrative_units, migrations.RunPython.noop),
+    ]
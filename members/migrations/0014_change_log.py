@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-18 14:54
+
+import django.core.serializers.json
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0013_administrative_units'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(choices=[('member', 'አባል'), ('attendance', 'የስብሰባ ተሳትፎ'), ('announcement', 'ማስታወቂያ')], max_length=20, verbose_name='ሞዴል')),
+                ('object_id', models.BigIntegerField(blank=True, null=True, verbose_name='መለያ')),
+                ('member_id', models.BigIntegerField(blank=True, null=True, verbose_name='አባል')),
+                ('action', models.CharField(choices=[('C', 'ተፈጠረ'), ('U', 'ተቀየረ'), ('D', 'ተሰረዘ')], max_length=1, verbose_name='ድርጊት')),
+                ('changes', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='ለውጦች')),
+                ('actor_id', models.IntegerField(blank=True, null=True, verbose_name='የቀየረው ተጠቃሚ (id)')),
+                ('actor', models.CharField(blank=True, max_length=150, verbose_name='የቀየረው ተጠቃሚ')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='ጊዜ')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['member_id', '-created_at'], name='changelog_member_idx'), models.Index(fields=['model', 'object_id'], name='changelog_object_idx')],
+            },
+        ),
+    ]
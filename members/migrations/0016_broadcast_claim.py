@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0015_sync_api'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='broadcast',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='broadcast',
+            name='status',
+            field=models.CharField(choices=[('pending', 'በመዘጋጀት ላይ'), ('enqueuing', 'ወረፋ በመግባት ላይ'), ('queued', 'ወረፋ ላይ ገብቷል')], default='pending', editable=False, max_length=10, verbose_name='ሁኔታ'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 # members/models.py
 
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import date
@@ -44,6 +45,17 @@ MEMBERSHIP_LEVEL_CHOICES = (
 )
 
 
+class MemberQuerySet(models.QuerySet):
+    def in_scope(self, scope):
+        from .scoping import filter_by_scope
+        return filter_by_scope(self, scope)
+
+    def for_user(self, user):
+        """Members the given staff user may see (all, one region, or none)."""
+        from .scoping import scope_for_user
+        return self.in_scope(scope_for_user(user))
+
+
 # 2. የአባል ሞዴል (Member Model) - በተጠየቀው መሰረት የተሻሻለ
 class Member(models.Model):
     # ከበስተጀርባ የሚሰራ የሎግอิน አካውንት ማገናኛ (አይጠፋም)
@@ -54,6 +66,8 @@ class Member(models.Model):
     gender = models.CharField(max_length=1, choices=GENDER_CHOICES, verbose_name="ጾታ")
     date_of_birth = models.DateField(verbose_name="የትውልድ ቀን")
     photo = models.ImageField(upload_to='member_photos/', null=True, blank=True, verbose_name="ፎቶግራፍ")
+    # የፎቶው ትንንሽ ቅጂዎች (members/images.py) መዘጋጀታቸውን ያሳያል
+    photo_variants_ready = models.BooleanField(default=False, editable=False, verbose_name="የፎቶ ቅጂዎች ተዘጋጅተዋል")
     phone_number = models.CharField(max_length=15, unique=True, verbose_name="ስልክ ቁጥር")
     email = models.EmailField(max_length=255, blank=True, null=True, verbose_name="ኢሜይል")
     
@@ -72,23 +86,88 @@ class Member(models.Model):
     membership_id = models.CharField(max_length=50, unique=True, blank=True, null=True, verbose_name="የአባልነት መለያ ቁጥር")
     date_joined = models.DateTimeField(default=timezone.now, verbose_name="የተመዘገበበት ቀን")
     is_active = models.BooleanField(default=True, verbose_name="ንቁ አባል")
+    # የ offline መሳሪያዎች ማመሳሰያ (members/sync.py) የተቀየሩትን በዚህ index ያነባል
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name="መጨረሻ የተሻሻለበት ቀን")
+
+    # ከላይ ያሉት የአድራሻ ጽሁፎች ተዛማጅ የአስተዳደር ክፍሎች (members/units.py)፤ Member ሲቀመጥ ይሞላሉ
+    zone_unit = models.ForeignKey('AdministrativeUnit', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+', verbose_name="ዞን (ክፍል)")
+    woreda_unit = models.ForeignKey('AdministrativeUnit', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+', verbose_name="ወረዳ (ክፍል)")
+    kebele_unit = models.ForeignKey('AdministrativeUnit', on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='+', verbose_name="ቀበሌ (ክፍል)")
+
+    # የክልል አስተባባሪዎች (members/scoping.py)፤ 'የክልል አስተባባሪ' ቡድን አባል ሲሆኑ የሚያዩት ይህንን ክልል ብቻ ነው
+    is_coordinator = models.BooleanField(default=False, verbose_name="የክልል አስተባባሪ")
+    coordinator_region = models.CharField(max_length=3, choices=REGION_CHOICES, blank=True, null=True, verbose_name="የሚያስተባብሩት ክልል")
+
+    objects = MemberQuerySet.as_manager()
+
+    class Meta:
+        # ለአባላት ዝርዝር (keyset pagination) በ (date_joined, id) የሚሰሩ ጥምር indexes
+        indexes = [
+            models.Index(fields=['is_active', '-date_joined', '-id'], name='member_active_joined_idx'),
+            models.Index(fields=['is_active', 'region', '-date_joined', '-id'], name='member_region_joined_idx'),
+        ]
 
     def __str__(self):
         return self.full_name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # ከዳታቤዝ የተጫኑትን እሴቶች እናስታውሳለን፤ signals ያለ ተጨማሪ query ምን እንደተቀየረ እንዲያውቁ
+        # (ስታቲስቲክስ፣ QR cache)። ከተቀመጠ በኋላ በ signals.refresh_loaded_values ይታደሳል።
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def snapshot_loaded_values(self, update_fields=None):
+        loaded = getattr(self, '_loaded_values', {}) if update_fields is not None else {}
+        for field in self._meta.concrete_fields:
+            if field.attname not in self.__dict__:
+                continue
+            if update_fields is None or field.name in update_fields or field.attname in update_fields:
+                loaded[field.attname] = self.__dict__[field.attname]
+        self._loaded_values = loaded
+
     def save(self, *args, **kwargs):
-        # መለያ ቁጥር ከመፍጠራችን በፊት ኦብጀክቱ እንዲቀመጥ እናደርጋለን (ID ለማግኘት)
-        is_new = self._state.adding
-        super().save(*args, **kwargs)
-        
-        if is_new and not self.membership_id:
-            region_code = self.region
-            year = str(self.date_joined.year)[-2:]
-            member_number = f"{self.id:04d}"
-
-            self.membership_id = f"EUDP-{region_code}-{year}-{member_number}"
-            # ዳግም ወደ save loop እንዳንገባ update_fields እንጠቀማለን
-            super().save(update_fields=['membership_id'])
+        # ቆጣሪው፣ INSERT/UPDATE ው እና በ post_save የሚታደሱት ሠንጠረዦች (የፍለጋ index፣
+        # MemberStat፣ የአስተዳደር ክፍሎች ብዛት፣ የለውጥ መዝገብ) አብረው ይጻፋሉ ወይም አብረው ይቀራሉ
+        with transaction.atomic(using=kwargs.get('using')):
+            # መለያ ቁጥሩ ከ INSERT በፊት ከ MembershipCounter ይወሰዳል፤ አንድ ጊዜ ብቻ እንጽፋለን
+            if self._state.adding and not self.membership_id:
+                number, = MembershipCounter.allocate(self.region, self.date_joined.year)
+                self.membership_id = self.build_membership_id(number)
+            from .units import assign_if_changed
+            if assign_if_changed(self, kwargs.get('update_fields')) and kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = set(kwargs['update_fields']) | {'zone_unit', 'woreda_unit', 'kebele_unit'}
+            super().save(*args, **kwargs)
+
+    def build_membership_id(self, number):
+        region_code = self.region
+        year = str(self.date_joined.year)[-2:]
+        member_number = f"{number:04d}"
+        return f"EUDP-{region_code}-{year}-{member_number}"
+
+
+# የአባልነት መለያ ቁጥር ቆጣሪ (በክልል እና በዓመት)
+class MembershipCounter(models.Model):
+    region = models.CharField(max_length=3, choices=REGION_CHOICES, verbose_name="ክልል")
+    year = models.PositiveSmallIntegerField(verbose_name="ዓመት")
+    last_number = models.PositiveIntegerField(default=0, verbose_name="የመጨረሻ ቁጥር")
+
+    class Meta:
+        unique_together = ('region', 'year')
+
+    def __str__(self):
+        return f"{self.region}-{self.year}: {self.last_number}"
+
+    @classmethod
+    def allocate(cls, region, year, count=1):
+        """Reserve `count` consecutive numbers for (region, year) and return them as a range."""
+        with transaction.atomic():
+            counter, created = cls.objects.select_for_update().get_or_create(region=region, year=year)
+            start = counter.last_number + 1
+            counter.last_number += count
+            counter.save(update_fields=['last_number'])
+        return range(start, start + count)
 
 # ሌሎች ሞዴሎች (Meeting, Attendance, Announcement) እንዳሉ ይቀጥላሉ
 # ... (ከዚህ በታች ያሉት ሌሎች ክላሶች ሳይለወጡ ይቀመጣሉ)
@@ -96,6 +175,7 @@ class Meeting(models.Model):
     title = models.CharField(max_length=200, verbose_name="የስብሰባ ርዕስ")
     date = models.DateTimeField(verbose_name="ቀን")
     location = models.CharField(max_length=255, verbose_name="ቦታ")
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name="መጨረሻ የተሻሻለበት ቀን")
     def __str__(self): return self.title
 
 class Attendance(models.Model):
@@ -109,4 +189,241 @@ class Announcement(models.Model):
     title = models.CharField(max_length=200, verbose_name="ርዕስ")
     content = models.TextField(verbose_name="ይዘት")
     date_posted = models.DateTimeField(default=timezone.now, verbose_name="የተለጠፈበት ቀን")
-    def __str__(self): return self.title
\ No newline at end of file
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, verbose_name="መጨረሻ የተሻሻለበት ቀን")
+    def __str__(self): return self.title
+
+# የዳሽቦርድ ስታቲስቲክስ (በክልል፣ በጾታ እና በተመዘገበበት ዓመት የተከፋፈለ የንቁ አባላት ብዛት)
+# በ members/stats.py አማካኝነት Member ሲቀመጥ/ሲሰረዝ ይታደሳል
+class MemberStat(models.Model):
+    region = models.CharField(max_length=3, choices=REGION_CHOICES, verbose_name="ክልል")
+    gender = models.CharField(max_length=1, choices=GENDER_CHOICES, verbose_name="ጾታ")
+    join_year = models.PositiveSmallIntegerField(verbose_name="የተመዘገበበት ዓመት")
+    count = models.IntegerField(default=0, verbose_name="ብዛት")
+
+    class Meta:
+        unique_together = ('region', 'gender', 'join_year')
+
+    def __str__(self):
+        return f"{self.region}/{self.gender}/{self.join_year}: {self.count}"
+
+
+# የስብሰባ ተሳትፎ ማጠቃለያዎች (members/engagement.py)፤ Attendance ሲጻፍ በ +/- ይስተካከላሉ
+class AttendanceRollup(models.Model):
+    recorded = models.IntegerField(default=0, verbose_name="የተመዘገቡ")
+    attended = models.IntegerField(default=0, verbose_name="የተገኙ")
+
+    class Meta:
+        abstract = True
+
+    @property
+    def attendance_rate(self):
+        # በመቶኛ፤ ምንም መዝገብ ከሌለ None
+        return round(100 * self.attended / self.recorded, 1) if self.recorded > 0 else None
+
+
+class MemberEngagement(AttendanceRollup):
+    member = models.OneToOneField(Member, on_delete=models.CASCADE, primary_key=True, related_name='engagement', verbose_name="አባል")
+    last_attended = models.DateTimeField(null=True, blank=True, verbose_name="መጨረሻ የተገኘበት ስብሰባ")
+
+    def __str__(self):
+        return f"{self.member_id}: {self.attended}/{self.recorded}"
+
+
+class MeetingAttendanceStat(AttendanceRollup):
+    meeting = models.OneToOneField(Meeting, on_delete=models.CASCADE, primary_key=True, related_name='attendance_stat', verbose_name="ስብሰባ")
+
+    def __str__(self):
+        return f"{self.meeting_id}: {self.attended}/{self.recorded}"
+
+
+class RegionEngagement(AttendanceRollup):
+    region = models.CharField(max_length=3, choices=REGION_CHOICES, unique=True, verbose_name="ክልል")
+
+    def __str__(self):
+        return f"{self.region}: {self.attended}/{self.recorded}"
+
+
+# የአስተዳደር ክፍሎች ዛፍ፡ ክልል → ዞን → ወረዳ → ቀበሌ (members/units.py)። የአባላት የአድራሻ ጽሁፎች
+# ("ቦሌ"፣ "Bole"፣ "bole sub city") በ match_key አንድ ክፍል ይሆናሉ፤ member_count በክፍሉ ስር ያሉ
+# ንቁ አባላት ብዛት ነው፣ አባል ሲቀመጥ/ሲሰረዝ በ +/- ይስተካከላል።
+class AdministrativeUnit(models.Model):
+    REGION, ZONE, WOREDA, KEBELE = 0, 1, 2, 3
+    LEVEL_CHOICES = (
+        (REGION, "ክልል"),
+        (ZONE, "ዞን"),
+        (WOREDA, "ወረዳ"),
+        (KEBELE, "ቀበሌ"),
+    )
+
+    region = models.CharField(max_length=3, choices=REGION_CHOICES, verbose_name="ክልል")
+    level = models.PositiveSmallIntegerField(choices=LEVEL_CHOICES, verbose_name="ደረጃ")
+    parent = models.ForeignKey('self', on_delete=models.CASCADE, null=True, blank=True, related_name='children', verbose_name="የበላይ ክፍል")
+    name = models.CharField(max_length=100, verbose_name="ስም")
+    # members/text.py place_key፤ ለክልሎች የክልሉ ኮድ
+    match_key = models.CharField(max_length=100, verbose_name="የማዛመጃ ቁልፍ")
+    member_count = models.IntegerField(default=0, verbose_name="የአባላት ብዛት")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['parent', 'match_key'], name='admin_unit_unique_child'),
+            models.UniqueConstraint(fields=['match_key'], condition=models.Q(parent__isnull=True), name='admin_unit_unique_region'),
+        ]
+        indexes = [
+            # drill-down: የአንድ ክፍል ንዑስ ክፍሎች በአባላት ብዛት ቅደም ተከተል
+            models.Index(fields=['parent', '-member_count'], name='admin_unit_children_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+# የማስታወቂያ መላኪያ (members/messaging.py)፡ Broadcast በ worker ወደ OutboundMessage ረድፎች ይከፋፈላል
+CHANNEL_CHOICES = (
+    ("sms", "SMS"),
+    ("email", "ኢሜይል"),
+)
+
+
+class Broadcast(models.Model):
+    PENDING, ENQUEUING, QUEUED = 'pending', 'enqueuing', 'queued'
+    STATUS_CHOICES = (
+        (PENDING, "በመዘጋጀት ላይ"),
+        (ENQUEUING, "ወረፋ በመግባት ላይ"),
+        (QUEUED, "ወረፋ ላይ ገብቷል"),
+    )
+
+    announcement = models.ForeignKey(Announcement, on_delete=models.CASCADE, related_name='broadcasts', verbose_name="ማስታወቂያ")
+    channel = models.CharField(max_length=10, choices=CHANNEL_CHOICES, default="sms", verbose_name="መላኪያ")
+    # ባዶ ከሆኑ ለሁሉም
+    region = models.CharField(max_length=3, choices=REGION_CHOICES, blank=True, verbose_name="ክልል")
+    membership_level = models.CharField(max_length=15, choices=MEMBERSHIP_LEVEL_CHOICES, blank=True, verbose_name="የአባልነት ደረጃ")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, editable=False, verbose_name="ሁኔታ")
+    # ወረፋው በ member id ቅደም ተከተል ይሞላል፤ worker ቢቋረጥ ከዚህ ይቀጥላል
+    last_member_id = models.BigIntegerField(default=0, editable=False)
+    # ወረፋውን የሚሞላው worker lease (ENQUEUING)፤ ካለቀ ሌላ worker ይቀጥላል
+    claimed_until = models.DateTimeField(null=True, blank=True, editable=False)
+    recipient_count = models.IntegerField(default=0, editable=False, verbose_name="ተቀባዮች")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="የተፈጠረበት ቀን")
+    queued_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name="ወረፋ የገባበት ቀን")
+
+    def __str__(self):
+        return f"{self.announcement} ({self.get_channel_display()})"
+
+
+class OutboundMessage(models.Model):
+    PENDING, SENDING, SENT, FAILED = 'pending', 'sending', 'sent', 'failed'
+    STATUS_CHOICES = (
+        (PENDING, "ይጠብቃል"),
+        (SENDING, "በመላክ ላይ"),
+        (SENT, "ተልኳል"),
+        (FAILED, "አልተሳካም"),
+    )
+
+    broadcast = models.ForeignKey(Broadcast, on_delete=models.CASCADE, related_name='messages', verbose_name="ስርጭት")
+    member = models.ForeignKey(Member, on_delete=models.SET_NULL, null=True, blank=True, verbose_name="አባል")
+    channel = models.CharField(max_length=10, choices=CHANNEL_CHOICES, verbose_name="መላኪያ")
+    recipient = models.CharField(max_length=255, verbose_name="ተቀባይ")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name="ሁኔታ")
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name="ሙከራዎች")
+    # PENDING፡ ቀጣዩ ሙከራ የሚፈቀድበት ጊዜ፤ SENDING፡ worker የያዘበት ጊዜ የሚያልቅበት (ከዚያ በኋላ ሌላ worker ይወስደዋል)
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name="ቀጣይ ሙከራ")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="የተላከበት ጊዜ")
+    last_error = models.TextField(blank=True, verbose_name="የመጨረሻ ስህተት")
+
+    class Meta:
+        unique_together = ('broadcast', 'member')
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbound_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.recipient} ({self.get_status_display()})"
+
+
+# ተደጋጋሚ አባላት ፍለጋ (members/dedup.py)፡ እያንዳንዱ አባል በስሙ ድምጽ፣ በትውልድ ቀኑ እና በአድራሻው
+# ቁልፎች (blocking keys) ይመደባል፤ የሚነጻጸሩት አንድ ቁልፍ የሚጋሩ አባላት ብቻ ናቸው
+class MemberBlockingKey(models.Model):
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='blocking_keys', verbose_name="አባል")
+    key = models.CharField(max_length=64, db_index=True, verbose_name="ቁልፍ")
+
+    def __str__(self):
+        return f"{self.member_id}: {self.key}"
+
+
+class DuplicateCandidate(models.Model):
+    PENDING, MERGED, DISMISSED = 'pending', 'merged', 'dismissed'
+    STATUS_CHOICES = (
+        (PENDING, "ይጠብቃል"),
+        (MERGED, "ተዋህዷል"),
+        (DISMISSED, "ተደጋጋሚ አይደለም"),
+    )
+
+    # member_a.pk < member_b.pk፤ አንድ ጥንድ አንድ ጊዜ ብቻ ይመዘገባል
+    member_a = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='+', verbose_name="አባል ሀ")
+    member_b = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='+', verbose_name="አባል ለ")
+    score = models.FloatField(verbose_name="ተመሳሳይነት")
+    reasons = models.CharField(max_length=255, blank=True, verbose_name="ምክንያቶች")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING, verbose_name="ሁኔታ")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="የተገኘበት ቀን")
+
+    class Meta:
+        unique_together = ('member_a', 'member_b')
+        indexes = [
+            models.Index(fields=['status', '-score'], name='duplicate_review_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.member_a_id} ~ {self.member_b_id} ({self.score:.2f})"
+
+
+# የለውጥ መዝገብ (members/changelog.py)፡ የተቀየሩት መስኮች ብቻ {መስክ: [የቀድሞ, አዲስ]}። ወደ ዋናዎቹ
+# ሠንጠረዦች foreign key የለውም (ምንም cascade/lock የለም፣ አባሉ ቢሰረዝም ታሪኩ ይቀራል)፤ አይታረምም፣
+# የቆዩ ረድፎች በ `prune_change_log` ይሰረዛሉ።
+class ChangeLogEntry(models.Model):
+    CREATED, UPDATED, DELETED = 'C', 'U', 'D'
+    ACTION_CHOICES = (
+        (CREATED, "ተፈጠረ"),
+        (UPDATED, "ተቀየረ"),
+        (DELETED, "ተሰረዘ"),
+    )
+    MODEL_CHOICES = (
+        ("member", "አባል"),
+        ("attendance", "የስብሰባ ተሳትፎ"),
+        ("announcement", "ማስታወቂያ"),
+    )
+
+    model = models.CharField(max_length=20, choices=MODEL_CHOICES, verbose_name="ሞዴል")
+    object_id = models.BigIntegerField(null=True, blank=True, verbose_name="መለያ")
+    # ለውጡ የሚመለከተው አባል (Member ወይም የ Attendance ባለቤት)
+    member_id = models.BigIntegerField(null=True, blank=True, verbose_name="አባል")
+    action = models.CharField(max_length=1, choices=ACTION_CHOICES, verbose_name="ድርጊት")
+    changes = models.JSONField(default=dict, encoder=DjangoJSONEncoder, verbose_name="ለውጦች")
+    actor_id = models.IntegerField(null=True, blank=True, verbose_name="የቀየረው ተጠቃሚ (id)")
+    actor = models.CharField(max_length=150, blank=True, verbose_name="የቀየረው ተጠቃሚ")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="ጊዜ")
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['member_id', '-created_at'], name='changelog_member_idx'),
+            models.Index(fields=['model', 'object_id'], name='changelog_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_model_display()} {self.object_id} {self.get_action_display()}"
+
+
+# የ offline መመዝገቢያ መሳሪያዎች ያስገቡት batch (members/sync.py)፤ ተመሳሳይ Idempotency-Key
+# ሁለተኛ ጊዜ ሲመጣ (ምላሹ ጠፍቶ መሳሪያው እንደገና ሲልክ) ያኔ የተሰጠው ምላሽ ይመለሳል
+class SyncReceipt(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sync_receipts', verbose_name="ተጠቃሚ")
+    key = models.CharField(max_length=64, verbose_name="Idempotency-Key")
+    response = models.JSONField(default=dict, encoder=DjangoJSONEncoder, verbose_name="ምላሽ")
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="ጊዜ")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='sync_receipt_key_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
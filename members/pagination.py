@@ -0,0 +1,159 @@
+# members/pagination.py
+
+import base64
+import json
+from datetime import datetime
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(date_joined, pk):
+    raw = f"{date_joined.isoformat()}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        stamp, pk = raw.rsplit('|', 1)
+        return datetime.fromisoformat(stamp), int(pk)
+    except (ValueError, UnicodeError):
+        raise InvalidCursor(cursor)
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over `(date_joined, id)`, newest first.
+
+    Each page is a single `ORDER BY date_joined DESC, id DESC LIMIT n+1`
+    query bounded by the cursor, so deep pages cost the same as the first one
+    (unlike OFFSET, which has to walk every skipped row).
+    """
+
+    def __init__(self, queryset, per_page=50):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def _after(self, date_joined, pk):
+        # (date_joined, id) < (d, pk); የ `lte` ገደቡ ለ index range scan ይረዳል
+        return self.queryset.filter(date_joined__lte=date_joined).filter(
+            Q(date_joined__lt=date_joined) | Q(date_joined=date_joined, pk__lt=pk)
+        )
+
+    def _before(self, date_joined, pk):
+        return self.queryset.filter(date_joined__gte=date_joined).filter(
+            Q(date_joined__gt=date_joined) | Q(date_joined=date_joined, pk__gt=pk)
+        )
+
+    def page(self, after=None, before=None):
+        limit = self.per_page + 1
+
+        if before:
+            rows = list(self._before(*decode_cursor(before)).order_by('date_joined', 'pk')[:limit])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_previous, has_next = has_more, True
+        else:
+            queryset = self._after(*decode_cursor(after)) if after else self.queryset
+            rows = list(queryset.order_by('-date_joined', '-pk')[:limit])
+            has_next = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_previous = bool(after)
+
+        next_cursor = previous_cursor = None
+        if rows and has_next:
+            next_cursor = encode_cursor(rows[-1].date_joined, rows[-1].pk)
+        if rows and has_previous:
+            previous_cursor = encode_cursor(rows[0].date_joined, rows[0].pk)
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+class RankedPaginator:
+    """
+    LIMIT/OFFSET pages over a queryset in its own order (best search match
+    first). Search narrows the rows to a few matches, so OFFSET stays cheap;
+    the cursors are row offsets and the interface matches KeysetPaginator.
+    """
+
+    def __init__(self, queryset, per_page=50):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def _offset(self, cursor):
+        if not cursor.isdigit():
+            raise InvalidCursor(cursor)
+        return int(cursor)
+
+    def page(self, after=None, before=None):
+        if before:
+            offset = max(self._offset(before) - self.per_page, 0)
+        else:
+            offset = self._offset(after) if after else 0
+        rows = list(self.queryset[offset:offset + self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        next_cursor = str(offset + len(rows)) if has_next else None
+        previous_cursor = str(offset) if offset else None
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+def estimated_count(queryset):
+    """
+    The planner's row estimate for `queryset` (PostgreSQL), or None when the
+    database keeps no usable statistics (SQLite).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that takes its count from planner statistics (`ANALYZE`) when the
+    result is large, so admin changelists skip COUNT(*) over millions of rows.
+    Small results (below `exact_below`) are still counted exactly; the last
+    pages of an estimated result may therefore come back short or empty.
+    """
+
+    exact_below = 20000
+
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list) if hasattr(self.object_list, 'query') else None
+        if estimate is None or estimate < self.exact_below:
+            return super().count
+        return estimate
@@ -0,0 +1,49 @@
+# members/qr.py
+#
+# የመታወቂያ ካርድ QR ኮዶች በ (ሙሉ ስም, መለያ ቁጥር) ይዘት ላይ በተመሰረተ ቁልፍ ይቀመጣሉ
+# (content-addressed)፤ ስለዚህ ተመሳሳይ ካርድ ዳግም ሲታተም QR አይፈጠርም።
+# `qrcodes` cache የ LRU ገደብ (MAX_ENTRIES) አለው፤ ስም ወይም መለያ ቁጥር ሲቀየር
+# የድሮው ግቤት በ signals ይሰረዛል።
+
+import base64
+import hashlib
+from io import BytesIO
+
+import qrcode
+from django.conf import settings
+from django.core.cache import caches
+
+QR_CACHE_ALIAS = 'qrcodes'
+
+
+def qr_payload(full_name, membership_id):
+    return f"ስም: {full_name}\nመለያ ቁጥር: {membership_id}"
+
+
+def qr_cache_key(full_name, membership_id):
+    digest = hashlib.sha256(qr_payload(full_name, membership_id).encode('utf-8')).hexdigest()
+    return f"qr:{digest}"
+
+
+def render_qr_png(full_name, membership_id):
+    buffer = BytesIO()
+    qrcode.make(qr_payload(full_name, membership_id)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def get_qr_png(full_name, membership_id):
+    cache = caches[QR_CACHE_ALIAS]
+    key = qr_cache_key(full_name, membership_id)
+    png = cache.get(key)
+    if png is None:
+        png = render_qr_png(full_name, membership_id)
+        cache.set(key, png, settings.QR_CACHE_TIMEOUT)
+    return png
+
+
+def get_qr_base64(full_name, membership_id):
+    return base64.b64encode(get_qr_png(full_name, membership_id)).decode('utf-8')
+
+
+def invalidate(full_name, membership_id):
+    caches[QR_CACHE_ALIAS].delete(qr_cache_key(full_name, membership_id))
@@ -0,0 +1,111 @@
+# members/routing.py
+#
+# የ read replica ማዘዋወሪያ (database router)
+#
+# REPLICA_DATABASE_URL ሲሰጥ `replica` የሚባል ሁለተኛ ግንኙነት ይኖራል (settings.py)። ከባድ
+# የሪፖርት ንባቦች (ዳሽቦርድ፣ የአባላት ዝርዝር፣ CSV export፣ admin ዝርዝሮች) በ `use_replica`/
+# `replica()` ስር ሲሰሩ ከ replica ይነበባሉ፤ ሌሎቹ ሁሉ እና ሁሉም ጽሁፎች በ primary (`default`)።
+#
+# replica ትንሽ ወደኋላ ሊቀር ስለሚችል (replication lag)፣ POST/PUT/... ያደረገ ተጠቃሚ (ምዝገባ፣
+# የመገለጫ ማስተካከያ) ለ REPLICA_PIN_SECONDS ሰከንድ በ cookie ወደ primary ይታሰራል
+# (ReplicaPinningMiddleware)፤ የጻፈውን ወዲያው ያያል። sessions እና auth ሁልጊዜ ከ primary።
+#
+# በ SQLite ለመሞከር፡ REPLICA_DATABASE_URL=sqlite:///replica.sqlite3 እና `sync_replica`
+# (primary ን ወደ replica ይገለብጣል፤ replication ን ይመስላል)።
+
+import functools
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+
+REPLICA = 'replica'
+PIN_COOKIE = 'primary_pin'
+# ሁልጊዜ ከ primary የሚነበቡ (login/session ከጻፍን በኋላ ወዲያው ይፈለጋሉ)
+PRIMARY_ONLY_APPS = frozenset(['auth', 'sessions', 'contenttypes'])
+
+_use_replica = ContextVar('use_replica', default=False)
+_pinned = ContextVar('pinned_to_primary', default=False)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def reading_from_replica():
+    return replica_configured() and _use_replica.get() and not _pinned.get()
+
+
+class ReplicaRouter:
+    """Send reads to the replica inside `replica()` blocks, everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in PRIMARY_ONLY_APPS and reading_from_replica():
+            return REPLICA
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica የ primary ቅጂ ነው፤ ከሁለቱም የተጫኑ objects ሊገናኙ ይችላሉ
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # `migrate --database=replica` በ SQLite ሙከራ ላይ ብቻ ትርጉም አለው
+        return True
+
+
+@contextmanager
+def replica():
+    token = _use_replica.set(True)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def primary():
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def pinned(value=True):
+    token = _pinned.set(value)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+def use_replica(view):
+    """
+    Run a read-only view's queries against the replica (when one is configured
+    and the user is not pinned to the primary). Sync template responses are
+    rendered inside the block; streaming bodies keep the routing through
+    views._streaming_response.
+    """
+    if iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            with replica():
+                return await view(request, *args, **kwargs)
+    else:
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            with replica():
+                return _render(view(request, *args, **kwargs))
+    return wrapper
+
+
+def _render(response):
+    # TemplateResponse (ለምሳሌ admin) queries የሚያደርገው ሲሰራ ነው
+    if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+        response.render()
+    return response
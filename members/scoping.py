@@ -0,0 +1,80 @@
+# members/scoping.py
+#
+# የሰራተኞች (staff) የክልል ወሰን (region scope)
+#
+# superuser እና መደበኛ staff ሁሉንም ክልሎች ያያሉ። 'የክልል አስተባባሪ' ቡድን አባላት የሚያዩት
+# Member.coordinator_region ያለውን ክልል ብቻ ነው፤ አስተባባሪ ሆነው ክልል ካልተመደበላቸው ምንም
+# አያዩም። ወሰኑ በ request አንድ ጊዜ ይሰላል፣ በ user object እና በ `default` cache ላይ
+# ይቀመጣል፤ የቡድን አባልነት፣ የአባሉ መረጃ ወይም ተጠቃሚው ሲቀየር በ signals ይሰረዛል።
+#
+# ወሰኑ የፍቃድ ጉዳይ ስለሆነ በ cache የሚቀመጠው cache ው የጋራ ሲሆን ብቻ ነው (CACHE_URL=redis://...)።
+# LocMemCache የእያንዳንዱ process ብቻ ነው፡ signals የሚሰርዙት ለውጡን ባስተናገደው worker ላይ ብቻ
+# ስለሆነ ሌሎቹ workers የድሮውን (ምናልባትም የሰፋውን) ወሰን ይይዙ ነበር። ያኔ በየ request ይሰላል።
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.contrib.auth.models import User
+
+COORDINATOR_GROUP = 'የክልል አስተባባሪ'
+
+# ወሰኑ እንደ ቀላል string ይቀመጣል፡ ሁሉም ክልሎች፣ ምንም፣ ወይም የክልል ኮድ (ለምሳሌ 'AMH')
+ALL_REGIONS = '*'
+NO_REGIONS = ''
+
+
+def _cache_key(user_id):
+    return f"member-scope:{user_id}"
+
+
+def resolve_scope(user):
+    if user.is_superuser:
+        return ALL_REGIONS
+    # የቡድን አባልነት እና የአባል መገለጫ በአንድ query ይመጣሉ
+    row = (
+        User.objects.filter(pk=user.pk, groups__name=COORDINATOR_GROUP)
+        .values_list('member__is_coordinator', 'member__coordinator_region')
+        .first()
+    )
+    if row is None:
+        return ALL_REGIONS
+    is_coordinator, region = row
+    return region if is_coordinator and region else NO_REGIONS
+
+
+def cache_is_shared():
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def scope_for_user(user):
+    """Return the user's region scope: ALL_REGIONS, NO_REGIONS or a region code."""
+    scope = getattr(user, '_member_scope', None)
+    if scope is not None:
+        return scope
+    if not cache_is_shared():
+        scope = user._member_scope = resolve_scope(user)
+        return scope
+    key = _cache_key(user.pk)
+    scope = cache.get(key)
+    if scope is None:
+        scope = resolve_scope(user)
+        cache.set(key, scope, settings.MEMBER_SCOPE_CACHE_TIMEOUT)
+    user._member_scope = scope
+    return scope
+
+
+def filter_by_scope(queryset, scope, field='region'):
+    if scope == ALL_REGIONS:
+        return queryset
+    if scope == NO_REGIONS:
+        return queryset.none()
+    return queryset.filter(**{field: scope})
+
+
+def in_scope(scope, region):
+    return scope == ALL_REGIONS or (scope != NO_REGIONS and scope == region)
+
+
+def invalidate(user_ids):
+    cache.delete_many([_cache_key(user_id) for user_id in user_ids])
@@ -0,0 +1,168 @@
+# members/search.py
+#
+# የአባላት ፍለጋ (Member search)
+#
+# PostgreSQL ላይ pg_trgm (trigram) indexes እንጠቀማለን፤ `icontains`/`istartswith`
+# ፍለጋዎች በቀጥታ እነዚህን indexes ይጠቀማሉ። SQLite (development) ላይ ደግሞ
+# `members_member_search` የሚባል FTS5 shadow table አለ፤ ይህም Member ሲቀመጥ ወይም
+# ሲሰረዝ በ signals አማካኝነት ይታደሳል (members/signals.py)። QuerySet.update() እና
+# bulk_update() signals አይጠሩም፤ ስም፣ መለያ ቁጥር፣ ስልክ ወይም ከተማን በእነሱ የሚቀይር ኮድ
+# index_members() መጥራት አለበት (ወይም `rebuild_search_index` ይሮጣል)። bulk import ይህን ያደርጋል።
+#
+# መለያ ቁጥር እና ስልክ እንደ prefix ብቻ ይፈለጋሉ (ከመጀመሪያው)፤ "ADD" ወይም "25" የመለያ ቁጥሩ
+# መካከለኛ ክፍል ስለሆኑ ብቻ ሁሉንም የአዲስ አበባ ወይም የ2025 አባላት አያመጡም።
+
+import re
+
+from django.db import connection
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'members_member_search'
+FTS_COLUMNS = ('full_name', 'membership_id', 'phone_number', 'city')
+
+# ቃላትን (ግዕዝ ፊደላትንም ጨምሮ) ለመለየት
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _vendor():
+    return connection.vendor
+
+
+_fts_databases = set()
+
+
+def _fts_available():
+    if _vendor() != 'sqlite':
+        return False
+    # table መኖሩን አንዴ ካረጋገጥን በኋላ ለእያንዳንዱ ፍለጋ ዳግም አንጠይቅም
+    name = connection.settings_dict['NAME']
+    if name in _fts_databases:
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        if cursor.fetchone() is None:
+            return False
+    _fts_databases.add(name)
+    return True
+
+
+def _fts_match_expression(query):
+    # ስም/ከተማ፡ እያንዳንዱ ቃል እንደ prefix፣ ሁሉም ቃላት መገኘት አለባቸው ("አበ"* AND "ከበ"*)፤
+    # መለያ ቁጥር/ስልክ፡ ሙሉው ጥያቄ ከአምዱ መጀመሪያ (^) የሚጀምር prefix
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return ''
+    words = ' AND '.join('"%s"*' % token for token in tokens)
+    phrase = '^"%s"*' % ' '.join(tokens)
+    return f'{{full_name city}} : ({words}) OR membership_id : {phrase} OR phone_number : {phrase}'
+
+
+def search_members(queryset, query, ranked=False):
+    """
+    Filter `queryset` to members matching `query` on full name, membership ID
+    prefix, phone number prefix or city. With `ranked=True` the rows are
+    annotated with `search_rank` and ordered best match first.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    if _vendor() == 'postgresql':
+        return _search_postgresql(queryset, query, ranked)
+    if _fts_available():
+        return _search_fts(queryset, query, ranked)
+    return _search_fallback(queryset, query, ranked)
+
+
+def _search_postgresql(queryset, query, ranked):
+    # እነዚህ ፍለጋዎች በ migration 0004 የተፈጠሩትን trigram/pattern indexes ይጠቀማሉ
+    queryset = queryset.filter(
+        Q(full_name__icontains=query) |
+        Q(city__icontains=query) |
+        Q(membership_id__istartswith=query) |
+        Q(phone_number__startswith=query)
+    )
+    if not ranked:
+        return queryset
+
+    from django.contrib.postgres.search import TrigramSimilarity, TrigramWordSimilarity
+    from django.db.models.functions import Greatest
+
+    return queryset.annotate(
+        search_rank=Case(
+            When(Q(membership_id__istartswith=query) | Q(phone_number__startswith=query), then=Value(1.0)),
+            default=Greatest(TrigramWordSimilarity(query, 'full_name'), TrigramSimilarity('city', query)),
+            output_field=FloatField(),
+        )
+    ).order_by('-search_rank', '-date_joined', '-pk')
+
+
+def _search_fts(queryset, query, ranked):
+    expression = _fts_match_expression(query)
+    if not expression:
+        return queryset.none()
+
+    queryset = queryset.filter(
+        pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression])
+    )
+    if not ranked:
+        return queryset
+
+    # bm25 ትንሽ (አሉታዊ) ሲሆን የተሻለ ተዛማጅ ነው
+    rank_sql = (
+        f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+        f"WHERE {FTS_TABLE} MATCH %s AND rowid = members_member.id"
+    )
+    return queryset.annotate(
+        search_rank=RawSQL(rank_sql, [expression], output_field=FloatField())
+    ).order_by('-search_rank', '-date_joined', '-pk')
+
+
+def _search_fallback(queryset, query, ranked=False):
+    queryset = queryset.filter(
+        Q(full_name__icontains=query) |
+        Q(city__icontains=query) |
+        Q(membership_id__istartswith=query) |
+        Q(phone_number__startswith=query)
+    )
+    # ደረጃ የለም፤ ranked ሲጠየቅ ቅደም ተከተሉ ብቻ ቋሚ ይሆናል
+    return queryset.order_by('-date_joined', '-pk') if ranked else queryset
+
+
+# --- የ SQLite FTS5 ማመሳሰያ (index maintenance) ---
+
+def index_members(members, replace=True):
+    if not _fts_available():
+        return
+    rows = [(m.pk,) + tuple(getattr(m, column) or '' for column in FTS_COLUMNS) for m in members]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        # አዲስ አባላት (replace=False) ቀድሞ ያለ ረድፍ የላቸውም
+        if replace:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) VALUES (%s, %s, %s, %s, %s)",
+            rows,
+        )
+
+
+def unindex_members(pks):
+    if not _fts_available() or not pks:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(pk,) for pk in pks])
+
+
+def rebuild_index():
+    if not _fts_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        columns = ', '.join(FTS_COLUMNS)
+        values = ', '.join("COALESCE(%s, '')" % column for column in FTS_COLUMNS)
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {values} FROM members_member"
+        )
+        return cursor.rowcount
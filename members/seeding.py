@@ -0,0 +1,160 @@
+# members/seeding.py
+#
+# ለሙከራ እና ለ benchmark የሚሆኑ ሰው ሰራሽ (synthetic) አባላት
+#
+# ስሞች፣ ክልሎች (በግምታዊ የሕዝብ ብዛት ሚዛን)፣ ዞን/ወረዳ፣ የትውልድ እና የምዝገባ ቀናት በዘፈቀደ
+# ግን በ seed ሊደገም በሚችል መንገድ ይፈጠራሉ። ማስገባቱ በ importing.insert_members በኩል
+# ስለሆነ የመለያ ቁጥሮች፣ የፍለጋ index እና ስታቲስቲክስ ልክ እንደ እውነተኛ import ይታደሳሉ።
+
+import random
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.contrib.auth.models import User
+from django.db.models import Max
+from django.utils import timezone
+
+from . import engagement
+from .importing import insert_members
+from .models import EDUCATION_LEVEL_CHOICES, Attendance, Meeting, Member
+
+# ሰው ሰራሽ ስልክ ቁጥሮች ከዚህ ቅድመ ቅጥያ ይጀምራሉ (07 + 8 አሃዝ)
+PHONE_PREFIX = '07'
+
+MALE_NAMES = (
+    'አበበ', 'ከበደ', 'ተስፋዬ', 'ገብረ መድህን', 'ዳዊት', 'ሰለሞን', 'ዮሐንስ', 'ብርሃኑ', 'ታደሰ', 'ሙሉጌታ',
+    'ግርማ', 'በቀለ', 'ጌታቸው', 'አለማየሁ', 'ኃይሌ', 'መስፍን', 'ደረጀ', 'ወንድሙ', 'ያሬድ', 'ሚካኤል',
+    'አህመድ', 'መሐመድ', 'ኢብራሂም', 'ጫላ', 'ቶላ', 'ለሚ', 'ፈይሳ', 'ዓብዲሳ', 'ኦልጅራ', 'ገመቹ',
+    'ሀብታሙ', 'ዘርይሁን', 'ንጉሤ', 'ተክሌ', 'አማኑኤል', 'ናትናኤል', 'ሳሙኤል', 'ዮናስ', 'ኤርሚያስ', 'ቴዎድሮስ',
+)
+FEMALE_NAMES = (
+    'አልማዝ', 'ትዕግስት', 'መሠረት', 'ሰላማዊት', 'ሄለን', 'ብርቱካን', 'ፋጡማ', 'ዘውዲቱ', 'የሺ', 'ሜሮን',
+    'ቤተልሔም', 'ህይወት', 'ራሔል', 'ማርታ', 'ሣራ', 'ኤልሳቤጥ', 'ፀሐይ', 'ትርንጎ', 'አስቴር', 'ሙሉ',
+    'ሀና', 'ሩት', 'ሊያ', 'ሰብለ', 'ዓይናለም', 'ጫልቱ', 'ሀዊ', 'ለሊሴ', 'ዘምዘም', 'ከድጃ',
+)
+
+# (ክልል, ሚዛን, ዞኖች)፤ ሚዛኑ ግምታዊ የሕዝብ ድርሻ ነው
+REGIONS = (
+    ('ORO', 35, ('ምሥራቅ ሸዋ', 'ምዕራብ ሸዋ', 'ጅማ', 'አርሲ', 'ባሌ', 'ምሥራቅ ወለጋ', 'ቦረና')),
+    ('AMH', 22, ('ሰሜን ጎንደር', 'ደቡብ ጎንደር', 'ምሥራቅ ጎጃም', 'ምዕራብ ጎጃም', 'ሰሜን ወሎ', 'ደቡብ ወሎ', 'ሰሜን ሸዋ')),
+    ('SET', 8, ('ጋሞ', 'ጎፋ', 'ወላይታ', 'ጌዴኦ', 'ኮንሶ')),
+    ('SOM', 6, ('ፋፋን', 'ሲቲ', 'ሊበን', 'ቆራሄ')),
+    ('TIG', 6, ('መቀሌ', 'ማዕከላዊ', 'ምሥራቃዊ', 'ደቡባዊ')),
+    ('ADD', 5, ('ቦሌ', 'አራዳ', 'ልደታ', 'ኮልፌ ቀራኒዮ', 'የካ', 'ንፋስ ስልክ ላፍቶ')),
+    ('SID', 5, ('ሀዋሳ', 'ሰሜን ሲዳማ', 'ደቡብ ሲዳማ')),
+    ('SWE', 3, ('ከፋ', 'ቤንች ሸኮ', 'ዳውሮ')),
+    ('AFS', 2, ('አውሲ ረሱ', 'ኪልበቲ ረሱ', 'ጋቢ ረሱ')),
+    ('BEN', 1.5, ('መተከል', 'አሶሳ', 'ካማሺ')),
+    ('DD', 0.6, ('ድሬዳዋ',)),
+    ('GAM', 0.5, ('አኝዋ', 'ኑዌር', 'ማጃንግ')),
+    ('HAR', 0.3, ('ሀረር',)),
+)
+REGION_CODES = tuple(code for code, weight, zones in REGIONS)
+REGION_WEIGHTS = tuple(weight for code, weight, zones in REGIONS)
+ZONES = {code: zones for code, weight, zones in REGIONS}
+WOREDAS_PER_ZONE = 12
+
+EDUCATION_LEVELS = tuple(code for code, label in EDUCATION_LEVEL_CHOICES)
+EDUCATION_WEIGHTS = (8, 25, 30, 15, 17, 4, 1)
+MEMBERSHIP_LEVELS = ('REGULAR', 'COMMITTEE', 'LEADERSHIP')
+MEMBERSHIP_WEIGHTS = (90, 8, 2)
+
+
+def next_phone_number():
+    last = Member.objects.filter(phone_number__startswith=PHONE_PREFIX).aggregate(last=Max('phone_number'))['last']
+    return int(last[len(PHONE_PREFIX):]) + 1 if last else 0
+
+
+class MemberFactory:
+    """Builds unsaved (User, Member) pairs; the same seed yields the same members."""
+
+    def __init__(self, seed=None, first_phone=0, years=6):
+        self.random = random.Random(seed)
+        self.phone = first_phone
+        self.today = timezone.localdate()
+        self.join_start = self.today - timedelta(days=365 * years)
+        self.join_days = (self.today - self.join_start).days
+
+    def _woreda(self, zone):
+        # ወረዳዎች እኩል አይደሉም፤ ጥቂቶቹ ብዙ አባላት አላቸው (Zipf መሰል)
+        number = min(int(self.random.paretovariate(1.2)), WOREDAS_PER_ZONE)
+        return f"{zone} ወረዳ {number:02d}"
+
+    def build(self):
+        pick = self.random.choice
+        gender = 'M' if self.random.random() < 0.56 else 'F'
+        given = pick(MALE_NAMES if gender == 'M' else FEMALE_NAMES)
+        region = self.random.choices(REGION_CODES, REGION_WEIGHTS)[0]
+        zone = pick(ZONES[region])
+        joined = self.join_start + timedelta(days=self.random.randrange(self.join_days))
+        born = self.today.replace(year=self.today.year - self.random.randint(18, 75), day=1)
+        phone_number = f"{PHONE_PREFIX}{self.phone:08d}"
+        self.phone += 1
+
+        user = User(username=phone_number, password=UNUSABLE_PASSWORD_PREFIX)
+        member = Member(
+            full_name=f"{given} {pick(MALE_NAMES)} {pick(MALE_NAMES)}",
+            gender=gender,
+            date_of_birth=born - timedelta(days=self.random.randrange(365)),
+            phone_number=phone_number,
+            region=region,
+            zone=zone,
+            woreda=self._woreda(zone),
+            kebele=f"{self.random.randint(1, 30):02d}",
+            city=zone,
+            education_level=self.random.choices(EDUCATION_LEVELS, EDUCATION_WEIGHTS)[0],
+            membership_level=self.random.choices(MEMBERSHIP_LEVELS, MEMBERSHIP_WEIGHTS)[0],
+            date_joined=timezone.make_aware(datetime.combine(joined, time(self.random.randrange(8, 18)))),
+            is_active=self.random.random() < 0.95,
+        )
+        return user, member
+
+    def __iter__(self):
+        while True:
+            yield self.build()
+
+
+def seed_members(count, batch_size=5000, seed=None, progress=None):
+    """Insert `count` synthetic members in batches; returns the new members' primary keys."""
+    factory = MemberFactory(seed=seed, first_phone=next_phone_number())
+    pairs = iter(factory)
+    pks = []
+    remaining = count
+    while remaining > 0:
+        batch = list(islice(pairs, min(batch_size, remaining)))
+        users, members = zip(*batch)
+        pks.extend(member.pk for member in insert_members(list(users), list(members)))
+        remaining -= len(batch)
+        if progress:
+            progress(count - remaining)
+    return pks
+
+
+def seed_meetings(member_pks, meetings, attendees, seed=None, batch_size=5000):
+    """Create `meetings` meetings, each attended by a random sample of `attendees` members."""
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    created = Meeting.objects.bulk_create([
+        Meeting(
+            title=f"የ{rng.choice(REGIONS)[2][0]} አባላት ስብሰባ ቁጥር {number}",
+            date=timezone.make_aware(datetime.combine(today - timedelta(days=rng.randrange(720)), time(14))),
+            location=rng.choice(rng.choice(REGIONS)[2]),
+        )
+        for number in range(1, meetings + 1)
+    ])
+    sample_size = min(attendees, len(member_pks))
+    rows = []
+    total = 0
+    for meeting in created:
+        for member_id in rng.sample(member_pks, sample_size):
+            rows.append(Attendance(member_id=member_id, meeting=meeting, is_present=rng.random() < 0.85))
+        if len(rows) >= batch_size:
+            total += len(Attendance.objects.bulk_create(rows, ignore_conflicts=True))
+            rows = []
+    if rows:
+        total += len(Attendance.objects.bulk_create(rows, ignore_conflicts=True))
+    # bulk_create signals አይጠራም፤ ማጠቃለያዎቹ አንድ ጊዜ ከዜሮ ይሰላሉ
+    engagement.rebuild()
+    return len(created), total
+
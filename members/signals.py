@@ -0,0 +1,225 @@
+# members/signals.py
+
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import changelog, dedup, engagement, identity, images, qr, scoping, search, stats, units
+from .models import Announcement, Attendance, Meeting, Member
+
+
+# --- የፍለጋ index ማመሳሰያ ---
+@receiver(post_save, sender=Member)
+def index_member_for_search(sender, instance, created, **kwargs):
+    search.index_members([instance], replace=not created)
+
+
+@receiver(post_delete, sender=Member)
+def unindex_member_for_search(sender, instance, **kwargs):
+    search.unindex_members([instance.pk])
+
+
+# --- የዳሽቦርድ ስታቲስቲክስ ---
+@receiver(pre_save, sender=Member)
+def remember_member_stat_key(sender, instance, update_fields=None, **kwargs):
+    stats.remember_loaded_key(instance, update_fields)
+
+
+@receiver(post_save, sender=Member)
+def update_member_stats(sender, instance, created, update_fields=None, **kwargs):
+    stats.member_saved(instance, created, update_fields)
+
+
+@receiver(post_delete, sender=Member)
+def decrement_member_stats(sender, instance, **kwargs):
+    stats.member_deleted(instance)
+
+
+# --- የአስተዳደር ክፍሎች የአባላት ብዛት (members/units.py) ---
+@receiver(pre_save, sender=Member)
+def remember_member_unit_key(sender, instance, update_fields=None, **kwargs):
+    units.remember_loaded_key(instance, update_fields)
+
+
+@receiver(post_save, sender=Member)
+def update_unit_counts(sender, instance, created, update_fields=None, **kwargs):
+    units.member_saved(instance, created, update_fields)
+
+
+@receiver(post_delete, sender=Member)
+def decrement_unit_counts(sender, instance, **kwargs):
+    units.member_deleted(instance)
+
+
+# --- የ QR cache ---
+@receiver(pre_save, sender=Member)
+def invalidate_member_qr_code(sender, instance, **kwargs):
+    loaded = getattr(instance, '_loaded_values', {})
+    if 'full_name' not in loaded or 'membership_id' not in loaded:
+        return
+    if (loaded['full_name'], loaded['membership_id']) != (instance.full_name, instance.membership_id):
+        qr.invalidate(loaded['full_name'], loaded['membership_id'])
+
+
+@receiver(post_delete, sender=Member)
+def delete_member_qr_code(sender, instance, **kwargs):
+    qr.invalidate(instance.full_name, instance.membership_id)
+
+
+# --- የፎቶ ማቀነባበሪያ ---
+@receiver(pre_save, sender=Member)
+def detect_new_member_photo(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'photo' not in update_fields:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if instance._state.adding:
+        changed = bool(instance.photo)
+    elif 'photo' in loaded:
+        changed = bool(instance.photo) and loaded['photo'] != instance.photo.name
+    else:
+        return
+    if changed:
+        instance.photo_variants_ready = False
+        instance._photo_changed = True
+
+
+@receiver(post_save, sender=Member)
+def schedule_member_photo_processing(sender, instance, **kwargs):
+    if instance.__dict__.pop('_photo_changed', False):
+        images.schedule(instance.pk)
+
+
+# --- የስብሰባ ተሳትፎ ማጠቃለያዎች (members/engagement.py) ---
+@receiver(pre_save, sender=Attendance)
+def remember_attendance_row(sender, instance, **kwargs):
+    instance._engagement_old = None
+    if instance.pk is not None:
+        instance._engagement_old = (
+            Attendance.objects.filter(pk=instance.pk).values_list('member_id', 'meeting_id', 'is_present').first()
+        )
+
+
+# update_engagement_on_save `_engagement_old` ን ስለሚያስወግድ ከሱ በፊት መመዝገብ አለበት
+@receiver(post_save, sender=Attendance)
+def log_attendance_change(sender, instance, **kwargs):
+    changelog.attendance_saved(instance, instance.__dict__.get('_engagement_old'))
+
+
+@receiver(post_save, sender=Attendance)
+def update_engagement_on_save(sender, instance, **kwargs):
+    old = instance.__dict__.pop('_engagement_old', None)
+    engagement.apply_deltas(engagement.attendance_deltas(old, (instance.member_id, instance.meeting_id, instance.is_present)))
+
+
+@receiver(post_delete, sender=Attendance)
+def update_engagement_on_delete(sender, instance, origin=None, **kwargs):
+    if origin is not None and engagement.is_cascade(origin):
+        return
+    engagement.apply_deltas(engagement.attendance_deltas((instance.member_id, instance.meeting_id, instance.is_present), None))
+
+
+@receiver(pre_delete, sender=Member)
+def remove_member_engagement(sender, instance, **kwargs):
+    engagement.member_deleted(instance)
+
+
+@receiver(pre_delete, sender=Meeting)
+def remove_meeting_engagement(sender, instance, **kwargs):
+    engagement.meeting_deleted(instance)
+
+
+@receiver(post_save, sender=Member)
+def move_member_engagement_region(sender, instance, created, **kwargs):
+    old_region = getattr(instance, '_loaded_values', {}).get('region')
+    if not created and old_region and old_region != instance.region:
+        engagement.move_member_region(instance.pk, old_region, instance.region)
+
+
+# --- የ staff የክልል ወሰን (members/scoping.py) ---
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+def invalidate_member_user_scope(sender, instance, **kwargs):
+    scoping.invalidate([instance.user_id])
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_scope(sender, instance, update_fields=None, **kwargs):
+    # login የሚያደርገው last_login ብቻ ማዘመን ወሰኑን አይቀይርም
+    if update_fields is None or 'is_superuser' in update_fields:
+        scoping.invalidate([instance.pk])
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_scope_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            scoping.invalidate([instance.pk])
+    elif action in ('post_add', 'post_remove'):
+        scoping.invalidate(pk_set)
+    elif action == 'pre_clear':
+        scoping.invalidate(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def invalidate_scope_on_group_rename(sender, instance, **kwargs):
+    scoping.invalidate(instance.user_set.values_list('pk', flat=True))
+
+
+# --- request.member cache (members/identity.py) ---
+@receiver(post_save, sender=Member)
+@receiver(post_delete, sender=Member)
+def invalidate_member_profile(sender, instance, **kwargs):
+    # አባሉ ወደ ሌላ ተጠቃሚ ከተዛወረ የቀድሞውም ይሰረዛል
+    old_user_id = getattr(instance, '_loaded_values', {}).get('user_id')
+    identity.invalidate({instance.user_id, old_user_id})
+
+
+# --- ተደጋጋሚ አባላት ፍለጋ (members/dedup.py) ---
+@receiver(post_save, sender=Member)
+def reset_member_blocking_keys(sender, instance, created, update_fields=None, **kwargs):
+    # ስም/የትውልድ ቀን/አድራሻ ሲቀየር ቁልፎቹ ይሰረዛሉ፤ ቀጣዩ `find_duplicates` አባሉን እንደገና ይመረምራል
+    if created or (update_fields is not None and not set(update_fields) & set(dedup.KEY_FIELDS)):
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if any(field in loaded and loaded[field] != getattr(instance, field) for field in dedup.KEY_FIELDS):
+        dedup.clear_keys([instance.pk])
+
+
+# --- የለውጥ መዝገብ (members/changelog.py) ---
+@receiver(post_save, sender=Member)
+def log_member_change(sender, instance, created, update_fields=None, **kwargs):
+    changelog.member_saved(instance, created, update_fields)
+
+
+@receiver(post_delete, sender=Member)
+def log_member_deletion(sender, instance, **kwargs):
+    changelog.member_deleted(instance)
+
+
+@receiver(post_delete, sender=Attendance)
+def log_attendance_deletion(sender, instance, origin=None, **kwargs):
+    # አባሉ/ስብሰባው ሲሰረዝ የሚሰረዙት ረድፎች አንድ በአንድ አይመዘገቡም
+    if origin is None or not engagement.is_cascade(origin):
+        changelog.attendance_deleted(instance)
+
+
+@receiver(pre_save, sender=Announcement)
+def remember_announcement_values(sender, instance, **kwargs):
+    changelog.remember_announcement(instance)
+
+
+@receiver(post_save, sender=Announcement)
+def log_announcement_change(sender, instance, created, **kwargs):
+    changelog.announcement_saved(instance, created)
+
+
+@receiver(post_delete, sender=Announcement)
+def log_announcement_deletion(sender, instance, **kwargs):
+    changelog.announcement_deleted(instance)
+
+
+# ሁልጊዜ የመጨረሻው post_save receiver ይሁን፤ ከላይ ያሉት የቀድሞውን እሴት ይጠቀማሉ
+@receiver(post_save, sender=Member)
+def refresh_loaded_values(sender, instance, update_fields=None, **kwargs):
+    instance.snapshot_loaded_values(update_fields)
@@ -0,0 +1,129 @@
+# members/stats.py
+#
+# የዳሽቦርድ ስታቲስቲክስ (materialized stats)
+#
+# ዳሽቦርዱ በእያንዳንዱ ጉብኝት ሙሉውን የአባላት ሠንጠረዥ ከማስላት ይልቅ በ MemberStat
+# ውስጥ ያሉትን ጥቂት ረድፎች (ክልል × ጾታ × ዓመት) ያነባል። እያንዳንዱ Member ሲቀመጥ
+# ወይም ሲሰረዝ ተዛማጁ ረድፍ በ +1/-1 ይስተካከላል። `rebuild_member_stats` ትዕዛዝ
+# ሁሉንም ከዜሮ ያሰላል (ለምሳሌ ከ QuerySet.update() በኋላ)።
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+
+from .models import GENDER_CHOICES, REGION_CHOICES, Member, MemberStat
+
+STAT_FIELDS = frozenset(['region', 'gender', 'date_joined', 'is_active'])
+MISSING = object()
+
+
+def _key(region, gender, date_joined, is_active):
+    # ንቁ ያልሆኑ አባላት አይቆጠሩም
+    if not is_active:
+        return None
+    if timezone.is_aware(date_joined):
+        date_joined = timezone.localtime(date_joined)
+    return (region, gender, date_joined.year)
+
+
+def stat_key(member):
+    return _key(member.region, member.gender, member.date_joined, member.is_active)
+
+
+def loaded_stat_key(member):
+    # ከዳታቤዝ ሲጫን የነበረው ቁልፍ፤ መስኮቹ ካልተጫኑ (ለምሳሌ .only()) MISSING
+    loaded = getattr(member, '_loaded_values', {})
+    if not STAT_FIELDS.issubset(loaded):
+        return MISSING
+    return _key(*(loaded[name] for name in ('region', 'gender', 'date_joined', 'is_active')))
+
+
+def adjust(key, delta):
+    if key is None or not delta:
+        return
+    region, gender, year = key
+    rows = MemberStat.objects.filter(region=region, gender=gender, join_year=year)
+    if rows.update(count=F('count') + delta):
+        return
+    with transaction.atomic():
+        MemberStat.objects.get_or_create(region=region, gender=gender, join_year=year)
+        rows.update(count=F('count') + delta)
+
+
+def apply_members(members, delta=1):
+    # ለ bulk_create/bulk delete (signals ለማይጠሩባቸው) ስታቲስቲክሱን በአንድ ጊዜ ለማስተካከል
+    counts = Counter(stat_key(member) for member in members)
+    for key, count in counts.items():
+        adjust(key, delta * count)
+
+
+def remember_loaded_key(instance, update_fields=None):
+    if instance._state.adding or instance.pk is None:
+        instance._stat_key = None
+        return
+    if update_fields is not None and not STAT_FIELDS.intersection(update_fields):
+        return
+    key = loaded_stat_key(instance)
+    if key is MISSING:
+        old = Member.objects.filter(pk=instance.pk).values(*STAT_FIELDS).first()
+        key = _key(old['region'], old['gender'], old['date_joined'], old['is_active']) if old else None
+    instance._stat_key = key
+
+
+def member_saved(instance, created, update_fields=None):
+    if not created and update_fields is not None and not STAT_FIELDS.intersection(update_fields):
+        return
+    old_key = instance.__dict__.pop('_stat_key', None)
+    new_key = stat_key(instance)
+    if old_key != new_key:
+        adjust(old_key, -1)
+        adjust(new_key, 1)
+
+
+def member_deleted(instance):
+    key = loaded_stat_key(instance)
+    adjust(stat_key(instance) if key is MISSING else key, -1)
+
+
+@transaction.atomic
+def rebuild():
+    MemberStat.objects.all().delete()
+    rows = (
+        Member.objects.filter(is_active=True)
+        .annotate(join_year=ExtractYear('date_joined'))
+        .values('region', 'gender', 'join_year')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    stats = [MemberStat(**row) for row in rows]
+    MemberStat.objects.bulk_create(stats)
+    return len(stats)
+
+
+def dashboard_summary(stats):
+    """Fold MemberStat rows into the figures the dashboard shows (total, per gender/region/year)."""
+    by_gender, by_region, by_year = Counter(), Counter(), Counter()
+    total = 0
+    for region, gender, year, count in stats.filter(count__gt=0).values_list('region', 'gender', 'join_year', 'count'):
+        total += count
+        by_gender[gender] += count
+        by_region[region] += count
+        by_year[year] += count
+
+    gender_map = dict(GENDER_CHOICES)
+    region_map = dict(REGION_CHOICES)
+    return {
+        'total_members': total,
+        'gender_distribution': [
+            {'gender': gender, 'gender_display': gender_map.get(gender, gender), 'count': count}
+            for gender, count in sorted(by_gender.items())
+        ],
+        'members_by_region': [
+            {'region': region, 'region_display': region_map.get(region, region), 'count': count}
+            for region, count in by_region.most_common()
+        ],
+        'members_by_year': sorted(by_year.items()),
+    }
@@ -0,0 +1,225 @@
+# members/sync.py
+#
+# የ offline መመዝገቢያ መሳሪያዎች ማመሳሰያ (delta sync)
+#
+# ኔትወርክ በማይገኝባቸው ወረዳዎች ያሉ መዝጋቢዎች ታብሌቶቻቸው ላይ ይሰራሉ፣ ሲገናኙ በጥቂት requests
+# ያመሳስላሉ፡
+#   * pull፡ ከመጨረሻው high-water mark በኋላ የተቀየሩ አባላት (በ scope)፣ ስብሰባዎች እና ማስታወቂያዎች
+#     በ (updated_at, id) keyset ይነበባሉ። mark ለእያንዳንዱ ሞዴል የመጨረሻውን (updated_at, id)
+#     ይይዛል፤ `more` እውነት እስከሆነ ድረስ መሳሪያው በአዲሱ mark ይጠይቃል። ገና ሊጻፉ (commit)
+#     የሚችሉ ረድፎች እንዳይዘለሉ ከ SYNC_SETTLE_SECONDS ያልበለጡ ለውጦች ለሚቀጥለው pull ይቆያሉ።
+#     የተሰረዙ ረድፎች አይላኩም፤ አባላት አይሰረዙም፣ is_active ይቀየራል።
+#   * push፡ gzip የተደረገ JSON batch (አዲስ ምዝገባዎች እና የስብሰባ ተሳትፎ)። ምዝገባዎቹ እንደ bulk
+#     import (members/importing.py)፣ ተሳትፎው እንደ check-in (members/checkin.py) ይጻፋሉ። batch ው
+#     በ Idempotency-Key ይታወቃል፡ ምላሹ ጠፍቶ መሳሪያው እንደገና ቢልክ ሁለተኛ አይጻፍም፣ የቀድሞው ምላሽ
+#     ይመለሳል (SyncReceipt)።
+#
+# መሳሪያዎቹ እንደ ድር ተጠቃሚ (session) ይገባሉ፡ የ login ገጹን በ GET አንብበው csrftoken cookie
+# ያገኛሉ፣ በ POST ይገባሉ። login ው CSRF token ን ስለሚቀይር አዲሱ token ከ pull ምላሽ ጋር ይመጣል
+# (ensure_csrf_cookie)፤ push በ X-CSRFToken header (የ csrftoken cookie እሴት) ይላካል። በ HTTPS
+# ላይ Django የ Referer/Origin header ንም ያረጋግጣል፣ ስለዚህ መሳሪያዎቹ የጣቢያውን አድራሻ ይልካሉ።
+
+import zlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import checkin, importing, scoping
+from .models import Announcement, Meeting, Member, SyncReceipt
+from .pagination import InvalidCursor, decode_cursor, encode_cursor
+
+PULL_LIMIT = 500
+MAX_PULL_LIMIT = 2000
+MAX_PUSH_ITEMS = 2000
+# እያንዳንዱ የይለፍ ቃል hash በ request ውስጥ ይሰራል፤ ብዙ ምዝገባዎች በተከታታይ batches ይላካሉ
+MAX_PUSH_REGISTRATIONS = 25
+# ከ gzip በኋላ የሚፈቀደው የ batch መጠን፤ ያልተጨመቀ body ከ DATA_UPLOAD_MAX_MEMORY_SIZE (2.5 MB)
+# በታች መሆን አለበት፣ አለበለዚያ Django ራሱ ይከለክለዋል
+MAX_PUSH_BYTES = 2 * 1024 * 1024
+MAX_KEY_LENGTH = 64
+
+MEMBER_FIELDS = (
+    'id', 'membership_id', 'full_name', 'gender', 'date_of_birth', 'phone_number', 'email', 'region', 'zone',
+    'woreda', 'kebele', 'city', 'education_level', 'membership_level', 'is_active', 'updated_at',
+)
+MEETING_FIELDS = ('id', 'title', 'date', 'location', 'updated_at')
+ANNOUNCEMENT_FIELDS = ('id', 'title', 'content', 'date_posted', 'updated_at')
+
+
+class SyncError(ValueError):
+    """A malformed pull mark or push batch (the view answers 400 with the message)."""
+
+
+# --- pull ---
+def _sources(user):
+    # (ስም, queryset, መስኮች)፤ በ mark ውስጥ ያላቸው ቦታ በዚህ ቅደም ተከተል ነው
+    return (
+        ('members', Member.objects.for_user(user), MEMBER_FIELDS),
+        ('meetings', Meeting.objects.all(), MEETING_FIELDS),
+        ('announcements', Announcement.objects.all(), ANNOUNCEMENT_FIELDS),
+    )
+
+
+def decode_mark(mark):
+    """Per-source (updated_at, id) cursors from a mark; None for sources not synced yet."""
+    if not mark:
+        return [None] * 3
+    parts = mark.split('.')
+    if len(parts) != 3:
+        raise SyncError('mark ትክክል አይደለም።')
+    try:
+        return [decode_cursor(part) if part else None for part in parts]
+    except InvalidCursor:
+        raise SyncError('mark ትክክል አይደለም።')
+
+
+def encode_mark(cursors):
+    return '.'.join(encode_cursor(*cursor) if cursor else '' for cursor in cursors)
+
+
+def _changed_since(queryset, cursor, until, fields, limit):
+    queryset = queryset.filter(updated_at__lt=until)
+    if cursor:
+        stamp, pk = cursor
+        queryset = queryset.filter(updated_at__gte=stamp).filter(Q(updated_at__gt=stamp) | Q(updated_at=stamp, pk__gt=pk))
+    return list(queryset.order_by('updated_at', 'pk').values(*fields)[:limit + 1])
+
+
+def pull(user, mark=None, limit=PULL_LIMIT):
+    """
+    Rows changed after `mark` (oldest first, at most `limit` per source) and
+    the mark to send next time; `more` is true while any source has more rows.
+    """
+    cursors = decode_mark(mark)
+    until = timezone.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+    result = {'more': False}
+    for index, (name, queryset, fields) in enumerate(_sources(user)):
+        rows = _changed_since(queryset, cursors[index], until, fields, limit)
+        if len(rows) > limit:
+            rows = rows[:limit]
+            result['more'] = True
+        if rows:
+            cursors[index] = (rows[-1]['updated_at'], rows[-1]['id'])
+        result[name] = rows
+    result['mark'] = encode_mark(cursors)
+    return result
+
+
+# --- push ---
+def read_batch(body, content_encoding=''):
+    """The push body as bytes, gunzipped when sent with Content-Encoding: gzip."""
+    too_large = SyncError(f'batch ው ከ {MAX_PUSH_BYTES // (1024 * 1024)} MB መብለጥ የለበትም።')
+    if content_encoding.strip().lower() != 'gzip':
+        if len(body) > MAX_PUSH_BYTES:
+            raise too_large
+        return body
+    # የሚፈታው መጠን የተገደበ ነው (gzip bomb)
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        data = decompressor.decompress(body, MAX_PUSH_BYTES)
+    except zlib.error:
+        raise SyncError('gzip ትክክል አይደለም።')
+    if decompressor.unconsumed_tail:
+        raise too_large
+    return data
+
+
+def _items(batch, name):
+    items = batch.get(name, [])
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise SyncError(f'{name} የ object ዝርዝር መሆን አለበት።')
+    return items
+
+
+def _prepare_registrations(user, registrations):
+    # ማረጋገጫው እና password hashing (በአንዱ ~0.5 ሰከንድ) ከ transaction ውጭ ይሰራሉ
+    scope = scoping.scope_for_user(user)
+    rows = []
+    for item in registrations:
+        key = str(item.get('key', ''))
+        data = {field: value for field, value in item.items() if field != 'key'}
+        if not scoping.in_scope(scope, data.get('region')):
+            data = {'__error__': 'region: ይህንን ክልል ለመመዝገብ ፍቃድ የለዎትም።'}
+        rows.append((key, data))
+    valid, errors = importing.validate_rows(rows)
+    hashes = importing.hash_passwords([form.cleaned_data['password'] for key, form in valid])
+    return valid, hashes, {key: message for key, phone, message in errors}
+
+
+def _register(valid, hashes):
+    members = importing.create_members([form for key, form in valid], hashes) if valid else []
+    return {key: member for (key, form), member in zip(valid, members)}
+
+
+def _attend(attendance, registered):
+    meetings = set(
+        Meeting.objects.filter(pk__in={item.get('meeting') for item in attendance if isinstance(item.get('meeting'), int)})
+        .values_list('pk', flat=True)
+    )
+    membership_ids = {checkin.parse_membership_id(str(item.get('member', ''))) for item in attendance} - {None}
+    found = checkin.resolve_members(membership_ids) if membership_ids else {}
+    pairs, rejected = set(), []
+    for index, item in enumerate(attendance):
+        if item.get('registration') is not None:
+            member = registered.get(str(item['registration']))
+            member_id = member.pk if member else None
+        else:
+            member_id = found.get(checkin.parse_membership_id(str(item.get('member', ''))))
+        meeting_id = item.get('meeting')
+        if not isinstance(meeting_id, int) or meeting_id not in meetings:
+            rejected.append({'index': index, 'error': 'ስብሰባው አልተገኘም።'})
+        elif member_id is None:
+            rejected.append({'index': index, 'error': 'አባሉ አልተገኘም።'})
+        else:
+            pairs.add((member_id, meeting_id))
+    if pairs:
+        checkin.write_attendance(pairs)
+    return {'recorded': len(pairs), 'rejected': rejected}
+
+
+def _prepare(user, batch):
+    registrations, attendance = _items(batch, 'registrations'), _items(batch, 'attendance')
+    if len(registrations) > MAX_PUSH_REGISTRATIONS:
+        raise SyncError(f'ቢበዛ {MAX_PUSH_REGISTRATIONS} ምዝገባዎች በአንድ batch።')
+    if len(registrations) + len(attendance) > MAX_PUSH_ITEMS:
+        raise SyncError(f'ቢበዛ {MAX_PUSH_ITEMS} ምዝገባዎች/ተሳትፎዎች በአንድ batch።')
+    return (*_prepare_registrations(user, registrations), attendance)
+
+
+def _apply(valid, hashes, errors, attendance):
+    registered = _register(valid, hashes)
+    return {
+        'registered': {key: member.membership_id for key, member in registered.items()},
+        'errors': errors,
+        'attendance': _attend(attendance, registered),
+    }
+
+
+def push(user, key, batch):
+    """
+    Apply a batch of registrations and attendance once per idempotency `key`.
+    Returns (response, replayed); a replayed batch returns the first response.
+    """
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise SyncError(f'Idempotency-Key ያስፈልጋል (ቢበዛ {MAX_KEY_LENGTH} ፊደላት)።')
+    if not isinstance(batch, dict):
+        raise SyncError('batch ው JSON object መሆን አለበት።')
+    receipt = SyncReceipt.objects.filter(user=user, key=key).first()
+    if receipt is not None:
+        return receipt.response, True
+    prepared = _prepare(user, batch)
+    try:
+        # transaction ው የሚይዘው መጻፉን ብቻ ነው (bulk INSERTs፣ check-in፣ receipt)
+        with transaction.atomic():
+            response = _apply(*prepared)
+            SyncReceipt.objects.create(user=user, key=key, response=response)
+    except IntegrityError:
+        # ተመሳሳይ batch በሌላ request በዚሁ ጊዜ ተጽፏል
+        receipt = SyncReceipt.objects.filter(user=user, key=key).first()
+        if receipt is None:
+            raise
+        return receipt.response, True
+    return response, False
@@ -0,0 +1,32 @@
+# members/templatetags/member_photos.py
+
+from django import template
+from django.utils.html import format_html
+
+from members.images import VARIANTS, variant_url
+
+register = template.Library()
+
+# በገጹ ላይ የሚታየው መጠን -> (1x, 2x) ቅጂዎች
+SIZES = {
+    'thumb': ('thumb', 'medium'),
+    'card': ('medium', 'card'),
+}
+
+
+@register.simple_tag
+def member_photo(member, size='thumb', css_class='', alt=None):
+    """Render a member photo as <picture> with WebP/JPEG srcsets, or the original while variants are pending."""
+    alt = member.full_name if alt is None else alt
+    if not member.photo_variants_ready:
+        return format_html('<img src="{}" alt="{}" class="{}" loading="lazy">', member.photo.url, alt, css_class)
+
+    name = member.photo.name
+    one_x, two_x = SIZES[size]
+    webp = f"{variant_url(name, one_x, 'webp')} 1x, {variant_url(name, two_x, 'webp')} 2x"
+    jpeg = f"{variant_url(name, one_x, 'jpg')} 1x, {variant_url(name, two_x, 'jpg')} 2x"
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}">'
+        '<img src="{}" srcset="{}" alt="{}" class="{}" width="{}" height="{}" loading="lazy"></picture>',
+        webp, variant_url(name, one_x, 'jpg'), jpeg, alt, css_class, VARIANTS[one_x], VARIANTS[one_x],
+    )
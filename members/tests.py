@@ -1,3 +1,1667 @@
-from django.test import TestCase
+import csv
+import gzip
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from importlib import import_module
+from io import BytesIO, StringIO
+from itertools import islice
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.contrib.auth.models import Group, User
+from django.contrib.sessions.models import Session
+from django.db import IntegrityError, connection, router, transaction
+from django.http import HttpResponse
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from . import scoping
+from .importing import insert_members
+from .pagination import InvalidCursor, KeysetPaginator, decode_cursor
+from .search import FTS_TABLE, search_members
+from .templatetags.member_photos import member_photo
+from .middleware import ChangeLogMiddleware, ReplicaPinningMiddleware, count_queries
+from . import (
+    analytics, cards, changelog, checkin, dedup, engagement, identity, images, importing, messaging, qr, routing, seeding, stats,
+    sync, units, views,
+)
+from .models import (
+    AdministrativeUnit, Announcement, Attendance, Broadcast, ChangeLogEntry, DuplicateCandidate, Meeting, MeetingAttendanceStat, Member, MemberEngagement,
+    MemberStat, MembershipCounter, OutboundMessage, RegionEngagement, SyncReceipt,
+)
+from .urls import urlpatterns
+
+# ለእያንዳንዱ URL የሚፈቀደው ከፍተኛ የ queries ብዛት (user መጫንን ጨምሮ፤ session ከ cache ይነበባል)።
+# አዲስ URL ሲጨመር እዚህም መመዝገብ አለበት፤ አለበለዚያ test_every_url_has_a_budget ይወድቃል።
+#   name: (viewer, kwargs, GET params, budget)
+QUERY_BUDGETS = {
+    'dashboard': ('staff', {}, {}, 6),
+    'area_breakdown': ('staff', {}, {}, 2),
+    'profile': ('member', {}, {}, 2),
+    'profile_update': ('member', {}, {}, 2),
+    'member_list': ('staff', {}, {'query': 'አበበ', 'region': 'ADD'}, 2),
+    'member_detail': ('member', {'pk': 'own'}, {}, 4),
+    'announcements': ('member', {}, {}, 4),
+    'register_member': (None, {}, {}, 0),
+    'login': (None, {}, {}, 0),
+    'logout': ('member', {}, {}, 1),
+    'password_change': ('member', {}, {}, 1),
+    'password_change_done': ('member', {}, {}, 1),
+    'password_reset': (None, {}, {}, 0),
+    'password_reset_done': (None, {}, {}, 0),
+    'password_reset_confirm': (None, {'uidb64': 'MQ', 'token': 'set-password'}, {}, 1),
+    'password_reset_complete': (None, {}, {}, 0),
+    'export_members_csv': ('staff', {}, {'region': 'ADD'}, 2),
+    'member_id_card': ('member', {'pk': 'own'}, {}, 2),
+    # user + ምርጫውን መቁጠር + ካርዶቹ
+    'print_id_cards': ('staff', {}, {'ids': 'own'}, 3),
+    # POST ብቻ፤ ትክክለኛው ወጪ በ MeetingCheckInTests ይለካል
+    'meeting_check_in': ('staff', {'meeting_id': 1}, {}, 1),
+    # user + scope + አንድ query ለእያንዳንዱ ሞዴል
+    'sync_pull': ('staff', {}, {}, 5),
+    # POST ብቻ፤ በ SyncApiTests ይሞከራል
+    'sync_push': ('staff', {}, {}, 1),
+    # user + scope፤ ቁጥሮቹ ከ snapshot ፋይሉ ይሰላሉ
+    'analytics_report': ('staff', {}, {}, 2),
+    'analytics_data': ('staff', {}, {'rows': 'region', 'columns': 'gender'}, 2),
+}
+
+
+def _consume(response):
+    # streaming responses ቴምፕሌቱን/queries በማንበብ ጊዜ ያካሂዳሉ
+    if response.streaming:
+        for chunk in response.streaming_content:
+            pass
+
+
+
+def shared_cache():
+    # ብዙ workers ያሉት deployment የጋራ cache (CACHE_URL) ይጠቀማል፤ የ query ብዛቶቹ የሚለኩት ለዚያ ነው።
+    # በአንድ test process ውስጥ LocMemCache እንደ የጋራ cache ይሰራል
+    return mock.patch.object(scoping, 'cache_is_shared', lambda: True)
+
+
+@shared_cache()
+@override_settings(ID_CARD_WORKERS=1, PHOTO_PROCESSING_SYNC=True)
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        cls.user = User.objects.create_user('0911000001', password='pw')
+        cls.member = Member.objects.create(
+            user=cls.user, full_name='አበበ ከበደ', gender='M', date_of_birth=date(1990, 1, 1),
+            phone_number='0911000001', region='ADD', city='Addis Ababa',
+        )
+        for number in range(2, 12):
+            Member.objects.create(
+                user=User.objects.create_user(f'09110000{number:02d}', password='pw'),
+                full_name=f'አበበ {number}', gender='F', date_of_birth=date(1990, 1, 1),
+                phone_number=f'09110000{number:02d}', region='ADD', city='Adama',
+            )
+        Announcement.objects.create(title='ስብሰባ', content='...')
+        snapshot_dir = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.enterClassContext(override_settings(ANALYTICS_SNAPSHOT_PATH=os.path.join(snapshot_dir, 'members.npz')))
+        analytics.build_snapshot()
+
+    def assertQueryBudget(self, name, viewer, kwargs, params, budget):
+        kwargs = {key: (self.member.pk if value == 'own' else value) for key, value in kwargs.items()}
+        params = {key: (self.member.pk if value == 'own' else value) for key, value in params.items()}
+        if viewer:
+            self.client.force_login(self.staff if viewer == 'staff' else self.user)
+        else:
+            self.client.logout()
+
+        with count_queries() as stats:
+            response = self.client.get(reverse(name, kwargs=kwargs), params)
+            _consume(response)
+        self.assertLess(response.status_code, 500, name)
+        self.assertLessEqual(
+            stats.count, budget,
+            f"{name} ran {stats.count} queries (budget {budget}); slowest: {stats.slowest_sql}",
+        )
+
+    def test_every_url_has_a_budget(self):
+        names = {pattern.name for pattern in urlpatterns if pattern.name}
+        self.assertEqual(names - set(QUERY_BUDGETS), set())
+
+    def test_query_budgets(self):
+        for name, (viewer, kwargs, params, budget) in QUERY_BUDGETS.items():
+            with self.subTest(name=name):
+                self.assertQueryBudget(name, viewer, kwargs, params, budget)
+
+    def test_member_detail_fetches_member_once(self):
+        self.client.force_login(self.user)
+        # user + member (request.member) + engagement rollup + recent attendance፤ session ከ cache
+        with self.assertNumQueries(4):
+            self.client.get(reverse('member_detail', kwargs={'pk': self.member.pk}))
+
+    def test_headers_for_staff(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('dashboard'))
+        self.assertIn('X-DB-Query-Count', response)
+        self.assertIn('X-DB-Time-ms', response)
+
+
+
+@override_settings(ID_CARD_WORKERS=1, PHOTO_PROCESSING_SYNC=True)
+class AsgiModeTests(TestCase):
+    # AsyncClient ጥያቄዎቹን በ ASGI handler (async middleware) በኩል ያሳልፋል
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        cls.user = User.objects.create_user('0911000001', password='pw')
+        cls.member = Member.objects.create(
+            user=cls.user, full_name='አበበ ከበደ', gender='M', date_of_birth=date(1990, 1, 1),
+            phone_number='0911000001', region='ADD', city='Addis Ababa',
+        )
+        Announcement.objects.create(title='ስብሰባ', content='...')
+
+    async def test_async_views_render(self):
+        await self.async_client.aforce_login(self.staff)
+        for name, kwargs in [
+            ('dashboard', {}), ('announcements', {}),
+            ('member_detail', {'pk': self.member.pk}), ('member_id_card', {'pk': self.member.pk}),
+        ]:
+            with self.subTest(name=name):
+                response = await self.async_client.get(reverse(name, kwargs=kwargs))
+                self.assertEqual(response.status_code, 200)
+                # queries በ sync_to_async thread connection ላይም ይቆጠራሉ
+                self.assertGreater(int(response['X-DB-Query-Count']), 0)
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('profile'))
+        self.assertContains(response, 'አበበ ከበደ')
+
+    async def test_export_streams_without_buffering(self):
+        await self.async_client.aforce_login(self.staff)
+        response = await self.async_client.get(reverse('export_members_csv'))
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response])
+        self.assertIn(self.member.membership_id.encode('utf-8'), content)
+
+
+class MemberListPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        joined = timezone.now() - timedelta(days=10)
+        cls.members = []
+        for number in range(5):
+            member = Member.objects.create(
+                user=User.objects.create_user(f'09110007{number:02d}', password='pw'),
+                full_name=f'ገጽ {number}', gender='M', date_of_birth=date(1990, 1, 1),
+                phone_number=f'09110007{number:02d}', region='ADD', city='Addis Ababa',
+                # ሁለት አባላት ተመሳሳይ ቀን አላቸው፤ ቅደም ተከተሉ በ id ይወሰናል
+                date_joined=joined + timedelta(days=min(number, 3)),
+            )
+            cls.members.append(member)
+        cls.newest_first = sorted(cls.members, key=lambda member: (member.date_joined, member.pk), reverse=True)
+
+    def test_next_and_previous_cursors_walk_every_row_once(self):
+        paginator = KeysetPaginator(Member.objects.all(), per_page=2)
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(after=pages[-1].next_cursor))
+        self.assertEqual([member for page in pages for member in page], self.newest_first)
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertFalse(pages[0].has_previous())
+
+        back = paginator.page(before=pages[2].previous_cursor)
+        self.assertEqual(list(back), list(pages[1]))
+        self.assertEqual(list(paginator.page(before=back.previous_cursor)), list(pages[0]))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(InvalidCursor):
+            decode_cursor('not-a-cursor')
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('member_list'), {'after': '!!'})
+        self.assertRedirects(response, reverse('member_list'), fetch_redirect_response=False)
+
+    def test_list_links_keep_filters(self):
+        self.client.force_login(self.staff)
+        with mock.patch.object(views, 'MEMBER_LIST_PAGE_SIZE', 2):
+            response = self.client.get(reverse('member_list'), {'region': 'ADD'})
+        self.assertEqual(list(response.context['members']), self.newest_first[:2])
+        self.assertIn('region=ADD', response.context['next_query'])
+        self.assertIn('after=', response.context['next_query'])
+
+
+class MemberSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True, is_superuser=True)
+        people = [
+            ('አበበ ከበደ', 'ADD', 'Addis Ababa'),
+            ('ቶላ ገመቹ', 'ORO', 'Adama'),
+            ('ከበደ አበራ', 'AMH', 'Bahir Dar'),
+        ]
+        cls.members = [
+            Member.objects.create(
+                user=User.objects.create_user(f'09110008{number:02d}', password='pw'),
+                full_name=name, gender='M', date_of_birth=date(1990, 1, 1),
+                phone_number=f'09110008{number:02d}', region=region, city=city,
+            )
+            for number, (name, region, city) in enumerate(people)
+        ]
+
+    def search(self, query, ranked=False):
+        return list(search_members(Member.objects.all(), query, ranked))
+
+    def test_id_and_phone_match_only_as_prefixes(self):
+        self.assertEqual(self.search(self.members[1].membership_id[:9]), [self.members[1]])
+        self.assertEqual(self.search('0911000802'), [self.members[2]])
+        # የመለያ ቁጥሩ መካከለኛ ክፍሎች (ክልል፣ ዓመት) ብቻቸውን አይዛመዱም
+        year = self.members[0].membership_id.split('-')[2]
+        self.assertEqual(self.search(year), [])
+        self.assertEqual(self.search('AMH'), [])
+
+    def test_ranked_results_put_the_best_match_first(self):
+        results = self.search('ከበደ', ranked=True)
+        self.assertEqual(set(results), {self.members[0], self.members[2]})
+        self.assertTrue(all(hasattr(member, 'search_rank') for member in results))
+        ranks = [member.search_rank for member in results]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+    def test_index_follows_save_and_delete(self):
+        member = self.members[1]
+        member.full_name = 'ሃይሉ ደበበ'
+        member.save()
+        self.assertEqual(self.search('ሃይሉ'), [member])
+        self.assertEqual(self.search('ቶላ'), [])
+        member.delete()
+        self.assertEqual(self.search('ሃይሉ'), [])
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE rowid = %s", [member.pk])
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_bulk_import_is_indexed(self):
+        user = User(username='0911000899', password='!')
+        imported = Member(
+            full_name='ሰላም ታደሰ', gender='F', date_of_birth=date(1995, 1, 1),
+            phone_number='0911000899', region='SID', city='Hawassa',
+        )
+        [imported] = insert_members([user], [imported])
+        self.assertEqual(self.search('ሰላም ታደ'), [imported])
+        self.assertEqual(self.search('Hawa'), [imported])
+
+    def test_member_list_and_admin_use_ranked_search(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('member_list'), {'query': 'ከበደ'})
+        self.assertTrue(all(hasattr(member, 'search_rank') for member in response.context['members']))
+        response = self.client.get(reverse('admin:members_member_changelist'), {'q': self.members[1].membership_id})
+        self.assertEqual(list(response.context['cl'].result_list), [self.members[1]])
+
+
+class MemberStatTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.members = [
+            Member.objects.create(
+                user=User.objects.create_user(f'09110009{number:02d}', password='pw'),
+                full_name=f'ስታት {number}', gender='MF'[number % 2], date_of_birth=date(1990, 1, 1),
+                phone_number=f'09110009{number:02d}', region='ADD', city='Addis Ababa',
+                date_joined=timezone.now() - timedelta(days=400 * number),
+            )
+            for number in range(4)
+        ]
+
+    def stats(self):
+        # ዜሮ የሆኑ ረድፎች ከ rebuild በኋላ አይኖሩም፤ አይነጻጸሩም
+        return sorted(MemberStat.objects.filter(count__gt=0).values_list('region', 'gender', 'join_year', 'count'))
+
+    def assertMatchesRebuild(self):
+        incremental = self.stats()
+        stats.rebuild()
+        self.assertEqual(incremental, self.stats())
+
+    def test_creation_matches_rebuild(self):
+        self.assertEqual(sum(count for *key, count in self.stats()), 4)
+        self.assertMatchesRebuild()
+
+    def test_updates_deactivation_and_deletion_match_rebuild(self):
+        first, second, third, fourth = self.members
+        first.region = 'AMH'
+        first.save()
+        # ከፊል ጭነት (only()) እና update_fields ሲሰጥ የቀድሞው ቁልፍ ከዳታቤዝ ይነበባል
+        partial = Member.objects.only('id', 'gender').get(pk=second.pk)
+        partial.gender = 'M'
+        partial.save(update_fields=['gender'])
+        third.is_active = False
+        third.save()
+        fourth.delete()
+        self.assertMatchesRebuild()
+
+    def test_bulk_insert_matches_rebuild(self):
+        users = [User(username=f'09110009{number:02d}', password='!') for number in range(10, 13)]
+        insert_members(users, [
+            Member(
+                full_name=f'ስታት {number}', gender='F', date_of_birth=date(1990, 1, 1),
+                phone_number=f'09110009{number:02d}', region='TIG', city='Mekelle',
+            )
+            for number in range(10, 13)
+        ])
+        self.assertIn(('TIG', 'F', timezone.localtime().year, 3), self.stats())
+        self.assertMatchesRebuild()
+
+
+class MemberExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        people = [
+            ('ADD', date(2024, 3, 1), True),
+            ('ADD', date(2024, 6, 1), True),
+            ('ADD', date(2024, 6, 2), False),
+            ('ORO', date(2024, 6, 1), True),
+        ]
+        cls.members = [
+            Member.objects.create(
+                user=User.objects.create_user(f'09110010{number:02d}', password='pw'),
+                full_name=f'ሪፖርት {number}', gender='F', date_of_birth=date(1990, 1, 1),
+                phone_number=f'09110010{number:02d}', region=region, city='Addis Ababa', is_active=active,
+                date_joined=timezone.make_aware(datetime.combine(joined, datetime.min.time())),
+            )
+            for number, (region, joined, active) in enumerate(people)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+
+    def export(self, **params):
+        response = self.client.get(reverse('export_members_csv'), params)
+        self.assertEqual(response.status_code, 200)
+        return response, b''.join(response.streaming_content)
+
+    def exported_ids(self, content):
+        rows = list(csv.reader(StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual(rows[0][1], 'የአባልነት መለያ')
+        return [row[1] for row in rows[1:]]
+
+    def test_filters_apply_to_active_members_only(self):
+        response, content = self.export(region='ADD')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        # አዲሶቹ መጀመሪያ፤ ንቁ ያልሆነው አይካተትም
+        self.assertEqual(self.exported_ids(content), [self.members[1].membership_id, self.members[0].membership_id])
+        response, content = self.export(start_date='2024-06-01', end_date='2024-06-01')
+        self.assertEqual(set(self.exported_ids(content)), {self.members[1].membership_id, self.members[3].membership_id})
+
+    def test_gzip_output_matches_plain_csv(self):
+        with mock.patch.object(views, 'EXPORT_CHUNK_SIZE', 2):
+            response, compressed = self.export(compress='gzip')
+            plain = self.export()[1]
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('eudp_members_report.csv.gz', response['Content-Disposition'])
+        self.assertEqual(gzip.decompress(compressed), plain)
+        self.assertEqual(len(self.exported_ids(plain)), 3)
+
+
+class QrCodeCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('0911001100', password='pw')
+        cls.member = Member.objects.create(
+            user=cls.user, full_name='አበበ ከበደ', gender='M', date_of_birth=date(1990, 1, 1),
+            phone_number='0911001100', region='ADD', city='Addis Ababa',
+        )
+
+    def setUp(self):
+        caches[qr.QR_CACHE_ALIAS].clear()
+        cache.clear()
+
+    def test_png_is_rendered_once_per_content(self):
+        with mock.patch.object(qr, 'render_qr_png', wraps=qr.render_qr_png) as render:
+            first = qr.get_qr_png(self.member.full_name, self.member.membership_id)
+            second = qr.get_qr_png(self.member.full_name, self.member.membership_id)
+        self.assertEqual(first, second)
+        self.assertEqual(render.call_count, 1)
+
+    def test_renaming_or_deleting_drops_the_old_entry(self):
+        qr_cache = caches[qr.QR_CACHE_ALIAS]
+        old_key = qr.qr_cache_key(self.member.full_name, self.member.membership_id)
+        qr.get_qr_png(self.member.full_name, self.member.membership_id)
+        member = Member.objects.get(pk=self.member.pk)
+        member.full_name = 'አበበ በቀለ'
+        member.save()
+        self.assertIsNone(qr_cache.get(old_key))
+
+        qr.get_qr_png(member.full_name, member.membership_id)
+        member.delete()
+        self.assertIsNone(qr_cache.get(qr.qr_cache_key(member.full_name, member.membership_id)))
+
+    def test_unchanged_card_returns_304(self):
+        self.client.force_login(self.user)
+        url = reverse('member_id_card', kwargs={'pk': self.member.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        with mock.patch.object(qr, 'get_qr_base64') as get_qr:
+            self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+        get_qr.assert_not_called()
+
+        member = Member.objects.get(pk=self.member.pk)
+        member.city = 'Adama'
+        member.save()
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 200)
+
+
+class MemberImportTests(TestCase):
+    FIELDS = ['full_name', 'gender', 'date_of_birth', 'phone_number', 'region', 'zone', 'woreda', 'kebele', 'city', 'education_level']
+
+    @classmethod
+    def setUpTestData(cls):
+        Member.objects.create(
+            user=User.objects.create_user('0911001200', password='pw'),
+            full_name='ነባር አባል', gender='M', date_of_birth=date(1990, 1, 1),
+            phone_number='0911001200', region='ADD', city='Addis Ababa',
+        )
+
+    def setUp(self):
+        self.directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.path = os.path.join(self.directory, 'members.csv')
+
+    def row(self, number, **fields):
+        return {
+            'full_name': f'ገቢ {number}', 'gender': 'F', 'date_of_birth': '1995-05-05',
+            'phone_number': f'09110012{number:02d}', 'region': 'AMH', 'zone': 'ሰሜን ጎንደር', 'woreda': 'ደባርቅ',
+            'kebele': '01', 'city': 'Debark', 'education_level': 'DEGREE', **fields,
+        }
+
+    def write(self, rows):
+        with open(self.path, 'w', newline='', encoding='utf-8') as fp:
+            writer = csv.DictWriter(fp, self.FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def run_import(self, *args):
+        call_command('import_members', self.path, '--workers=1', *args, stdout=StringIO())
+
+    def report(self):
+        with open(f'{self.path}.errors.csv', encoding='utf-8') as fp:
+            return list(csv.reader(fp))[1:]
+
+    def test_invalid_rows_are_reported_and_valid_rows_created(self):
+        self.write([
+            self.row(1),
+            self.row(2, gender='X'),
+            self.row(3, phone_number='0911001200'),
+            self.row(4, phone_number='0911001201'),
+            self.row(5),
+        ])
+        self.run_import('--batch-size=2')
+        self.assertEqual(
+            sorted(Member.objects.filter(region='AMH').values_list('full_name', flat=True)), ['ገቢ 1', 'ገቢ 5'],
+        )
+        # (መስመር, ስልክ, ስህተት)፤ መስመር 1 ራስጌው ነው
+        errors = self.report()
+        self.assertEqual([(line, phone) for line, phone, message in errors], [
+            ('3', '0911001202'), ('4', '0911001200'), ('5', '0911001201'),
+        ])
+        self.assertTrue(errors[0][2].startswith('gender:'))
+        self.assertFalse(User.objects.get(username='0911001201').has_usable_password())
+
+    def test_resume_continues_after_the_last_committed_batch(self):
+        self.write([self.row(number) for number in range(1, 6)])
+        create_members = importing.create_members
+        calls = []
+
+        def fail_second_batch(forms, hashes):
+            calls.append(len(forms))
+            if len(calls) == 2:
+                raise RuntimeError('database went away')
+            return create_members(forms, hashes)
+
+        with mock.patch.object(importing, 'create_members', side_effect=fail_second_batch):
+            with self.assertRaises(RuntimeError):
+                self.run_import('--batch-size=2')
+        with open(f'{self.path}.checkpoint.json') as fp:
+            self.assertEqual(json.load(fp)['line'], 3)
+        self.assertEqual(Member.objects.filter(region='AMH').count(), 2)
+
+        self.run_import('--batch-size=2', '--resume')
+        self.assertEqual(Member.objects.filter(region='AMH').count(), 5)
+        self.assertEqual(self.report(), [])
+        with open(f'{self.path}.checkpoint.json') as fp:
+            self.assertEqual(json.load(fp)['line'], 6)
+
+
+    def test_jsonl_lines_that_are_not_objects_are_reported(self):
+        self.path = os.path.join(self.directory, 'members.jsonl')
+        with open(self.path, 'w', encoding='utf-8') as fp:
+            for line in (self.row(1), [], 1, 'x', '{broken', self.row(2)):
+                fp.write(line if line == '{broken' else json.dumps(line, ensure_ascii=False))
+                fp.write('\n')
+        self.run_import()
+        self.assertEqual(Member.objects.filter(region='AMH').count(), 2)
+        errors = self.report()
+        self.assertEqual([line for line, phone, message in errors], ['2', '3', '4', '5'])
+        self.assertEqual({message for line, phone, message in errors[:3]}, {'expected a JSON object'})
+        self.assertTrue(errors[3][2].startswith('invalid JSON:'))
+
+class SeedMembersTests(TestCase):
+
+    def test_same_seed_builds_the_same_members(self):
+        def build(seed):
+            factory = seeding.MemberFactory(seed=seed)
+            return [
+                (member.full_name, member.region, member.woreda, member.date_joined, member.phone_number)
+                for user, member in islice(factory, 5)
+            ]
+        self.assertEqual(build(7), build(7))
+        self.assertNotEqual(build(7), build(8))
+
+    def test_command_seeds_members_meetings_and_rollups(self):
+        stdout = StringIO()
+        call_command('seed_members', '30', '--batch-size=7', '--seed=3', '--meetings=2', '--attendees=10', stdout=stdout)
+        self.assertIn('Created 30 members, 2 meetings and 20 attendance records.', stdout.getvalue())
+        seeded = Member.objects.filter(phone_number__startswith=seeding.PHONE_PREFIX)
+        self.assertEqual(seeded.count(), 30)
+        self.assertEqual(seeded.values('membership_id').distinct().count(), 30)
+
+        # ሁለተኛ ሩጫ ስልክ ቁጥሮቹን ይቀጥላል
+        call_command('seed_members', '5', '--meetings=0', stdout=stdout)
+        self.assertEqual(User.objects.filter(username__startswith=seeding.PHONE_PREFIX).count(), 35)
+
+        # በ bulk የገቡት ስታቲስቲክስ እና ማጠቃለያዎች ከዜሮ ከተሰሉት ጋር ይመሳሰላሉ
+        seeded_stats = sorted(MemberStat.objects.filter(count__gt=0).values_list('region', 'gender', 'join_year', 'count'))
+        stats.rebuild()
+        self.assertEqual(seeded_stats, sorted(MemberStat.objects.filter(count__gt=0).values_list('region', 'gender', 'join_year', 'count')))
+        self.assertEqual(sum(MeetingAttendanceStat.objects.values_list('recorded', flat=True)), 20)
+
+    def test_command_rejects_non_positive_counts(self):
+        with self.assertRaises(CommandError):
+            call_command('seed_members', '0')
+
+
+class AnnouncementFeedTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('0911000099', password='pw')
+        Announcement.objects.create(title='ስብሰባ', content='...')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_cached_page_skips_database(self):
+        self.client.get(reverse('announcements'))
+        # user እና version (aggregate)፤ session እና ገጹ ከ cache
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('announcements'))
+        self.assertContains(response, 'ስብሰባ')
+
+    def test_unchanged_feed_returns_304(self):
+        response = self.client.get(reverse('announcements'))
+        response = self.client.get(reverse('announcements'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_saving_an_announcement_invalidates_the_feed(self):
+        first = self.client.get(reverse('announcements'))
+        # version ከዳታቤዝ ይሰላል፤ ለውጡ በሌላ worker ቢደረግም (ያለዚህ process signals) ይታያል
+        added = Announcement.objects.create(title='አዲስ መመሪያ', content='...')
+        response = self.client.get(reverse('announcements'), HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'አዲስ መመሪያ')
+
+        added.delete()
+        response = self.client.get(reverse('announcements'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'አዲስ መመሪያ')
+
+
+    def test_new_badge_expires_at_midnight(self):
+        Announcement.objects.update(date_posted=timezone.now() - timedelta(days=6))
+        first = self.client.get(reverse('announcements'))
+        self.assertContains(first, 'class="badge badge-new"')
+        # ከሁለት ቀን በኋላ ማስታወቂያው አልተቀየረም፣ ባጁ ግን መጥፋት አለበት (ከ cache ም፣ በ 304 ም)
+        later = timezone.localdate() + timedelta(days=2)
+        with mock.patch('django.utils.timezone.localdate', return_value=later):
+            response = self.client.get(reverse('announcements'), HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(response.status_code, 200)
+            self.assertNotContains(response, 'class="badge badge-new"')
+            response = self.client.get(reverse('announcements'), HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+            self.assertEqual(response.status_code, 200)
+
+class RegionScopeTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(name=scoping.COORDINATOR_GROUP)
+        cls.coordinator = User.objects.create_user('0911000200', password='pw', is_staff=True)
+        cls.coordinator_member = Member.objects.create(
+            user=cls.coordinator, full_name='ሰላማዊት ታደሰ', gender='F', date_of_birth=date(1985, 1, 1),
+            phone_number='0911000200', region='AMH', city='Bahir Dar',
+            is_coordinator=True, coordinator_region='AMH',
+        )
+        cls.other = Member.objects.create(
+            user=User.objects.create_user('0911000201', password='pw'), full_name='ጫላ ቶላ', gender='M',
+            date_of_birth=date(1990, 1, 1), phone_number='0911000201', region='ORO', city='Adama',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.coordinator.groups.add(self.group)
+        self.client.force_login(self.coordinator)
+
+    def test_coordinator_sees_only_their_region(self):
+        response = self.client.get(reverse('member_list'))
+        self.assertContains(response, 'ሰላማዊት ታደሰ')
+        self.assertNotContains(response, 'ጫላ ቶላ')
+
+        export = b''.join(self.client.get(reverse('export_members_csv')).streaming_content).decode('utf-8')
+        self.assertIn('ሰላማዊት ታደሰ', export)
+        self.assertNotIn('ጫላ ቶላ', export)
+
+        response = self.client.get(reverse('member_detail', kwargs={'pk': self.other.pk}))
+        self.assertRedirects(response, reverse('profile'))
+
+    @shared_cache()
+    def test_scope_is_cached_and_invalidated_on_group_change(self):
+        self.client.get(reverse('member_list'))
+        with self.assertNumQueries(2):
+            self.client.get(reverse('member_list'))
+
+        self.coordinator.groups.remove(self.group)
+        response = self.client.get(reverse('member_list'))
+        self.assertContains(response, 'ጫላ ቶላ')
+
+    def test_process_local_cache_does_not_keep_scopes(self):
+        # ሌላ worker ያስቀመጠው የድሮ (ሰፊ) ወሰን፤ LocMemCache ላይ ስረዛው እዚህ አይደርስም
+        cache.set(scoping._cache_key(self.coordinator.pk), scoping.ALL_REGIONS)
+        response = self.client.get(reverse('member_list'))
+        self.assertContains(response, 'ሰላማዊት ታደሰ')
+        self.assertNotContains(response, 'ጫላ ቶላ')
+
+    def test_coordinator_without_region_sees_nothing(self):
+        self.coordinator_member.coordinator_region = None
+        self.coordinator_member.save()
+        response = self.client.get(reverse('member_list'))
+        self.assertNotContains(response, 'ሰላማዊት ታደሰ')
+        self.assertNotContains(response, 'ጫላ ቶላ')
+
+
+@override_settings(CHECKIN_FLUSH_SIZE=3, CHECKIN_FLUSH_INTERVAL=60)
+class MeetingCheckInTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        cls.meeting = Meeting.objects.create(title='ጠቅላላ ጉባኤ', date=timezone.now(), location='አዲስ አበባ')
+        cls.members = [
+            Member.objects.create(
+                user=User.objects.create_user(f'09110003{number:02d}', password='pw'),
+                full_name=f'ተሳታፊ {number}', gender='M', date_of_birth=date(1990, 1, 1),
+                phone_number=f'09110003{number:02d}', region='ADD', city='Addis Ababa',
+            )
+            for number in range(4)
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.staff)
+        self.url = reverse('meeting_check_in', kwargs={'meeting_id': self.meeting.pk})
+
+    def tearDown(self):
+        # የቀሩ check-ins በዚሁ test transaction ውስጥ ይጻፋሉ (ከዚያ rollback ይደረጋሉ)
+        checkin.buffer.flush()
+
+    def post_scans(self, scans):
+        return self.client.post(self.url, {'scans': scans}, content_type='application/json')
+
+    def test_qr_payload_is_buffered_then_flushed(self):
+        payload = qr.qr_payload(self.members[0].full_name, self.members[0].membership_id)
+        response = self.client.post(self.url, {'payload': payload})
+        self.assertEqual(response.json()['accepted'], [self.members[0].membership_id])
+        self.assertFalse(Attendance.objects.exists())
+
+        checkin.buffer.flush()
+        self.assertTrue(Attendance.objects.filter(member=self.members[0], meeting=self.meeting).exists())
+
+    def test_batch_upserts_without_duplicates(self):
+        Attendance.objects.create(member=self.members[1], meeting=self.meeting, is_present=False)
+        ids = [member.membership_id for member in self.members]
+        response = self.post_scans(ids + [ids[0], 'EUDP-ADD-99-9999', 'garbage'])
+        self.assertEqual(response.json()['unknown'], ['EUDP-ADD-99-9999', 'garbage'])
+
+        # ከ CHECKIN_FLUSH_SIZE በላይ ስለሆነ ወዲያው ተጽፏል
+        self.assertEqual(Attendance.objects.filter(meeting=self.meeting).count(), 4)
+        self.assertTrue(Attendance.objects.get(member=self.members[1], meeting=self.meeting).is_present)
+
+    def test_deltas_come_from_the_rows_written(self):
+        Attendance.objects.create(member=self.members[1], meeting=self.meeting, is_present=False)
+        pairs = [(member.pk, self.meeting.pk) for member in self.members[:3]]
+        changed = checkin.write_attendance(pairs)
+        self.assertEqual(sorted(changed), [
+            (self.members[0].pk, self.meeting.pk, False),
+            (self.members[1].pk, self.meeting.pk, True),
+            (self.members[2].pk, self.meeting.pk, False),
+        ])
+        # ሁለተኛው ጸሐፊ (ለምሳሌ በሌላ በር የተቃኘ) ምንም አይቀይርም፣ ቁጥሮቹ አይደገሙም
+        self.assertEqual(checkin.write_attendance(pairs), [])
+        stat = MeetingAttendanceStat.objects.get(meeting=self.meeting)
+        self.assertEqual((stat.recorded, stat.attended), (3, 3))
+
+    def test_failed_flush_is_retried_by_the_timer(self):
+        pending = checkin.AttendanceBuffer()
+        pending.add({(self.members[0].pk, self.meeting.pk)})
+        with mock.patch.object(checkin, 'write_attendance', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                pending.flush()
+        self.assertEqual(len(pending), 1)
+        self.assertIsNotNone(pending._timer)
+        pending.flush()
+        self.assertTrue(Attendance.objects.filter(member=self.members[0], meeting=self.meeting).exists())
+
+    def test_unwritable_check_in_is_isolated_then_dropped(self):
+        pending = checkin.AttendanceBuffer()
+        poison, good, later = [(member.pk, self.meeting.pk) for member in self.members[:3]]
+        write_attendance = checkin.write_attendance
+
+        def write(pairs):
+            # ለምሳሌ አባሉ ከተቃኘ በኋላ ተሰርዟል (FK violation)
+            if poison in pairs:
+                raise IntegrityError('FOREIGN KEY constraint failed')
+            return write_attendance(pairs)
+
+        with mock.patch.object(checkin, 'write_attendance', side_effect=write), self.settings(CHECKIN_FLUSH_SIZE=10, CHECKIN_MAX_ATTEMPTS=2):
+            pending.add({poison, good})
+            with self.assertLogs('members.checkin', 'ERROR'), self.assertRaises(IntegrityError):
+                pending.flush()
+            self.assertEqual(len(pending), 2)
+
+            # አዲሱ check-in አይታገድም፤ የተመለሱት አንድ በአንድ ይሞከራሉ፣ የማይጻፈው ይጣላል
+            pending.add({later})
+            with self.assertLogs('members.checkin', 'ERROR') as logs, self.assertRaises(IntegrityError):
+                pending.flush()
+        self.assertIn('Dropping check-in', logs.output[-1])
+        self.assertEqual(len(pending), 0)
+        present = set(Attendance.objects.filter(meeting=self.meeting).values_list('member_id', 'meeting_id'))
+        self.assertEqual(present, {good, later})
+
+    def test_lookup_costs_one_query(self):
+        # user + meeting + members (session ከ cache)
+        with self.assertNumQueries(3):
+            self.post_scans([self.members[0].membership_id])
+
+    def test_rejects_non_staff_and_bad_input(self):
+        self.assertEqual(self.client.post(self.url, 'nope', content_type='application/json').status_code, 400)
+        self.client.force_login(self.members[0].user)
+        self.assertEqual(self.post_scans([]).status_code, 403)
+
+
+class EngagementRollupTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.meetings = [
+            Meeting.objects.create(title=f'ስብሰባ {number}', date=timezone.now(), location='አዳማ')
+            for number in range(2)
+        ]
+        cls.members = [
+            Member.objects.create(
+                user=User.objects.create_user(f'09110004{number:02d}', password='pw'),
+                full_name=f'አባል {number}', gender='F', date_of_birth=date(1992, 1, 1),
+                phone_number=f'09110004{number:02d}', region='ORO', city='Adama',
+            )
+            for number in range(3)
+        ]
+
+    def rollups(self):
+        # ባዶ (0/0) ረድፎች ከ rebuild በኋላ አይኖሩም፤ አይነጻጸሩም
+        return (
+            sorted(MemberEngagement.objects.filter(recorded__gt=0).values_list('member_id', 'recorded', 'attended', 'last_attended')),
+            sorted(MeetingAttendanceStat.objects.filter(recorded__gt=0).values_list('meeting_id', 'recorded', 'attended')),
+            sorted(RegionEngagement.objects.filter(recorded__gt=0).values_list('region', 'recorded', 'attended')),
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.rollups()
+        engagement.rebuild()
+        self.assertEqual(incremental, self.rollups())
+
+    def test_single_writes_match_rebuild(self):
+        first = Attendance.objects.create(member=self.members[0], meeting=self.meetings[0], is_present=True)
+        Attendance.objects.create(member=self.members[1], meeting=self.meetings[0], is_present=False)
+        Attendance.objects.create(member=self.members[0], meeting=self.meetings[1], is_present=True)
+        first.is_present = False
+        first.save()
+        Attendance.objects.filter(member=self.members[0], meeting=self.meetings[1]).get().delete()
+        self.assertMatchesRebuild()
+
+    @override_settings(CHECKIN_FLUSH_SIZE=1)
+    def test_bulk_check_in_matches_rebuild(self):
+        Attendance.objects.create(member=self.members[1], meeting=self.meetings[0], is_present=False)
+        checkin.check_in(self.meetings[0], [member.membership_id for member in self.members] * 2)
+        self.assertEqual(RegionEngagement.objects.get(region='ORO').attended, 3)
+        self.assertMatchesRebuild()
+
+    def test_cascades_and_region_moves_match_rebuild(self):
+        for meeting in self.meetings:
+            for member in self.members:
+                Attendance.objects.create(member=member, meeting=meeting, is_present=member != self.members[2])
+        self.meetings[1].delete()
+        self.members[1].user.delete()
+        self.members[0].region = 'AMH'
+        self.members[0].save()
+        self.assertMatchesRebuild()
+
+
+@override_settings(PHOTO_PROCESSING_SYNC=True)
+class MemberIdentityCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('0911000001', password='pw')
+        cls.member = Member.objects.create(
+            user=cls.user, full_name='አበበ ከበደ', gender='M', date_of_birth=date(1990, 1, 1),
+            phone_number='0911000001', region='ADD', city='Addis Ababa',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def test_profile_reuses_cached_member(self):
+        self.client.get(reverse('profile'))
+        # user ብቻ፤ session እና member ከ cache
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('profile'))
+        self.assertContains(response, 'አበበ ከበደ')
+
+    def test_saving_member_invalidates_cache(self):
+        self.client.get(reverse('profile'))
+        self.member.full_name = 'አበበ በቀለ'
+        self.member.save()
+        self.assertContains(self.client.get(reverse('profile')), 'አበበ በቀለ')
+
+    def test_photo_processing_invalidates_cache(self):
+        media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        buffer = BytesIO()
+        Image.new('RGB', (40, 40), 'red').save(buffer, format='PNG')
+        name = default_storage.save('member_photos/a.png', ContentFile(buffer.getvalue()))
+        Member.objects.filter(pk=self.member.pk).update(photo=name)
+
+        self.assertFalse(identity.get_member(User.objects.get(pk=self.user.pk)).photo_variants_ready)
+        images.process_member_photo(self.member.pk)
+        self.assertTrue(identity.get_member(User.objects.get(pk=self.user.pk)).photo_variants_ready)
+
+    def test_profile_update_keeps_changes_missing_from_the_cached_member(self):
+        self.client.get(reverse('profile'))
+        # cache ውስጥ ያለው member የማያየው ለውጥ (ሌላ worker፣ admin ወይም QuerySet.update)
+        Member.objects.filter(pk=self.member.pk).update(membership_level='LEADERSHIP', is_active=False)
+        response = self.client.post(reverse('profile_update'), {
+            'full_name': 'አበበ በቀለ', 'gender': 'M', 'date_of_birth': '1990-01-01', 'region': 'ADD',
+            'zone': 'Bole', 'woreda': '3', 'city': 'Addis Ababa', 'education_level': 'DEGREE',
+        })
+        self.assertRedirects(response, reverse('profile'), fetch_redirect_response=False)
+        member = Member.objects.get(pk=self.member.pk)
+        self.assertEqual((member.full_name, member.membership_level, member.is_active), ('አበበ በቀለ', 'LEADERSHIP', False))
+        self.assertContains(self.client.get(reverse('profile')), 'አበበ በቀለ')
+
+
+class MembershipIdTests(TestCase):
+
+    def create(self, number, **fields):
+        return Member.objects.create(
+            user=User.objects.create_user(f'09110006{number:02d}', password='pw'),
+            full_name=f'ቁጥር {number}', gender='M', date_of_birth=date(1990, 1, 1),
+            phone_number=f'09110006{number:02d}', region='TIG', city='Mekelle', **fields,
+        )
+
+    def test_numbers_are_sequential_per_region_and_year(self):
+        first, second = self.create(0), self.create(1)
+        year = str(timezone.localtime().year)[-2:]
+        self.assertEqual([first.membership_id, second.membership_id], [f'EUDP-TIG-{year}-0001', f'EUDP-TIG-{year}-0002'])
+        older = self.create(2, date_joined=timezone.now() - timedelta(days=800))
+        self.assertTrue(older.membership_id.endswith('-0001'))
+        self.assertEqual(MembershipCounter.objects.get(region='TIG', year=timezone.localtime().year).last_number, 2)
+
+    def test_bulk_insert_reserves_one_block_per_region(self):
+        self.create(0)
+        users = [User(username=f'09110006{number:02d}', password='!') for number in range(10, 14)]
+        members = insert_members(users, [
+            Member(
+                full_name=f'ቁጥር {number}', gender='F', date_of_birth=date(1990, 1, 1),
+                phone_number=f'09110006{number:02d}', region=region, city='Mekelle',
+            )
+            for number, region in zip(range(10, 14), ['TIG', 'AFS', 'TIG', 'TIG'])
+        ])
+        numbers = {member.membership_id: member.region for member in members}
+        year = str(timezone.localtime().year)[-2:]
+        self.assertEqual(numbers, {
+            f'EUDP-TIG-{year}-0002': 'TIG', f'EUDP-TIG-{year}-0003': 'TIG', f'EUDP-TIG-{year}-0004': 'TIG',
+            f'EUDP-AFS-{year}-0001': 'AFS',
+        })
+        # ቀጣዩ ነጠላ ምዝገባ ከ block ው በኋላ ይቀጥላል
+        self.assertEqual(list(MembershipCounter.allocate('TIG', timezone.localtime().year)), [5])
+
+    def test_migration_backfills_counters_from_existing_ids(self):
+        backfill = import_module('members.migrations.0007_membership_counters').backfill_counters
+        self.create(0)
+        self.create(1, membership_id='EUDP-TIG-19-0042')
+        self.create(2, membership_id='EUDP-TIG-19-0007')
+        self.create(3, membership_id='legacy-123')
+        MembershipCounter.objects.all().delete()
+        backfill(django_apps, None)
+        self.assertEqual(
+            set(MembershipCounter.objects.values_list('region', 'year', 'last_number')),
+            {('TIG', 2019, 42), ('TIG', timezone.localtime().year, 1)},
+        )
+
+    def test_failed_side_write_rolls_back_the_registration(self):
+        self.create(0)
+        counter = MembershipCounter.objects.get(region='TIG')
+        with mock.patch('members.stats.member_saved', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.create(1)
+        self.assertFalse(Member.objects.filter(phone_number='0911000601').exists())
+        self.assertEqual(MembershipCounter.objects.get(pk=counter.pk).last_number, counter.last_number)
+        self.assertEqual(MemberStat.objects.get(region='TIG').count, 1)
+
+
+@override_settings(ID_CARD_WORKERS=1)
+class IdCardPrintTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        cls.members = [
+            Member.objects.create(
+                user=User.objects.create_user(f'09110005{number:02d}', password='pw'),
+                full_name=f'ካርድ {number}', gender='F', date_of_birth=date(1990, 1, 1),
+                phone_number=f'09110005{number:02d}', region='ADD', city='Addis Ababa',
+            )
+            for number in range(3)
+        ]
+
+    def test_web_selection_is_capped(self):
+        self.client.force_login(self.staff)
+        with mock.patch.object(cards, 'WEB_PRINT_LIMIT', 2):
+            response = self.client.get(reverse('print_id_cards'), {'region': 'ADD'})
+        self.assertRedirects(response, reverse('member_list'), fetch_redirect_response=False)
+
+    def test_command_rejects_malformed_ids(self):
+        with self.assertRaises(CommandError):
+            call_command('print_id_cards', ids='1,abc', output=os.devnull)
+        with self.assertRaises(CommandError):
+            call_command('print_id_cards', output=os.devnull)
+
+    def _jpeg(self, size=(60, 40)):
+        buffer = BytesIO()
+        Image.new('RGB', size, 'white').save(buffer, format='JPEG')
+        return buffer.getvalue()
+
+    def test_pdf_stream_writes_a_page_per_sheet_with_a_valid_xref(self):
+        pdf = b''.join(cards.pdf_stream(iter([self._jpeg(), self._jpeg((30, 20))])))
+        self.assertTrue(pdf.startswith(b'%PDF-1.4'))
+        self.assertTrue(pdf.endswith(b'%%EOF\n'))
+        self.assertIn(b'/Type /Pages /Kids [5 0 R 8 0 R] /Count 2', pdf)
+        # xref ው የሚጠቁማቸው offsets የ objects መጀመሪያ ናቸው
+        xref = int(pdf.rsplit(b'startxref\n', 1)[1].split(b'\n')[0])
+        entries = pdf[xref:].split(b'\n')[3:11]
+        for object_id, entry in enumerate(entries, start=1):
+            offset = int(entry.split()[0])
+            self.assertTrue(pdf[offset:].startswith(b'%d 0 obj' % object_id))
+
+    def test_print_view_streams_a_pdf(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('print_id_cards'), {'region': 'ADD'})
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        pdf = b''.join(response.streaming_content)
+        self.assertIn(b'/Count 1', pdf)
+        # ምርጫ ያስፈልጋል
+        response = self.client.get(reverse('print_id_cards'))
+        self.assertRedirects(response, reverse('member_list'), fetch_redirect_response=False)
+
+    def test_command_writes_pdf_and_png_sheets(self):
+        output = self.enterContext(tempfile.TemporaryDirectory())
+        stdout = StringIO()
+        call_command('print_id_cards', region='ADD', output=os.path.join(output, 'cards.pdf'), workers=1, stdout=stdout)
+        self.assertIn('Wrote 1 sheets', stdout.getvalue())
+        with open(os.path.join(output, 'cards.pdf'), 'rb') as fp:
+            self.assertTrue(fp.read().startswith(b'%PDF'))
+        call_command('print_id_cards', ids=str(self.members[0].pk), format='png', output=os.path.join(output, 'png'), workers=1, stdout=stdout)
+        self.assertEqual(os.listdir(os.path.join(output, 'png')), ['sheet_00001.png'])
+        with self.assertRaises(CommandError):
+            call_command('print_id_cards', '--region=XXX', f'--output={os.devnull}')
+
+    def test_cards_use_the_print_variant_once_ready(self):
+        Member.objects.filter(pk=self.members[0].pk).update(photo='member_photos/a.jpg', photo_variants_ready=True)
+        Member.objects.filter(pk=self.members[1].pk).update(photo='member_photos/b.png')
+        [rows] = cards.iter_sheets(cards.select_members(Member.objects.all(), region='ADD'))
+        photos = {row['full_name']: row['photo'] for row in rows}
+        self.assertEqual(photos['ካርድ 0'], images.variant_name('member_photos/a.jpg', 'card', 'jpg'))
+        self.assertEqual(photos['ካርድ 1'], 'member_photos/b.png')
+
+
+@override_settings(PHOTO_PROCESSING_SYNC=True)
+class PhotoVariantTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = Member.objects.create(
+            user=User.objects.create_user('0911001300', password='pw'),
+            full_name='ፎቶ', gender='F', date_of_birth=date(1990, 1, 1),
+            phone_number='0911001300', region='ADD', city='Addis Ababa',
+        )
+
+    def setUp(self):
+        self.enterContext(override_settings(MEDIA_ROOT=self.enterContext(tempfile.TemporaryDirectory())))
+
+    def upload(self, name, size=(800, 600), image_format='JPEG'):
+        buffer = BytesIO()
+        Image.new('RGB', size, 'blue').save(buffer, format=image_format)
+        name = default_storage.save(name, ContentFile(buffer.getvalue()))
+        Member.objects.filter(pk=self.member.pk).update(photo=name, photo_variants_ready=False)
+        return name
+
+    def test_variants_are_generated_without_metadata(self):
+        buffer = BytesIO()
+        exif = Image.Exif()
+        exif[0x0112] = 6  # orientation፡ 90° ዞሯል
+        Image.new('RGB', (2400, 1200), 'blue').save(buffer, format='JPEG', exif=exif)
+        original = default_storage.save('member_photos/b.jpg', ContentFile(buffer.getvalue()))
+        Member.objects.filter(pk=self.member.pk).update(photo=original)
+
+        self.assertTrue(images.process_member_photo(self.member.pk))
+        member = Member.objects.get(pk=self.member.pk)
+        self.assertTrue(member.photo_variants_ready)
+        with default_storage.open(member.photo.name) as fp, Image.open(fp) as cleaned:
+            # አቅጣጫው ተስተካክሎ ቢበዛ ORIGINAL_MAX_SIZE ሆኗል፣ EXIF የለም
+            self.assertEqual(cleaned.size, (800, images.ORIGINAL_MAX_SIZE))
+            self.assertFalse(cleaned.getexif())
+        for variant, size in images.VARIANTS.items():
+            for extension in images.FORMATS:
+                with default_storage.open(images.variant_name(member.photo.name, variant, extension)) as fp, Image.open(fp) as image:
+                    self.assertEqual(image.size, (size, size))
+                    self.assertEqual(image.format, images.FORMATS[extension][0])
+
+        html = member_photo(member, 'thumb')
+        self.assertIn('type="image/webp"', html)
+        self.assertIn(images.variant_url(member.photo.name, 'thumb', 'jpg'), html)
+
+    def test_upload_is_processed_after_commit_and_png_becomes_jpeg(self):
+        buffer = BytesIO()
+        Image.new('RGBA', (300, 300), (0, 0, 255, 128)).save(buffer, format='PNG')
+        member = Member.objects.get(pk=self.member.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            member.photo.save('c.png', ContentFile(buffer.getvalue()))
+        member.refresh_from_db()
+        self.assertTrue(member.photo_variants_ready)
+        self.assertTrue(member.photo.name.endswith('.jpg'))
+        self.assertFalse(default_storage.exists(member.photo.name[:-4] + '.png'))
+
+    def test_failed_write_keeps_the_original_jpeg(self):
+        name = self.upload('member_photos/a.jpg')
+        with mock.patch.object(default_storage, 'save', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                images.process_member_photo(self.member.pk)
+        self.assertTrue(default_storage.exists(name))
+        self.assertEqual(Member.objects.get(pk=self.member.pk).photo.name, name)
+
+        self.assertTrue(images.process_member_photo(self.member.pk))
+        cleaned = Member.objects.get(pk=self.member.pk).photo.name
+        self.assertNotEqual(cleaned, name)
+        self.assertTrue(default_storage.exists(cleaned))
+        self.assertFalse(default_storage.exists(name))
+
+
+class MemberAdminTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', password='pw')
+        for number, region in enumerate(['ADD', 'ADD', 'AMH'], start=1):
+            Member.objects.create(
+                user=User.objects.create_user(f'09120000{number:02d}', password='pw'),
+                full_name=f'አበበ {number}', gender='M', date_of_birth=date(1990, 1, 1),
+                phone_number=f'09120000{number:02d}', region=region, city='Adama',
+            )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_changelist_counts_once_and_loads_list_columns(self):
+        with self.assertNumQueries(4) as context:
+            response = self.client.get(reverse('admin:members_member_changelist'), {'region': 'ADD'})
+        self.assertEqual(response.status_code, 200)
+        member_queries = [query['sql'] for query in context.captured_queries if 'members_member' in query['sql']]
+        # COUNT (SQLite ላይ ግምት ስለሌለ) + የገጹ ረድፎች፤ facets ወይም ሙሉ COUNT የለም
+        self.assertEqual(sum('COUNT(' in sql for sql in member_queries), 1)
+        self.assertNotIn('date_of_birth', member_queries[-1])
+        # የማጣሪያ ብዛቶች ከ MemberStat
+        self.assertContains(response, 'አዲስ አበባ (2)')
+        self.assertEqual(response.context['cl'].result_count, 2)
+
+    def test_change_view_loads_full_row(self):
+        member = Member.objects.first()
+        response = self.client.get(reverse('admin:members_member_change', args=[member.pk]))
+        self.assertContains(response, '1990-01-01')
+
+
+class FlakySender(messaging.BaseSender):
+    # የመጀመሪያው ሙከራ ለሁሉም ይወድቃል
+    calls = 0
+
+    def send(self, recipient, subject, body):
+        FlakySender.calls += 1
+        if FlakySender.calls == 1:
+            raise ConnectionError('gateway timeout')
+
+
+@override_settings(MESSAGE_RATE_PER_SECOND=0, MESSAGE_RETRY_DELAY=60, MESSAGE_MAX_ATTEMPTS=2)
+class BroadcastTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for number, (region, level) in enumerate([('ADD', 'REGULAR'), ('ADD', 'LEADERSHIP'), ('AMH', 'REGULAR')], start=1):
+            Member.objects.create(
+                user=User.objects.create_user(f'09130000{number:02d}', password='pw'),
+                full_name=f'አበበ {number}', gender='M', date_of_birth=date(1990, 1, 1),
+                phone_number=f'09130000{number:02d}', region=region, city='Adama', membership_level=level,
+            )
+        cls.announcement = Announcement.objects.create(title='ጠቅላላ ጉባኤ', content='እሁድ 3 ሰዓት')
+
+    def setUp(self):
+        self.outbox = self.enterContext(tempfile.TemporaryDirectory()) + '/outbox.jsonl'
+        self.enterContext(override_settings(
+            MESSAGE_OUTBOX_PATH=self.outbox,
+            MESSAGE_SENDERS={'sms': 'members.messaging.FileSender', 'email': 'members.messaging.FileSender'},
+        ))
+
+    def test_targeted_broadcast_is_queued_in_chunks_and_sent(self):
+        broadcast = Broadcast.objects.create(announcement=self.announcement, region='ADD')
+        self.assertEqual(messaging.enqueue(broadcast, chunk_size=1), 2)
+        totals = messaging.work(batch_size=1, once=True)
+        self.assertEqual(totals['sent'], 2)
+
+        with open(self.outbox, encoding='utf-8') as fp:
+            lines = fp.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('ጠቅላላ ጉባኤ', lines[0])
+        self.assertEqual(OutboundMessage.objects.filter(status=OutboundMessage.SENT).count(), 2)
+        broadcast.refresh_from_db()
+        self.assertEqual((broadcast.status, broadcast.recipient_count), (Broadcast.QUEUED, 2))
+
+    def test_broadcast_is_enqueued_by_one_worker_only(self):
+        broadcast = Broadcast.objects.create(announcement=self.announcement, region='ADD')
+        self.assertTrue(messaging.claim_broadcast(broadcast))
+        # ሌላ worker lease ያለውን Broadcast አይሞላውም
+        other = Broadcast.objects.get(pk=broadcast.pk)
+        self.assertEqual(messaging.enqueue(other), 0)
+        self.assertEqual(messaging.enqueue_pending(), 0)
+        self.assertFalse(OutboundMessage.objects.exists())
+
+        # lease ካለቀ በኋላ ይቀጥላል፣ ተቀባዮቹ አንድ ጊዜ ብቻ ይቆጠራሉ
+        Broadcast.objects.filter(pk=broadcast.pk).update(claimed_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(messaging.enqueue_pending(), 2)
+        self.assertEqual(messaging.enqueue_pending(), 0)
+        broadcast.refresh_from_db()
+        self.assertEqual((broadcast.status, broadcast.recipient_count, broadcast.claimed_until), (Broadcast.QUEUED, 2, None))
+        self.assertEqual(OutboundMessage.objects.count(), 2)
+
+    def test_failures_are_retried_with_backoff_then_given_up(self):
+        FlakySender.calls = 0
+        Broadcast.objects.create(announcement=self.announcement, region='AMH')
+        with self.settings(MESSAGE_SENDERS={'sms': 'members.tests.FlakySender'}):
+            self.assertEqual(messaging.work(once=True)['sent'], 0)
+            message = OutboundMessage.objects.get()
+            self.assertEqual((message.status, message.attempts), (OutboundMessage.PENDING, 1))
+            self.assertGreater(message.next_attempt_at, timezone.now())
+
+            OutboundMessage.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(messaging.work(once=True)['sent'], 1)
+
+        Broadcast.objects.create(announcement=self.announcement, membership_level='LEADERSHIP')
+        with self.settings(MESSAGE_SENDERS={'sms': 'members.messaging.BaseSender'}):
+            messaging.work(once=True)
+            OutboundMessage.objects.filter(status=OutboundMessage.PENDING).update(next_attempt_at=timezone.now())
+            with self.assertLogs('members.messaging', 'WARNING'):
+                self.assertEqual(messaging.work(once=True)['failed'], 1)
+        self.assertEqual(OutboundMessage.objects.filter(status=OutboundMessage.FAILED).count(), 1)
+
+    def test_expired_lease_is_reclaimed(self):
+        broadcast = Broadcast.objects.create(announcement=self.announcement, region='AMH')
+        messaging.enqueue(broadcast)
+        self.assertEqual(len(messaging.claim(10)), 1)
+        # ሌላ worker የያዘው ገና ሊወሰድ አይችልም፤ lease ካለቀ በኋላ ግን ይቻላል
+        self.assertEqual(messaging.claim(10), [])
+        OutboundMessage.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(len(messaging.claim(10)), 1)
+
+
+class DuplicateDetectionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.number = 0
+        cls.original = cls.create_member('አበበ ከበደ ሐይሉ', date(1990, 3, 5))
+        cls.create_member('ጫላ ቶላ', date(1990, 3, 5))
+        cls.create_member('አበበ ከበደ', date(1975, 8, 1), region='AMH')
+
+    @classmethod
+    def create_member(cls, full_name, date_of_birth, region='ADD', **fields):
+        cls.number += 1
+        phone = f'0914000{cls.number:03d}'
+        fields = {'zone': 'Bole', 'woreda': '03', 'city': 'Addis Ababa', **fields}
+        return Member.objects.create(
+            user=User.objects.create_user(phone, password='pw'), full_name=full_name, gender='M',
+            date_of_birth=date_of_birth, phone_number=phone, region=region, **fields,
+        )
+
+    def pairs(self):
+        return set(DuplicateCandidate.objects.values_list('member_a', 'member_b'))
+
+    def test_latin_spelling_of_geez_name_is_found_incrementally(self):
+        self.assertEqual(dedup.find_new(), (3, 0))
+        duplicate = self.create_member('Abebe Kebbede Hailu', date(1990, 3, 5), zone='bole ')
+        # ሁለተኛው ሩጫ አዲሱን አባል ብቻ ያስኬዳል
+        self.assertEqual(dedup.find_new(), (1, 1))
+        self.assertEqual(self.pairs(), {(self.original.pk, duplicate.pk)})
+        self.assertEqual(dedup.find_new(), (0, 0))
+
+    def test_key_fields_change_rechecks_member(self):
+        other = self.create_member('Tesfaye Alemu', date(1990, 3, 5))
+        dedup.find_new()
+        self.assertEqual(self.pairs(), set())
+        other.full_name = 'Abebe Kebede'
+        other.save()
+        self.assertEqual(dedup.find_new(), (1, 1))
+        self.assertEqual(self.pairs(), {(self.original.pk, other.pk)})
+
+    def test_merge_moves_attendance_and_deactivates_duplicate(self):
+        meetings = [Meeting.objects.create(title=f'ስብሰባ {number}', date=timezone.now(), location='አዳማ') for number in range(2)]
+        duplicate = self.create_member('Abebe Kebede', date(1990, 3, 5), email='abebe@example.com')
+        Attendance.objects.create(member=self.original, meeting=meetings[0], is_present=False)
+        Attendance.objects.create(member=duplicate, meeting=meetings[0], is_present=True)
+        Attendance.objects.create(member=duplicate, meeting=meetings[1], is_present=True)
+        dedup.find_new()
+
+        dedup.merge_members(self.original, duplicate)
+        self.assertEqual(
+            sorted(Attendance.objects.values_list('member_id', 'meeting_id', 'is_present')),
+            [(self.original.pk, meetings[0].pk, True), (self.original.pk, meetings[1].pk, True)],
+        )
+        self.assertEqual(self.original.engagement.attended, 2)
+        incremental = list(MemberEngagement.objects.filter(recorded__gt=0).values_list('member_id', 'recorded', 'attended'))
+        engagement.rebuild()
+        self.assertEqual(incremental, list(MemberEngagement.objects.filter(recorded__gt=0).values_list('member_id', 'recorded', 'attended')))
+
+        duplicate.refresh_from_db()
+        self.original.refresh_from_db()
+        self.assertFalse(duplicate.is_active)
+        self.assertEqual(self.original.email, 'abebe@example.com')
+        self.assertEqual(DuplicateCandidate.objects.get().status, DuplicateCandidate.MERGED)
+
+
+@shared_cache()
+class AdministrativeUnitTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        cls.number = 0
+        cls.first = cls.create_member('ቦሌ', 'ወረዳ 03', 'ቀበሌ 01')
+        cls.second = cls.create_member('Bole Sub City', 'Woreda 3', '1')
+        cls.create_member('Yeka', '05', None)
+
+    @classmethod
+    def create_member(cls, zone, woreda, kebele, region='ADD'):
+        cls.number += 1
+        phone = f'0915000{cls.number:03d}'
+        return Member.objects.create(
+            user=User.objects.create_user(phone, password='pw'), full_name=f'አባል {cls.number}', gender='F',
+            date_of_birth=date(1990, 1, 1), phone_number=phone, region=region, zone=zone, woreda=woreda,
+            kebele=kebele, city='Addis Ababa',
+        )
+
+    def counts(self):
+        # ዞን/ወረዳ በ "የበላይ/ቁልፍ"፤ ለምሳሌ የቦሌ ወረዳ 3 = 'bl/3'
+        rows = AdministrativeUnit.objects.filter(level__lte=2).values_list('parent__match_key', 'match_key', 'member_count')
+        return {f"{parent}/{key}" if parent != 'ADD' and parent else key: count for parent, key, count in rows}
+
+    def assertMatchesRebuild(self):
+        incremental = sorted(AdministrativeUnit.objects.values_list('pk', 'member_count'))
+        units.rebuild()
+        self.assertEqual(incremental, sorted(AdministrativeUnit.objects.values_list('pk', 'member_count')))
+
+    def test_spellings_in_either_script_share_a_unit(self):
+        self.assertEqual(
+            (self.first.zone_unit_id, self.first.woreda_unit_id, self.first.kebele_unit_id),
+            (self.second.zone_unit_id, self.second.woreda_unit_id, self.second.kebele_unit_id),
+        )
+        kebele = AdministrativeUnit.objects.get(pk=self.first.kebele_unit_id)
+        self.assertEqual((kebele.level, kebele.parent_id, kebele.member_count), (AdministrativeUnit.KEBELE, self.first.woreda_unit_id, 2))
+        self.assertEqual(self.counts(), {'ADD': 3, 'bl': 2, 'bl/3': 2, 'yk': 1, 'yk/5': 1})
+
+    def test_counts_follow_moves_deactivation_deletion_and_imports(self):
+        self.second.zone = 'የካ'
+        self.second.save(update_fields=['zone'])
+        self.second.refresh_from_db()
+        self.assertEqual(self.counts(), {'ADD': 3, 'bl': 1, 'bl/3': 1, 'yk': 2, 'yk/3': 1, 'yk/5': 1})
+        self.first.is_active = False
+        self.first.save()
+        self.first.user.delete()
+        self.number += 1
+        phone = f'0915000{self.number:03d}'
+        insert_members(
+            [User(username=phone)],
+            [Member(full_name='Import', gender='M', date_of_birth=date(1990, 1, 1), phone_number=phone,
+                    region='AMH', zone='ደቡብ ወሎ', woreda='ደሴ', city='ደሴ')],
+        )
+        self.assertEqual(AdministrativeUnit.objects.get(match_key='db wl').member_count, 1)
+        self.assertMatchesRebuild()
+
+    def test_drill_down_reads_one_level_per_request(self):
+        self.client.force_login(self.staff)
+        zone = AdministrativeUnit.objects.get(pk=self.first.zone_unit_id)
+        response = self.client.get(reverse('area_breakdown'))
+        self.assertEqual([(child.name, child.member_count) for child in response.context['children']], [('አዲስ አበባ', 3)])
+        # user + ክፍሉ (ከበላዮቹ ጋር) + ንዑስ ክፍሎቹ፤ የ staff ወሰን ከ cache
+        with count_queries() as stats:
+            response = self.client.get(reverse('area_breakdown'), {'unit': zone.pk})
+        self.assertEqual(stats.count, 3)
+        self.assertEqual([(child.name, child.member_count) for child in response.context['children']], [('ወረዳ 03', 2)])
+        self.assertEqual([unit.name for unit in response.context['trail']], ['አዲስ አበባ', 'ቦሌ'])
+
+        response = self.client.get(reverse('member_list'), {'kebele_unit': self.first.kebele_unit_id})
+        self.assertEqual({member.pk for member in response.context['members']}, {self.first.pk, self.second.pk})
+
+        coordinators = Group.objects.create(name=scoping.COORDINATOR_GROUP)
+        coordinator = User.objects.create_user('coordinator', password='pw', is_staff=True)
+        coordinator.groups.add(coordinators)
+        Member.objects.create(
+            user=coordinator, full_name='አስተባባሪ', gender='M', date_of_birth=date(1980, 1, 1), phone_number='0915999999',
+            region='AMH', zone='ደሴ', woreda='1', city='ደሴ', is_coordinator=True, coordinator_region='AMH',
+        )
+        self.client.force_login(coordinator)
+        self.assertEqual(self.client.get(reverse('area_breakdown'), {'unit': zone.pk}).status_code, 404)
+
+
+# router ው የሚያየው settings.DATABASES ን ብቻ ነው፤ replica ግንኙነት አይከፈትም
+REPLICA_DATABASES = {**settings.DATABASES, 'replica': {**settings.DATABASES['default']}}
+
+
+@override_settings(DATABASES=REPLICA_DATABASES)
+class ReplicaRoutingTests(TestCase):
+
+    def test_only_reporting_reads_go_to_the_replica(self):
+        self.assertEqual(router.db_for_read(Member), 'default')
+        with routing.replica():
+            self.assertEqual(router.db_for_read(Member), 'replica')
+            self.assertEqual(router.db_for_write(Member), 'default')
+            self.assertEqual(router.db_for_read(Session), 'default')
+            self.assertEqual(router.db_for_read(User), 'default')
+            with routing.pinned():
+                self.assertEqual(router.db_for_read(Member), 'default')
+        with self.settings(DATABASES={'default': settings.DATABASES['default']}), routing.replica():
+            self.assertEqual(router.db_for_read(Member), 'default')
+
+    def test_streamed_exports_keep_the_views_routing(self):
+        def chunks():
+            yield str(routing.reading_from_replica()).encode()
+
+        with routing.replica():
+            response = views._streaming_response(RequestFactory().get('/'), chunks(), 'text/plain')
+        self.assertEqual(b''.join(response.streaming_content), b'True')
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        user = User.objects.create_user('0916000001', password='pw')
+        Member.objects.create(
+            user=user, full_name='አበበ', gender='M', date_of_birth=date(1990, 1, 1), phone_number='0916000001',
+            region='ADD', zone='Bole', woreda='3', city='Addis Ababa',
+        )
+        self.client.force_login(user)
+        self.assertNotIn(routing.PIN_COOKIE, self.client.get(reverse('profile')).cookies)
+        response = self.client.post(reverse('profile_update'), {})
+        self.assertEqual(response.cookies[routing.PIN_COOKIE]['max-age'], settings.REPLICA_PIN_SECONDS)
+
+        middleware = ReplicaPinningMiddleware(lambda request: routing.reading_from_replica())
+        request = RequestFactory().get('/', HTTP_COOKIE=f"{routing.PIN_COOKIE}={response.cookies[routing.PIN_COOKIE].value}")
+        with routing.replica():
+            self.assertFalse(middleware(request))
+            self.assertTrue(middleware(RequestFactory().get('/')))
+
+
+class ChangeLogTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('0917000001', password='pw')
+        cls.member = Member.objects.create(
+            user=cls.user, full_name='አበበ ከበደ', gender='M', date_of_birth=date(1990, 1, 1),
+            phone_number='0917000001', region='ADD', zone='Bole', woreda='3', city='Addis Ababa',
+        )
+        cls.meeting = Meeting.objects.create(title='ጠቅላላ ጉባኤ', date=timezone.now(), location='አዲስ አበባ')
+
+    def setUp(self):
+        self.member.refresh_from_db()
+
+    def test_only_changed_fields_are_recorded_in_one_insert(self):
+        with changelog.collecting() as entries:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.member.city = 'Adama'
+                self.member.save()
+                self.member.save()
+                Attendance.objects.create(member=self.member, meeting=self.meeting, is_present=False)
+            self.assertFalse(ChangeLogEntry.objects.exists())
+            with self.assertNumQueries(1):
+                changelog.flush(entries, self.user)
+        checkin.write_attendance([(self.member.pk, self.meeting.pk)])
+
+        member_changes, attendance_created, checked_in = ChangeLogEntry.objects.order_by('pk')
+        self.assertEqual(member_changes.changes, {'city': ['Addis Ababa', 'Adama']})
+        self.assertEqual((member_changes.member_id, member_changes.actor), (self.member.pk, '0917000001'))
+        self.assertEqual(attendance_created.action, ChangeLogEntry.CREATED)
+        # check-in በቀጥታ ይጻፋል (bulk write)
+        self.assertEqual(checked_in.changes['is_present'], [False, True])
+
+    def test_middleware_stamps_the_user_and_skips_rolled_back_changes(self):
+        def view(request):
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    self.member.email = 'abebe@example.com'
+                    self.member.save(update_fields=['email'])
+                try:
+                    with transaction.atomic():
+                        self.member.city = 'Adama'
+                        self.member.save(update_fields=['city'])
+                        raise ValueError
+                except ValueError:
+                    pass
+            return HttpResponse()
+
+        request = RequestFactory().post('/')
+        request.user = self.user
+        ChangeLogMiddleware(view)(request)
+        entry = ChangeLogEntry.objects.get()
+        self.assertEqual(entry.changes, {'email': [None, 'abebe@example.com']})
+        self.assertEqual(entry.actor_id, self.user.pk)
+
+    def test_prune_deletes_only_expired_entries(self):
+        old = timezone.now() - timedelta(days=40)
+        ChangeLogEntry.objects.bulk_create(
+            [ChangeLogEntry(model='member', action=ChangeLogEntry.DELETED, created_at=old) for _ in range(3)]
+            + [ChangeLogEntry(model='member', action=ChangeLogEntry.CREATED)]
+        )
+        call_command('prune_change_log', '--older-than', '30', '--chunk-size', '2', stdout=StringIO())
+        self.assertEqual(list(ChangeLogEntry.objects.values_list('action', flat=True)), [ChangeLogEntry.CREATED])
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncApiTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        cls.members = [
+            Member.objects.create(
+                user=User.objects.create_user(f'09180000{number:02d}', password='pw'),
+                full_name=f'አባል {number}', gender='F', date_of_birth=date(1990, 1, 1),
+                phone_number=f'09180000{number:02d}', region=region, zone='Bole', woreda='3', city='Addis Ababa',
+            )
+            for number, region in enumerate(['ADD', 'ADD', 'AMH'])
+        ]
+        cls.meeting = Meeting.objects.create(title='ጠቅላላ ጉባኤ', date=timezone.now(), location='አዲስ አበባ')
+        Announcement.objects.create(title='ስብሰባ', content='...')
+        # ሁሉም ከ mark በፊት ተቀይረዋል
+        Member.objects.update(updated_at=timezone.now() - timedelta(minutes=5))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.staff)
+
+    def pull(self, **params):
+        response = self.client.get(reverse('sync_pull'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def push(self, batch, key='batch-1'):
+        return self.client.post(
+            reverse('sync_push'), gzip.compress(json.dumps(batch).encode()), content_type='application/json',
+            headers={'Content-Encoding': 'gzip', 'Idempotency-Key': key},
+        )
+
+    def test_pull_pages_through_changes_since_the_mark(self):
+        first = self.pull(limit=2)
+        self.assertTrue(first['more'])
+        self.assertEqual([row['id'] for row in first['members']], [member.pk for member in self.members[:2]])
+        self.assertEqual(len(first['meetings']), 1)
+        second = self.pull(limit=2, mark=first['mark'])
+        self.assertEqual([row['id'] for row in second['members']], [self.members[2].pk])
+        self.assertFalse(second['more'] or second['meetings'] or second['announcements'])
+
+        self.members[0].city = 'Adama'
+        self.members[0].save()
+        changed = self.pull(mark=second['mark'])
+        self.assertEqual([row['city'] for row in changed['members']], ['Adama'])
+        self.assertEqual(self.client.get(reverse('sync_pull'), {'mark': 'nope'}).status_code, 400)
+
+    def test_push_registers_and_checks_in_once_per_key(self):
+        batch = {
+            'registrations': [
+                {'key': 'r1', 'full_name': 'ቶላ ገመቹ', 'gender': 'M', 'date_of_birth': '1992-03-04',
+                 'phone_number': '0918001000', 'region': 'ORO', 'zone': 'Adama', 'woreda': '1', 'city': 'Adama',
+                 'education_level': 'PRIMARY'},
+                {'key': 'r2', 'full_name': 'ተደጋጋሚ', 'phone_number': self.members[0].phone_number},
+            ],
+            'attendance': [
+                {'meeting': self.meeting.pk, 'registration': 'r1'},
+                {'meeting': self.meeting.pk, 'member': self.members[1].membership_id},
+                {'meeting': 999, 'member': self.members[1].membership_id},
+            ],
+        }
+        result = self.push(batch).json()
+        membership_id = result['registered']['r1']
+        self.assertEqual(list(result['errors']), ['r2'])
+        self.assertEqual(result['attendance']['recorded'], 2)
+        self.assertEqual(result['attendance']['rejected'], [{'index': 2, 'error': 'ስብሰባው አልተገኘም።'}])
+        self.assertTrue(Attendance.objects.filter(member__membership_id=membership_id, meeting=self.meeting).exists())
+
+        # ምላሹ ጠፍቶ እንደገና ሲላክ ምንም አይጻፍም
+        replay = self.push(batch).json()
+        self.assertTrue(replay['replayed'])
+        self.assertEqual(replay['registered'], {'r1': membership_id})
+        self.assertEqual(Member.objects.filter(phone_number='0918001000').count(), 1)
+        self.assertEqual(SyncReceipt.objects.count(), 1)
+        self.assertEqual(self.push(batch, key='').status_code, 400)
+        # ብዙ ምዝገባዎች በአንድ request ውስጥ hash አይደረጉም
+        too_many = {'registrations': [{'key': str(index)} for index in range(sync.MAX_PUSH_REGISTRATIONS + 1)]}
+        self.assertEqual(self.push(too_many, key='batch-2').status_code, 400)
+
+    def test_push_respects_the_coordinators_region(self):
+        group = Group.objects.create(name=scoping.COORDINATOR_GROUP)
+        self.staff.groups.add(group)
+        Member.objects.filter(pk=self.members[2].pk).update(is_coordinator=True, coordinator_region='AMH')
+        Member.objects.filter(pk=self.members[2].pk).update(user=self.staff)
+        cache.clear()
+        self.assertEqual([row['id'] for row in self.pull()['members']], [self.members[2].pk])
+        result = self.push({'registrations': [{'key': 'r1', 'region': 'ADD'}]}).json()
+        self.assertIn('region', result['errors']['r1'])
+
+    def test_device_gets_csrf_token_from_pull(self):
+        device = Client(enforce_csrf_checks=True)
+        device.force_login(self.staff)
+        self.assertEqual(device.post(reverse('sync_push'), b'{}', content_type='application/json').status_code, 403)
+        device.get(reverse('sync_pull'))
+        response = device.post(
+            reverse('sync_push'), b'{}', content_type='application/json',
+            headers={'Idempotency-Key': 'batch-1', 'X-CSRFToken': device.cookies['csrftoken'].value},
+        )
+        self.assertEqual(response.status_code, 200)
+
+
+@shared_cache()
+class AnalyticsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('staff', password='pw', is_staff=True)
+        people = [
+            ('ADD', 'F', date(1996, 6, 15), 'SECONDARY'),
+            ('ADD', 'M', date(1996, 6, 16), 'SECONDARY'),
+            ('ADD', 'F', date(1960, 1, 1), 'PRIMARY'),
+            ('AMH', 'M', date(2010, 1, 1), 'NONE'),
+        ]
+        cls.members = [
+            Member.objects.create(
+                user=User.objects.create_user(f'09190000{number:02d}', password='pw'), full_name=f'አባል {number}',
+                gender=gender, date_of_birth=born, phone_number=f'09190000{number:02d}', region=region,
+                zone='Bole', woreda='3', city='Addis Ababa', education_level=education,
+            )
+            for number, (region, gender, born, education) in enumerate(people)
+        ]
+        Member.objects.filter(pk=cls.members[3].pk).update(is_active=False)
+        snapshot_dir = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.enterClassContext(override_settings(ANALYTICS_SNAPSHOT_PATH=os.path.join(snapshot_dir, 'members.npz')))
+        analytics.build_snapshot()
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.staff)
+
+    def test_crosstab_is_computed_from_the_snapshot_only(self):
+        Member.objects.create(
+            user=User.objects.create_user('0919000099', password='pw'), full_name='አዲስ', gender='M',
+            date_of_birth=date(1990, 1, 1), phone_number='0919000099', region='ADD', city='Adama',
+        )
+        # ወሰኑ (scope) ከ cache እንዲመጣ
+        self.client.get(reverse('analytics_data'))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('analytics_data'), {'rows': 'region', 'columns': 'education_level'})
+        self.assertFalse([query['sql'] for query in queries if 'members_member"' in query['sql']])
+        table = response.json()['crosstab']
+        # ንቁ ያልሆነው እና ከ snapshot በኋላ የተመዘገበው አይቆጠሩም
+        self.assertEqual(table['total'], 3)
+        region = table['rows']['labels'].index('አዲስ አበባ')
+        secondary = table['columns']['labels'].index('ሁለተኛ ደረጃ')
+        self.assertEqual(table['counts'][region][secondary], 2)
+
+        response = self.client.get(reverse('analytics_data'), {'rows': 'age_band', 'gender': 'F'})
+        self.assertEqual(response.json()['crosstab']['row_totals'], [0, 0, 1, 0, 0, 0, 1])
+        self.assertEqual(self.client.get(reverse('analytics_data'), {'rows': 'salary'}).status_code, 400)
+        self.assertContains(self.client.get(reverse('analytics_report')), 'ሁለተኛ ደረጃ')
+
+    def test_ages_count_birthdays_exactly(self):
+        snapshot = analytics.load_snapshot()
+        selected = snapshot.mask(filters={'education_level': 'SECONDARY'})
+        self.assertEqual(sorted(snapshot.ages(on=date(2026, 6, 15))[selected].tolist()), [29, 30])
+        self.assertEqual(snapshot.mask(scoping.NO_REGIONS).sum(), 0)
+        self.assertEqual(snapshot.mask('AMH').sum(), 0)
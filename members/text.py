@@ -0,0 +1,120 @@
+# members/text.py
+#
+# የስሞች ማመሳሰያ (Ge'ez-aware name normalisation)
+#
+# ተመሳሳይ ስም በተለያየ መንገድ ይጻፋል፡ በተመሳሳይ ድምጽ ፊደላት (ሀ/ሐ/ኀ፣ ሰ/ሠ፣ አ/ዐ፣ ጸ/ፀ)፣ በላቲን
+# ፊደል ("Abebe Kebede")፣ ወይም በተደጋገመ ፊደል ("Kebbede")። እዚህ ያሉት ተግባራት ስሞቹን ወደ
+# አንድ የላቲን ቅርጽ እና ወደ አጭር የድምጽ ቁልፍ (phonetic key) ይቀይራሉ፤ members/dedup.py
+# ለ blocking እና ለ fuzzy ንጽጽር ይጠቀማቸዋል።
+
+import re
+import unicodedata
+
+# የግዕዝ ፊደላት በ 8 ቅደም ተከተል (ሀ ሁ ሂ ሃ ሄ ህ ሆ + ዲቃላ) ተደርድረዋል፤ የረድፉ መጀመሪያ = codepoint & ~7
+_HOMOPHONE_ROWS = {
+    0x1210: 0x1200,  # ሐ → ሀ
+    0x1280: 0x1200,  # ኀ → ሀ
+    0x1220: 0x1230,  # ሠ → ሰ
+    0x12D0: 0x12A0,  # ዐ → አ
+    0x1340: 0x1338,  # ፀ → ጸ
+}
+
+# የረድፍ ተነባቢ (consonant) በላቲን፤ አ/ዐ ተነባቢ የላቸውም
+_CONSONANTS = {
+    0x1200: 'h', 0x1208: 'l', 0x1210: 'h', 0x1218: 'm', 0x1220: 's', 0x1228: 'r', 0x1230: 's', 0x1238: 'sh',
+    0x1240: 'q', 0x1260: 'b', 0x1268: 'v', 0x1270: 't', 0x1278: 'ch', 0x1280: 'h', 0x1290: 'n', 0x1298: 'ny',
+    0x12A0: '', 0x12A8: 'k', 0x12B8: 'h', 0x12C8: 'w', 0x12D0: '', 0x12D8: 'z', 0x12E0: 'zh', 0x12E8: 'y',
+    0x12F0: 'd', 0x1300: 'j', 0x1308: 'g', 0x1320: 't', 0x1328: 'ch', 0x1330: 'p', 0x1338: 'ts', 0x1340: 'ts',
+    0x1348: 'f', 0x1350: 'p',
+}
+# ቅደም ተከተሎቹ፡ ግዕዝ፣ ካዕብ፣ ሣልስ፣ ራብዕ፣ ኃምስ፣ ሳድስ (አናባቢ የለውም)፣ ሳብዕ፣ ዲቃላ (-wa)
+_VOWELS = ('e', 'u', 'i', 'a', 'e', '', 'o', 'wa')
+
+# የላቲን አጻጻፍ ልዩነቶች (ቅደም ተከተሉ አስፈላጊ ነው)፤ 'ች' ድምጽ ለጊዜው 'C' ይሆናል ('c' → 'k' እንዳይነካው)
+_LATIN_VARIANTS = (
+    ('tch', 'C'), ('ch', 'C'), ('x', 'C'), ('ph', 'f'), ('tz', 's'), ('ts', 's'), ('c', 'k'), ('q', 'k'),
+    ('kh', 'h'), ('sh', 's'), ('zh', 'z'), ('ny', 'n'), ('v', 'b'), ('p', 'b'),
+)
+_VOWEL_CHARS = set('aeiouy')
+_NON_LETTERS_RE = re.compile(r'[^a-z\s]+')
+
+
+def _row(codepoint):
+    return codepoint & ~7
+
+
+def normalise_geez(text):
+    """Fold homophone Ge'ez letters (ሐ/ኀ→ሀ, ሠ→ሰ, ዐ→አ, ፀ→ጸ) keeping the vowel order."""
+    chars = []
+    for char in text:
+        codepoint = ord(char)
+        row = _row(codepoint)
+        if row in _HOMOPHONE_ROWS and codepoint - row < 7:
+            char = chr(_HOMOPHONE_ROWS[row] + codepoint - row)
+        chars.append(char)
+    return ''.join(chars)
+
+
+def transliterate(text):
+    """Romanise Ge'ez letters (simplified SERA); other characters pass through unchanged."""
+    chars = []
+    for char in normalise_geez(text):
+        codepoint = ord(char)
+        row = _row(codepoint)
+        if row in _CONSONANTS:
+            order = codepoint - row
+            consonant, vowel = _CONSONANTS[row], _VOWELS[order]
+            if not consonant:
+                # አ ረድፍ፡ አ = a፣ እ = i
+                vowel = {0: 'a', 5: 'i'}.get(order, vowel)
+            chars.append(consonant + vowel)
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+
+def _latin(text):
+    text = unicodedata.normalize('NFKD', transliterate(text)).encode('ascii', 'ignore').decode('ascii').lower()
+    return _NON_LETTERS_RE.sub(' ', text)
+
+
+def _fold_variants(token):
+    for old, new in _LATIN_VARIANTS:
+        token = token.replace(old, new)
+    # የተደጋገሙ ፊደላት (Kebbede → Kebede)
+    return re.sub(r'(.)\1+', r'\1', token)
+
+
+def name_tokens(name):
+    """Lower-case Latin tokens of `name`, in either script, with spelling variants folded."""
+    return [_fold_variants(token) for token in _latin(name).split()]
+
+
+def phonetic_key(token):
+    """Consonant skeleton of a name token: a leading vowel becomes 'a', other vowels are dropped."""
+    if not token:
+        return ''
+    head = 'a' if token[0] in 'aeiou' else token[0]
+    key = head + ''.join(char for char in token[1:] if char not in _VOWEL_CHARS and char != 'h')
+    return re.sub(r'(.)\1+', r'\1', key)
+
+
+# የቦታ ስሞች፡ "ቦሌ ክፍለ ከተማ"፣ "Bole Sub City"፣ "bole" አንድ ቁልፍ፤ "ቀበሌ 03" እና "3" አንድ ቁልፍ
+_PLACE_WORD_RE = re.compile(r'[a-z]+|\d+')
+_GENERIC_PLACE_PHRASES = (('kfle', 'ketema'), ('kifle', 'ketema'), ('sub', 'kity'))
+_GENERIC_PLACE_WORDS = frozenset(['zone', 'zon', 'woreda', 'wereda', 'kebele', 'kebel', 'subkity'])
+
+
+def place_key(name):
+    """Matching key for an administrative area name, in either script, ignoring words like "zone" or "sub city"."""
+    text = unicodedata.normalize('NFKD', transliterate(name or '')).encode('ascii', 'ignore').decode('ascii').lower()
+    words = [word if word.isdigit() else _fold_variants(word) for word in _PLACE_WORD_RE.findall(text)]
+    for phrase in _GENERIC_PLACE_PHRASES:
+        for start in range(len(words) - len(phrase), -1, -1):
+            if tuple(words[start:start + len(phrase)]) == phrase:
+                del words[start:start + len(phrase)]
+    key = [
+        str(int(word)) if word.isdigit() else phonetic_key(word)
+        for word in words if word not in _GENERIC_PLACE_WORDS
+    ]
+    return ' '.join(key) or ' '.join(words) or (name or '').strip().lower()
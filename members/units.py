@@ -0,0 +1,216 @@
+# members/units.py
+#
+# የአስተዳደር ክፍሎች (ክልል → ዞን → ወረዳ → ቀበሌ)
+#
+# Member.zone/woreda/kebele ነፃ ጽሁፎች ናቸው ("ቦሌ"፣ "Bole"፣ "bole sub city")፤ Member ሲቀመጥ
+# ጽሁፎቹ በ members/text.py place_key ወደ AdministrativeUnit ረድፎች ይዛመዳሉ (ከሌሉ ይፈጠራሉ)
+# እና zone_unit/woreda_unit/kebele_unit ይሞላሉ። እያንዳንዱ ክፍል በስሩ ያሉትን ንቁ አባላት
+# ብዛት (member_count) ይይዛል፤ እንደ MemberStat (members/stats.py) አባል ሲቀመጥ/ሲሰረዝ በ +/-
+# ይስተካከላል። ዳሽቦርዱ ከክልል እስከ ቀበሌ የሚወርደው የአንድን ክፍል ንዑስ ክፍሎች በ
+# (parent, -member_count) index በማንበብ ነው፤ የአባላትን ሠንጠረዥ አይቆጥርም።
+# `rebuild_administrative_units` ብዛቶቹን (ከተፈለገም ማዛመዱን) ከዜሮ ያሰላል።
+
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+
+from .models import REGION_CHOICES, AdministrativeUnit, Member
+from .text import place_key
+
+ADDRESS_FIELDS = ('region', 'zone', 'woreda', 'kebele')
+UNIT_FIELDS = ('zone_unit', 'woreda_unit', 'kebele_unit')
+COUNT_FIELDS = frozenset(['region', 'is_active', *UNIT_FIELDS])
+MISSING = object()
+
+_LEVELS = (AdministrativeUnit.ZONE, AdministrativeUnit.WOREDA, AdministrativeUnit.KEBELE)
+
+
+class Resolver:
+    """Finds (or creates) the units for address texts, remembering them for its own lifetime."""
+
+    def __init__(self, unit_model=AdministrativeUnit):
+        self.model = unit_model
+        self.ids = {}
+
+    def _unit(self, region, level, parent_id, name, match_key):
+        if (parent_id, match_key) not in self.ids:
+            unit, created = self.model.objects.get_or_create(
+                parent_id=parent_id, match_key=match_key,
+                defaults={'region': region, 'level': level, 'name': name[:100]},
+            )
+            self.ids[(parent_id, match_key)] = unit.pk
+        return self.ids[(parent_id, match_key)]
+
+    def resolve(self, region, zone, woreda, kebele):
+        """Return the (zone, woreda, kebele) unit ids; a level is None when its text or a parent's is blank."""
+        parent_id = self._unit(region, AdministrativeUnit.REGION, None, dict(REGION_CHOICES).get(region, region), region)
+        ids = []
+        for level, name in zip(_LEVELS, (zone, woreda, kebele)):
+            name = (name or '').strip()
+            parent_id = self._unit(region, level, parent_id, name, place_key(name)) if name and parent_id else None
+            ids.append(parent_id)
+        return tuple(ids)
+
+
+def assign_if_changed(member, update_fields=None):
+    """Point the member's unit foreign keys at its address texts if those changed; returns True when it did."""
+    if update_fields is not None and not set(ADDRESS_FIELDS).intersection(update_fields):
+        return False
+    # የአድራሻ መስኮቹ ካልተጫኑ (.only()) አይቀየሩም
+    if not all(field in member.__dict__ for field in ADDRESS_FIELDS):
+        return False
+    loaded = getattr(member, '_loaded_values', {})
+    if not member._state.adding and all(
+        field in loaded and loaded[field] == member.__dict__[field] for field in ADDRESS_FIELDS
+    ):
+        return False
+    ids = Resolver().resolve(*(member.__dict__[field] for field in ADDRESS_FIELDS))
+    for field, unit_id in zip(UNIT_FIELDS, ids):
+        setattr(member, f'{field}_id', unit_id)
+    return True
+
+
+def assign_members(members):
+    # ለ bulk_create (Member.save ለማይጠራባቸው)
+    resolver = Resolver()
+    for member in members:
+        ids = resolver.resolve(member.region, member.zone, member.woreda, member.kebele)
+        for field, unit_id in zip(UNIT_FIELDS, ids):
+            setattr(member, f'{field}_id', unit_id)
+
+
+# --- የአባላት ብዛት ---
+def _key(region, zone_unit_id, woreda_unit_id, kebele_unit_id, is_active):
+    # ንቁ ያልሆኑ አባላት አይቆጠሩም
+    if not is_active:
+        return None
+    return (region, zone_unit_id, woreda_unit_id, kebele_unit_id)
+
+
+def unit_key(member):
+    return _key(member.region, member.zone_unit_id, member.woreda_unit_id, member.kebele_unit_id, member.is_active)
+
+
+def loaded_unit_key(member):
+    # ከዳታቤዝ ሲጫን የነበረው ቁልፍ፤ መስኮቹ ካልተጫኑ MISSING
+    loaded = getattr(member, '_loaded_values', {})
+    names = ('region', 'zone_unit_id', 'woreda_unit_id', 'kebele_unit_id', 'is_active')
+    if not set(names).issubset(loaded):
+        return MISSING
+    return _key(*(loaded[name] for name in names))
+
+
+def _apply_counts(unit_counts, region_counts):
+    # ተመሳሳይ ለውጥ ያላቸው ክፍሎች በአንድ UPDATE
+    by_delta = defaultdict(lambda: (set(), set()))
+    for unit_id, delta in unit_counts.items():
+        if unit_id is not None and delta:
+            by_delta[delta][0].add(unit_id)
+    for region, delta in region_counts.items():
+        if delta:
+            by_delta[delta][1].add(region)
+    for delta, (unit_ids, regions) in by_delta.items():
+        AdministrativeUnit.objects.filter(
+            Q(pk__in=unit_ids) | Q(parent__isnull=True, match_key__in=regions)
+        ).update(member_count=F('member_count') + delta)
+
+
+def adjust(keys_and_deltas):
+    unit_counts, region_counts = Counter(), Counter()
+    for key, delta in keys_and_deltas:
+        if key is None:
+            continue
+        region, *unit_ids = key
+        region_counts[region] += delta
+        for unit_id in unit_ids:
+            unit_counts[unit_id] += delta
+    _apply_counts(unit_counts, region_counts)
+
+
+def apply_members(members, delta=1):
+    adjust((unit_key(member), delta) for member in members)
+
+
+def remember_loaded_key(instance, update_fields=None):
+    if instance._state.adding or instance.pk is None:
+        instance._unit_key = None
+        return
+    if update_fields is not None and not COUNT_FIELDS.intersection(update_fields):
+        return
+    key = loaded_unit_key(instance)
+    if key is MISSING:
+        old = Member.objects.filter(pk=instance.pk).values_list(
+            'region', 'zone_unit_id', 'woreda_unit_id', 'kebele_unit_id', 'is_active',
+        ).first()
+        key = _key(*old) if old else None
+    instance._unit_key = key
+
+
+def member_saved(instance, created, update_fields=None):
+    if not created and update_fields is not None and not COUNT_FIELDS.intersection(update_fields):
+        return
+    old_key = instance.__dict__.pop('_unit_key', None)
+    new_key = unit_key(instance)
+    if old_key != new_key:
+        adjust([(old_key, -1), (new_key, 1)])
+
+
+def member_deleted(instance):
+    key = loaded_unit_key(instance)
+    adjust([(unit_key(instance) if key is MISSING else key, -1)])
+
+
+# --- ከዜሮ ማስላት ---
+def backfill(member_model=Member, unit_model=AdministrativeUnit, reassign=True):
+    """
+    Match every member's address texts to units (when `reassign`) and recount
+    each unit's active members. Takes the models so migrations can pass their
+    historical versions.
+    """
+    if reassign:
+        resolver = Resolver(unit_model)
+        combos = member_model.objects.values_list(*ADDRESS_FIELDS).distinct().order_by()
+        for region, zone, woreda, kebele in combos.iterator():
+            ids = resolver.resolve(region, zone, woreda, kebele)
+            member_model.objects.filter(region=region, zone=zone, woreda=woreda, kebele=kebele).update(
+                **dict(zip(UNIT_FIELDS, ids))
+            )
+
+    active = member_model.objects.filter(is_active=True)
+    unit_counts = Counter()
+    for field in UNIT_FIELDS:
+        unit_counts.update(dict(
+            active.filter(**{f'{field}__isnull': False}).values_list(field).annotate(count=Count('id')).order_by()
+        ))
+    region_counts = dict(active.values_list('region').annotate(count=Count('id')).order_by())
+
+    units = list(unit_model.objects.only('pk', 'parent_id', 'match_key'))
+    for unit in units:
+        unit.member_count = region_counts.get(unit.match_key, 0) if unit.parent_id is None else unit_counts.get(unit.pk, 0)
+    unit_model.objects.bulk_update(units, ['member_count'], batch_size=2000)
+    return len(units)
+
+
+@transaction.atomic
+def rebuild(reassign=False):
+    return backfill(reassign=reassign)
+
+
+def breakdown(unit=None, scope=None):
+    """The child units of `unit` (or the regions in `scope`), largest first, from the (parent, count) index."""
+    from .scoping import filter_by_scope
+    if unit is None:
+        children = filter_by_scope(AdministrativeUnit.objects.filter(parent__isnull=True), scope)
+    else:
+        children = unit.children.all()
+    return children.filter(member_count__gt=0).order_by('-member_count', 'name')
+
+
+def ancestors(unit):
+    # unit በ select_related('parent__parent__parent') ሲጫን ተጨማሪ query የለም
+    chain = []
+    while unit is not None:
+        chain.append(unit)
+        unit = unit.parent
+    return chain[::-1]
@@ -7,6 +7,9 @@ from django.contrib.auth import views as auth_views
 urlpatterns = [
     # Dashboard, Profile, Member List
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/areas/', views.area_breakdown, name='area_breakdown'),
+    path('dashboard/analytics/', views.analytics_report, name='analytics_report'),
+    path('dashboard/analytics/data/', views.analytics_data, name='analytics_data'),
     path('profile/', views.profile, name='profile'),
     path('profile/update/', views.profile_update, name='profile_update'),
     path('list/', views.member_list, name='member_list'),
@@ -32,4 +35,9 @@ urlpatterns = [
     path('detail/<int:pk>/', views.member_detail, name='member_detail'),
     path('detail/<int:pk>/', views.member_detail, name='member_detail'),
     path('id_card/<int:pk>/', views.member_id_card, name='member_id_card'),
+    path('id_cards/print/', views.print_id_cards, name='print_id_cards'),
+    path('meetings/<int:meeting_id>/check-in/', views.meeting_check_in, name='meeting_check_in'),
+    # የ offline መመዝገቢያ መሳሪያዎች (members/sync.py)
+    path('sync/pull/', views.sync_pull, name='sync_pull'),
+    path('sync/push/', views.sync_push, name='sync_push'),
 ]
\ No newline at end of file
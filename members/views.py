@@ -2,21 +2,51 @@
 
 # 1. Imports (ሁሉንም በአንድ ቦታ ማሰባሰብ)
 import csv
-import qrcode
-import base64
-from io import BytesIO
-from django.http import HttpResponse
+import zlib
+import hashlib
+import json
+from contextvars import copy_context
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import require_POST
 from django.contrib.auth.models import User
-from django.db.models import Count, Q
-from django.db.models.functions import ExtractYear
+from django.db import transaction
 from django.templatetags.static import static
-from .models import Member, Announcement, GENDER_CHOICES, REGION_CHOICES
+from .models import (
+    Member, MemberStat, Meeting, Attendance, MemberEngagement, MeetingAttendanceStat,
+    RegionEngagement, AdministrativeUnit, GENDER_CHOICES, REGION_CHOICES,
+)
 from .forms import MemberCreationForm, MemberUpdateForm
+from .filters import filter_members
+from .pagination import KeysetPaginator, InvalidCursor, RankedPaginator
+from . import analytics, cards, checkin, feed, identity, qr, routing, scoping, sync, units
+from .routing import use_replica
+from .stats import dashboard_summary
+from .engagement import engagement_summary
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
 from django.utils.safestring import mark_safe
 
+MEMBER_LIST_PAGE_SIZE = 50
+EXPORT_CHUNK_SIZE = 2000
+
+# ብዙ የሚነበቡት ገጾች (profile, member_detail, dashboard, announcements, id card) async ናቸው፡
+# በ ASGI mode (gunicorn.conf.py, SERVER_MODE=asgi) ዳታቤዝ/cache ሲጠብቁ worker አይያዝም።
+# ቴምፕሌቶች፣ cache እና የቆዩ sync ረዳቶች በ request-ተኮር thread ይሰራሉ፤ QR በ thread pool።
+arender = sync_to_async(render)
+
+
+async def _request_user(request):
+    # request.user lazy ነው (በ async ውስጥ ሲነካ ዳታቤዝ ይጠይቃል)፤ አንዴ አምጥተን እንተካዋለን
+    request.user = await request.auser()
+    return request.user
+
+
 # 2. Authentication and Basic Pages
 def landing_page(request):
     if request.user.is_authenticated:
@@ -51,21 +81,38 @@ def register_member(request):
 
 # 3. Member-Specific Views (Profile, etc.)
 @login_required
-def profile(request):
-    member_profile = Member.objects.get(user=request.user)
+async def profile(request):
+    await _request_user(request)
+    # request.member ከ cache ይመጣል (members/identity.py)
+    member_profile = await request.amember()
+    if member_profile is None:
+        raise Http404("የአባልነት መገለጫ የለም።")
     context = {'member': member_profile}
-    return render(request, 'members/profile.html', context)
+    return await arender(request, 'members/profile.html', context)
 
 @login_required
 def profile_update(request):
-    member_profile = Member.objects.get(user=request.user)
+    # request.member ከ cache ይመጣል፣ የሌላ worker ወይም የ admin ለውጦችን ላያይ ይችላል፤ ለንባብ ብቻ ነው።
+    # ፎርሙ ከ primary አዲስ በተነበበው ረድፍ ይሞላል፣ POST ደግሞ ረድፉን ቆልፎ (select_for_update) ይጽፋል
+    members = Member.objects.filter(user=request.user)
     if request.method == 'POST':
-        form = MemberUpdateForm(request.POST, request.FILES, instance=member_profile)
-        if form.is_valid():
-            form.save()
+        with transaction.atomic():
+            member_profile = members.select_for_update().first()
+            if member_profile is None:
+                raise Http404("የአባልነት መገለጫ የለም።")
+            form = MemberUpdateForm(request.POST, request.FILES, instance=member_profile)
+            saved = form.is_valid()
+            if saved:
+                form.save()
+        if saved:
+            identity.invalidate([request.user.pk])
             messages.success(request, 'የግል መረጃዎ በተሳካ ሁኔታ ተስተካክሏል!')
             return redirect('profile')
     else:
+        with routing.primary():
+            member_profile = members.first()
+        if member_profile is None:
+            raise Http404("የአባልነት መገለጫ የለም።")
         form = MemberUpdateForm(instance=member_profile)
     context = {'form': form, 'page_title': 'የግል መረጃ ማስተካከያ'}
     return render(request, 'members/profile_update_form.html', context)
@@ -73,137 +120,469 @@ def profile_update(request):
 
 # 4. Staff/Admin Views (Dashboard, Lists, etc.)
 @login_required
-def dashboard(request):
-    if not request.user.is_staff:
+@use_replica
+async def dashboard(request):
+    user = await _request_user(request)
+    if not user.is_staff:
         return redirect('profile')
 
-    user = request.user
-    base_queryset = Member.objects.filter(is_active=True)
-    
-    if not user.is_superuser and user.groups.filter(name='የክልል አስተባባሪ').exists():
-        try:
-            coordinator_profile = Member.objects.get(user=user)
-            if coordinator_profile.is_coordinator and coordinator_profile.coordinator_region:
-                base_queryset = base_queryset.filter(region=coordinator_profile.coordinator_region)
-            else:
-                base_queryset = Member.objects.none()
-        except Member.DoesNotExist:
-            base_queryset = Member.objects.none()
-
-    gender_map = dict(GENDER_CHOICES)
-    gender_distribution = list(base_queryset.values('gender').annotate(count=Count('gender')))
-    for item in gender_distribution:
-        item['gender_display'] = gender_map.get(item['gender'], item['gender'])
+    # የክልል አስተባባሪዎች የሚያዩት የራሳቸውን ክልል ብቻ ነው (members/scoping.py)
+    scope = await sync_to_async(scoping.scope_for_user)(user)
+    base_queryset = Member.objects.in_scope(scope).filter(is_active=True)
+    member_stats = scoping.filter_by_scope(MemberStat.objects.all(), scope)
 
-    region_map = dict(REGION_CHOICES)
-    members_by_region = list(base_queryset.values('region').annotate(count=Count('region')).order_by('-count'))
-    for item in members_by_region:
-        item['region_display'] = region_map.get(item['region'], item['region'])
+    # ቁጥሮቹ ከ MemberStat ጥቂት ረድፎች ይሰላሉ (members/stats.py)፤ ሙሉውን ሠንጠረዥ አንቆጥርም
+    summary = await sync_to_async(dashboard_summary)(member_stats)
+    gender_distribution = summary['gender_distribution']
+    recent_members = [member async for member in base_queryset.order_by('-date_joined', '-id')[:5]]
+    # የተሳትፎ መጠን ከ RegionEngagement (ቢበዛ አንድ ረድፍ በክልል) ይሰላል (members/engagement.py)
+    attendance = await sync_to_async(engagement_summary)(
+        scoping.filter_by_scope(RegionEngagement.objects.all(), scope)
+    )
+    recent_meetings = []
+    if scope == scoping.ALL_REGIONS:
+        recent_meetings = [
+            stat async for stat in
+            MeetingAttendanceStat.objects.select_related('meeting').order_by('-meeting__date')[:5]
+        ]
 
-    recent_members = base_queryset.order_by('-date_joined')[:5]
-    members_by_year_data = base_queryset.annotate(year=ExtractYear('date_joined')).values('year').annotate(count=Count('id')).order_by('year')
-    
     context = {
         'page_title': 'የአስተዳደር ዳሽቦርድ',
-        'total_members': base_queryset.count(),
+        'total_members': summary['total_members'],
         'gender_distribution': gender_distribution,
-        'members_by_region': members_by_region,
+        'members_by_region': summary['members_by_region'],
         'recent_members': recent_members,
-        'bar_chart_labels': [str(item['year']) for item in members_by_year_data],
-        'bar_chart_data': [item['count'] for item in members_by_year_data],
+        'attendance': attendance,
+        'recent_meetings': recent_meetings,
+        'bar_chart_labels': [str(year) for year, count in summary['members_by_year']],
+        'bar_chart_data': [count for year, count in summary['members_by_year']],
         'pie_chart_labels': [item['gender_display'] for item in gender_distribution],
         'pie_chart_data': [item['count'] for item in gender_distribution],
     }
-    return render(request, 'members/dashboard.html', context)
+    return await arender(request, 'members/dashboard.html', context)
+
+@login_required
+@use_replica
+async def area_breakdown(request):
+    user = await _request_user(request)
+    if not user.is_staff:
+        return redirect('profile')
+
+    # ክልል → ዞን → ወረዳ → ቀበሌ፤ እያንዳንዱ ደረጃ ከ AdministrativeUnit (parent, -member_count) index ይነበባል
+    scope = await sync_to_async(scoping.scope_for_user)(user)
+    unit = None
+    unit_id = request.GET.get('unit', '')
+    if unit_id:
+        if unit_id.isdigit():
+            unit = await AdministrativeUnit.objects.select_related('parent__parent__parent').filter(pk=unit_id).afirst()
+        if unit is None or not scoping.in_scope(scope, unit.region):
+            raise Http404("ክፍሉ አልተገኘም።")
+
+    children = [child async for child in units.breakdown(unit, scope)]
+    for child in children:
+        # የክፍሉን አባላት በአባላት ዝርዝር ውስጥ ለማሳየት
+        child.member_list_query = (
+            f"region={child.region}" if child.level == AdministrativeUnit.REGION
+            else f"{units.UNIT_FIELDS[child.level - 1]}={child.pk}"
+        )
+    level_names = dict(AdministrativeUnit.LEVEL_CHOICES)
+    child_level = AdministrativeUnit.REGION if unit is None else unit.level + 1
+    context = {
+        'page_title': f"አባላት በየ{level_names[child_level]}" + (f" — {unit.name}" if unit else ''),
+        'unit': unit,
+        'trail': units.ancestors(unit),
+        'children': children,
+        'child_level_name': level_names[child_level],
+        'can_drill_down': child_level < AdministrativeUnit.KEBELE,
+        'total_members': unit.member_count if unit else sum(child.member_count for child in children),
+    }
+    return await arender(request, 'members/area_breakdown.html', context)
 
 @login_required
+def analytics_report(request):
+    """
+    Cross-tabs (e.g. age band × education level) and the age distribution of
+    active members, computed from the analytics snapshot (members/analytics.py);
+    no member rows are read.
+    """
+    if not request.user.is_staff:
+        return redirect('profile')
+    rows = request.GET.get('rows') or 'age_band'
+    columns = request.GET.get('columns') or 'education_level'
+    filters = analytics.filter_params(request.GET)
+    snapshot = analytics.load_snapshot()
+    result, error = None, None
+    if snapshot is not None:
+        try:
+            result = analytics.report(snapshot, scoping.scope_for_user(request.user), rows, columns, filters)
+        except analytics.AnalyticsError as exc:
+            error = str(exc)
+
+    context = {
+        'page_title': 'የአባላት ትንታኔ',
+        'snapshot': snapshot,
+        'error': error,
+        'dimensions': analytics.DIMENSIONS.items(),
+        'filter_choices': [
+            (field, label, choices, filters.get(field, '')) for field, label, choices in analytics.CHOICE_DIMENSIONS
+        ],
+        'rows': rows,
+        'columns': columns,
+        'result': result,
+    }
+    if result:
+        table = result['crosstab']
+        context['table_rows'] = list(zip(table['rows']['labels'], table['counts'], table['row_totals']))
+        context['age_chart_labels'] = list(range(len(result['ages']['counts'])))
+        context['age_chart_data'] = result['ages']['counts']
+    return render(request, 'members/analytics_report.html', context)
+
+
+@login_required
+def analytics_data(request):
+    """The analytics report as JSON (same parameters as analytics_report)."""
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'ፍቃድ የለዎትም።'}, status=403)
+    snapshot = analytics.load_snapshot()
+    if snapshot is None:
+        return JsonResponse({'error': 'የትንታኔ snapshot ገና አልተፈጠረም (build_analytics_snapshot)።'}, status=503)
+    try:
+        result = analytics.report(
+            snapshot, scoping.scope_for_user(request.user),
+            request.GET.get('rows') or 'age_band', request.GET.get('columns') or 'education_level',
+            analytics.filter_params(request.GET),
+        )
+    except analytics.AnalyticsError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return JsonResponse(result)
+
+@login_required
+@use_replica
 def member_list(request):
     if not request.user.is_staff:
         return redirect('profile')
-    
-    queryset = Member.objects.filter(is_active=True).order_by('-date_joined')
-    query = request.GET.get('query')
-    region = request.GET.get('region')
-
-    if query:
-        queryset = queryset.filter(
-            Q(full_name__icontains=query) | 
-            Q(membership_id__icontains=query)
-        ).distinct()
-    if region:
-        queryset = queryset.filter(region__icontains=region)
-
-    context = {'page_title': 'የአባላት ዝርዝር', 'members': queryset}
+
+    queryset = filter_members(Member.objects.for_user(request.user).filter(is_active=True), request.GET, ranked=True)
+    # ፍለጋ ሲኖር ውጤቱ በተዛማጅነት ይደረደራል፤ ያለ ፍለጋ አዲሶቹ መጀመሪያ (keyset)
+    if (request.GET.get('query') or '').strip():
+        paginator = RankedPaginator(queryset, per_page=MEMBER_LIST_PAGE_SIZE)
+    else:
+        paginator = KeysetPaginator(queryset, per_page=MEMBER_LIST_PAGE_SIZE)
+    try:
+        page = paginator.page(after=request.GET.get('after'), before=request.GET.get('before'))
+    except InvalidCursor:
+        return redirect('member_list')
+
+    # ማጣሪያዎቹ ሳይጠፉ የቀጣይ/የቀዳሚ ገጽ አገናኞችን እናዘጋጃለን
+    params = request.GET.copy()
+    params.pop('after', None)
+    params.pop('before', None)
+    next_query = previous_query = None
+    if page.has_next():
+        params['after'] = page.next_cursor
+        next_query = params.urlencode()
+        params.pop('after')
+    if page.has_previous():
+        params['before'] = page.previous_cursor
+        previous_query = params.urlencode()
+        params.pop('before')
+
+    context = {
+        'page_title': 'የአባላት ዝርዝር',
+        'members': page,
+        'next_query': next_query,
+        'previous_query': previous_query,
+        'filter_query': params.urlencode(),
+    }
     return render(request, 'members/member_list.html', context)
 
+def _staff_can_view(user, member):
+    return user.is_staff and scoping.in_scope(scoping.scope_for_user(user), member.region)
+
+
+async def _get_member(request, pk):
+    # የራሱን ገጽ የሚያይ አባል ከ request.member (cache) ይወሰዳል
+    own = await request.amember()
+    if own is not None and own.pk == pk:
+        return own
+    return await Member.objects.aget(pk=pk)
+
+
 @login_required
-def member_detail(request, pk):
-    if not request.user.is_staff:
-        # አባሉ ራሱ ከሆነ ማየት ይችላል
-        try:
-            member = Member.objects.get(pk=pk)
-            if request.user == member.user:
-                pass # ፍቀድለት
-            else:
-                return redirect('profile') # ካልሆነ ወደ ፕሮፋይሉ ይመለስ
-        except Member.DoesNotExist:
-            return redirect('member_list')
-    
+async def member_detail(request, pk):
+    user = await _request_user(request)
     try:
-        member = Member.objects.get(pk=pk)
+        member = await _get_member(request, pk)
     except Member.DoesNotExist:
         messages.error(request, "አባሉ አልተገኘም!")
         return redirect('member_list')
-    context = {'member': member}
-    return render(request, 'members/member_detail.html', context)
+
+    # አባሉ ራሱ ከሆነ ማየት ይችላል (user_id ማነጻጸር ተጨማሪ query አያስፈልገውም)፤ staff በክልላቸው ወሰን ውስጥ
+    if member.user_id != user.pk and not await sync_to_async(_staff_can_view)(user, member):
+        messages.error(request, "ይህንን ገጽ ለማየት ፍቃድ የለዎትም።")
+        return redirect('profile')
+    context = {
+        'member': member,
+        'engagement': await MemberEngagement.objects.filter(member=member).afirst(),
+        'recent_attendance': [
+            attendance async for attendance in
+            Attendance.objects.filter(member=member, is_present=True)
+            .select_related('meeting').order_by('-meeting__date')[:10]
+        ],
+    }
+    return await arender(request, 'members/member_detail.html', context)
+
+def _announcement_etag(request, version, day, number):
+    # ገጹ የተጠቃሚውን ስም (navbar) ስለሚያሳይ ETag በተመልካቹ ላይም ይወሰናል
+    parts = [version, day.date().isoformat(), number, request.user.pk]
+    return quote_etag(hashlib.sha256('|'.join(map(str, parts)).encode('utf-8')).hexdigest()[:32])
+
 
 @login_required
-def announcement_list(request):
-    announcements = Announcement.objects.all().order_by('-date_posted')
-    context = {'page_title': 'ዜና እና ማስታወቂያዎች', 'announcements': announcements}
-    return render(request, 'members/announcement_list.html', context)
+async def announcement_list(request):
+    await _request_user(request)
+    # version አንድ ትንሽ aggregate query ነው፤ ምንም ካልተቀየረ ገጹ ሳይሰራ 304 ይመለሳል
+    version = await sync_to_async(feed.current_version)()
+    number = feed.page_number(request.GET.get('page'))
+    # 'አዲስ' ባጆቹ እኩለ ሌሊት ላይ ስለሚቀየሩ ገጹም ያኔ እንደተቀየረ ይቆጠራል
+    day = feed.badge_day()
+    etag = _announcement_etag(request, version, day, number)
+    last_modified = max(int(version[0]), int(day.timestamp()))
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        context = {
+            'page_title': 'ዜና እና ማስታወቂያዎች',
+            'feed_html': mark_safe(await sync_to_async(feed.render_page)(number, version, day)),
+        }
+        response = await arender(request, 'members/announcement_list.html', context)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+class _Echo:
+    # csv.writer ወደዚህ ሲጽፍ ረድፉን መልሶ ይሰጠናል (በማስታወሻ ውስጥ አይከማችም)
+    def write(self, value):
+        return value
+
+
+def _csv_chunks(rows):
+    gender_map = dict(GENDER_CHOICES)
+    region_map = dict(REGION_CHOICES)
+    writer = csv.writer(_Echo())
+    buffer = ['\ufeff', writer.writerow(['ሙሉ ስም', 'የአባልነት መለያ', 'ስልክ ቁጥር', 'ጾታ', 'ክልል', 'የተመዘገበበት ቀን'])]
+    for full_name, membership_id, phone_number, gender, region, date_joined in rows:
+        buffer.append(writer.writerow([
+            full_name,
+            membership_id,
+            phone_number,
+            gender_map.get(gender, gender),
+            region_map.get(region, region),
+            date_joined.strftime('%Y-%m-%d'),
+        ]))
+        if len(buffer) >= EXPORT_CHUNK_SIZE:
+            yield ''.join(buffer).encode('utf-8')
+            buffer = []
+    if buffer:
+        yield ''.join(buffer).encode('utf-8')
+
+
+def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _context_chunks(chunks, context):
+    iterator = iter(chunks)
+    done = object()
+    while (chunk := context.run(next, iterator, done)) is not done:
+        yield chunk
+
+
+async def _async_chunks(chunks, context):
+    # የዳታቤዝ cursor ያለበት iterator ስለሆነ ሁሉም next() ጥሪዎች በአንድ (request-ተኮር) thread ይሰራሉ
+    iterator = iter(chunks)
+    done = object()
+    next_chunk = sync_to_async(context.run, thread_sensitive=True)
+    while (chunk := await next_chunk(next, iterator, done)) is not done:
+        yield chunk
+
+
+def _streaming_response(request, chunks, content_type):
+    # chunks የሚነበቡት view ከተመለሰ በኋላ ነው፤ የ view ው የዳታቤዝ ማዘዋወሪያ (members/routing.py) እንዲቀጥል
+    # እያንዳንዱ next() በ view ው context ውስጥ ይሰራል።
+    # በ ASGI ላይ Django sync iterator ን ሙሉ በሙሉ አንብቦ ነው የሚልከው፤ async iterator ሲሰጠው ግን chunk በ chunk
+    context = copy_context()
+    if isinstance(request, ASGIRequest):
+        return StreamingHttpResponse(_async_chunks(chunks, context), content_type=content_type)
+    return StreamingHttpResponse(_context_chunks(chunks, context), content_type=content_type)
+
 
 @login_required
+@use_replica
 def export_members_csv(request):
     if not request.user.is_staff:
         return redirect('profile')
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="eudp_members_report.csv"'
-    response.write(u'\ufeff'.encode('utf8'))
-    writer = csv.writer(response)
-    writer.writerow(['ሙሉ ስም', 'የአባልነት መለያ', 'ስልክ ቁጥር', 'ጾታ', 'ክልል', 'የተመዘገበበት ቀን'])
-    
-    queryset = Member.objects.filter(is_active=True).order_by('full_name')
-    # ... (የፍለጋ ሎጂክ እዚህ መጨመር ይቻላል) ...
-
-    for member in queryset:
-        writer.writerow([
-            member.full_name,
-            member.membership_id,
-            member.phone_number,
-            member.get_gender_display(),
-            member.get_region_display(),
-            member.date_joined.strftime('%Y-%m-%d')
-        ])
+    # ከአባላት ዝርዝሩ ጋር ተመሳሳይ ማጣሪያዎች፤ የሚያስፈልጉት አምዶች ብቻ በ chunks ይነበባሉ
+    queryset = filter_members(Member.objects.for_user(request.user).filter(is_active=True), request.GET)
+    rows = queryset.order_by('-date_joined', '-id').values_list(
+        'full_name', 'membership_id', 'phone_number', 'gender', 'region', 'date_joined'
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+    chunks = _csv_chunks(rows)
+    filename = 'eudp_members_report.csv'
+    content_type = 'text/csv; charset=utf-8'
+    if request.GET.get('compress') == 'gzip':
+        chunks = _gzip_chunks(chunks)
+        filename += '.gz'
+        content_type = 'application/gzip'
+
+    response = _streaming_response(request, chunks, content_type)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
     return response
 
+def _id_card_etag(request, member):
+    # ገጹ የተጠቃሚውን ስም (navbar) ስለሚያሳይ ETag በተመልካቹ ላይም ይወሰናል
+    parts = [member.pk, member.updated_at.isoformat(), member.photo.name or '', request.user.pk]
+    return quote_etag(hashlib.sha256('|'.join(map(str, parts)).encode('utf-8')).hexdigest()[:32])
+
+
 @login_required
-def member_id_card(request, pk):
+async def member_id_card(request, pk):
+    user = await _request_user(request)
     try:
-        member = Member.objects.get(pk=pk)
-        if not request.user.is_staff and request.user != member.user:
+        member = await _get_member(request, pk)
+        if member.user_id != user.pk and not await sync_to_async(_staff_can_view)(user, member):
             messages.error(request, "ይህንን ገጽ ለማየት ፍቃድ የለዎትም።")
             return redirect('profile')
     except Member.DoesNotExist:
         messages.error(request, "አባሉ አልተገኘም!")
         return redirect('member_list')
 
-    qr_data = f"ስም: {member.full_name}\nመለያ ቁጥር: {member.membership_id}"
-    qr_img = qrcode.make(qr_data)
-    buffer = BytesIO()
-    qr_img.save(buffer, format="PNG")
-    qr_code_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
+    # ካርዱ ካልተቀየረ 304 እንመልሳለን (QR አይፈጠርም፣ ቴምፕሌት አይሰራም)
+    etag = _id_card_etag(request, member)
+    last_modified = int(member.updated_at.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        # QR መሳል CPU ስራ ነው፤ በ thread pool ይሰራል (የ request thread ን አይዝም)
+        qr_code_base64 = await sync_to_async(qr.get_qr_base64, thread_sensitive=False)(
+            member.full_name, member.membership_id
+        )
+        context = {'member': member, 'qr_code_base64': qr_code_base64}
+        response = await arender(request, 'members/id_card.html', context)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@login_required
+def print_id_cards(request):
+    if not request.user.is_staff:
+        return redirect('profile')
+
+    ids = [int(value) for value in request.GET.get('ids', '').split(',') if value.strip().isdigit()]
+    queryset = cards.select_members(
+        Member.objects.for_user(request.user),
+        region=request.GET.get('region'),
+        membership_level=request.GET.get('level'),
+        ids=ids,
+    )
+    if not (request.GET.get('region') or request.GET.get('level') or ids):
+        messages.error(request, "እባክዎ ክልል፣ የአባልነት ደረጃ ወይም የአባላት መለያዎችን ይምረጡ።")
+        return redirect('member_list')
+
+    if queryset[:cards.WEB_PRINT_LIMIT + 1].count() > cards.WEB_PRINT_LIMIT:
+        messages.error(
+            request,
+            f"ከድር ገጹ ቢበዛ {cards.WEB_PRINT_LIMIT} ካርዶች ይታተማሉ፤ ለትላልቅ ህትመቶች "
+            "`manage.py print_id_cards` ይጠቀሙ ወይም ምርጫውን ያጥቡ።",
+        )
+        return redirect('member_list')
+
+    # ሉሆቹ በዚሁ process ይሳላሉ (ለጥቂት ካርዶች pool መጀመር አያስፈልግም)፤ PDF ገጾቹ ሲዘጋጁ
+    # ወዲያውኑ ወደ ተጠቃሚው ይላካሉ
+    pages = cards.render_sheets(cards.iter_sheets(queryset))
+    response = _streaming_response(request, cards.pdf_stream(pages), 'application/pdf')
+    response['Content-Disposition'] = 'attachment; filename="eudp_id_cards.pdf"'
+    return response
+
+
+@require_POST
+@login_required
+def meeting_check_in(request, meeting_id):
+    """
+    Check members in to a meeting. Accepts a single scanned QR payload (form
+    field `payload`) or a JSON body {"scans": [...]} from an offline scanner.
+    """
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'ፍቃድ የለዎትም።'}, status=403)
+    meeting = Meeting.objects.filter(pk=meeting_id).only('pk').first()
+    if meeting is None:
+        return JsonResponse({'error': 'ስብሰባው አልተገኘም።'}, status=404)
+
+    if request.content_type == 'application/json':
+        try:
+            scans = json.loads(request.body).get('scans')
+        except (ValueError, AttributeError):
+            scans = None
+        if not isinstance(scans, list) or not all(isinstance(scan, str) for scan in scans):
+            return JsonResponse({'error': 'scans የጽሑፍ ዝርዝር መሆን አለበት።'}, status=400)
+    else:
+        scans = [request.POST.get('payload', '')]
+    if len(scans) > checkin.MAX_SCANS_PER_REQUEST:
+        return JsonResponse({'error': f'ቢበዛ {checkin.MAX_SCANS_PER_REQUEST} መለያዎች በአንድ ጊዜ።'}, status=400)
 
-    context = {'member': member, 'qr_code_base64': qr_code_base64}
-    return render(request, 'members/id_card.html', context)
\ No newline at end of file
+    accepted, unknown = checkin.check_in(meeting, scans)
+    return JsonResponse({'meeting': meeting.pk, 'accepted': accepted, 'unknown': unknown})
+
+
+@ensure_csrf_cookie
+@login_required
+def sync_pull(request):
+    """
+    Offline devices: members (in the user's scope), meetings and announcements
+    changed since `?mark=` (members/sync.py). Repeat with the returned mark
+    while `more` is true. Also sets the csrftoken cookie that pushes send back
+    in the X-CSRFToken header.
+    """
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'ፍቃድ የለዎትም።'}, status=403)
+    try:
+        limit = min(int(request.GET.get('limit', sync.PULL_LIMIT)), sync.MAX_PULL_LIMIT)
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'error': 'limit አዎንታዊ ቁጥር መሆን አለበት።'}, status=400)
+    try:
+        return JsonResponse(sync.pull(request.user, request.GET.get('mark'), limit))
+    except sync.SyncError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+
+
+@require_POST
+@login_required
+def sync_push(request):
+    """
+    Offline devices: a JSON batch {"registrations": [...], "attendance": [...]},
+    optionally gzip-compressed, applied once per Idempotency-Key header.
+    Needs the session cookie and an X-CSRFToken header (see sync_pull).
+    """
+    if not request.user.is_staff:
+        return JsonResponse({'error': 'ፍቃድ የለዎትም።'}, status=403)
+    try:
+        body = sync.read_batch(request.body, request.headers.get('Content-Encoding', ''))
+        try:
+            batch = json.loads(body)
+        except (ValueError, UnicodeDecodeError):
+            raise sync.SyncError('batch ው JSON መሆን አለበት።')
+        response, replayed = sync.push(request.user, request.headers.get('Idempotency-Key', ''), batch)
+    except sync.SyncError as exc:
+        return JsonResponse({'error': str(exc)}, status=400)
+    return JsonResponse({**response, 'replayed': replayed})
@@ -0,0 +1,27 @@
+# members/workers.py
+#
+# ለ CPU-ከባድ ስራዎች (የካርድ ሥዕል፣ የይለፍ ቃል hashing) የሚያገለግል process pool።
+# 'spawn' እንጠቀማለን፤ workers ከወላጁ የዳታቤዝ ግንኙነት አይወርሱም።
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections
+
+
+def init_django():
+    import django
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'party_management.settings')
+    django.setup()
+
+
+def process_pool(workers=None):
+    workers = workers or os.cpu_count() or 1
+    # ክፍት የዳታቤዝ ግንኙነቶች ወደ workers እንዳይተላለፉ
+    connections.close_all()
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_django,
+    )
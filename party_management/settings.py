@@ -43,11 +43,18 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware', 
+    # WhiteNoise (members/middleware.py)፤ በ ASGI mode ላይም async ሆኖ ይሰራል
+    'members.middleware.WhiteNoiseMiddleware',
+    'members.middleware.QueryCountMiddleware',
+    # ከጻፉ በኋላ ለጥቂት ሰከንዶች ከ primary እንዲያነቡ (members/routing.py)
+    'members.middleware.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'members.middleware.MemberMiddleware',
+    # የ request ለውጦች በአንድ bulk INSERT ይመዘገባሉ (members/changelog.py)
+    'members.middleware.ChangeLogMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -71,15 +78,103 @@ TEMPLATES = [
     },
 ]
 
+# --- Server mode (gunicorn.conf.py) ---
+# 'wsgi' ወይም 'asgi'፤ በ ASGI ላይ ግንኙነቶች በ request መጨረሻ ስለሚዘጉ persistent connections አይጠቅሙም
+SERVER_MODE = env('SERVER_MODE', default='wsgi')
+
 # --- Database Configuration ---
 DATABASES = {
     'default': dj_database_url.config(
         default=f'sqlite:///{os.path.join(BASE_DIR, "db.sqlite3")}',
-        conn_max_age=600,
+        conn_max_age=0 if SERVER_MODE == 'asgi' else 600,
         ssl_require=not DEBUG 
     )
 }
 
+# --- Read replica (members/routing.py) ---
+# ሲሰጥ የዳሽቦርድ፣ የአባላት ዝርዝር፣ export እና የ admin ዝርዝሮች ንባቦች ወደ replica ይሄዳሉ
+REPLICA_DATABASE_URL = env('REPLICA_DATABASE_URL', default=None)
+if REPLICA_DATABASE_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        REPLICA_DATABASE_URL,
+        conn_max_age=0 if SERVER_MODE == 'asgi' else 600,
+        ssl_require=not DEBUG,
+    )
+    # tests ውስጥ replica የ default ቅጂ (mirror) ነው
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = ['members.routing.ReplicaRouter']
+# ከጻፉ በኋላ (POST) ተጠቃሚው ለዚህን ያህል ሰከንድ ከ primary ያነባል፤ ከ replication lag በላይ መሆን አለበት
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=15)
+
+# የለውጥ መዝገቡ ስንት ቀን ይቆያል (`prune_change_log`)
+CHANGE_LOG_RETENTION_DAYS = env.int('CHANGE_LOG_RETENTION_DAYS', default=730)
+
+# --- Cache Configuration ---
+# `qrcodes`: የመታወቂያ ካርድ QR ምስሎች (members/qr.py)። LocMemCache ሲሞላ
+# ቀድሞ ያልተጠቀሙትን (LRU) ያስወጣል።
+CACHES = {
+    # ብዙ workers ሲኖሩ የጋራ cache ይጠቀሙ (ለምሳሌ CACHE_URL=redis://...)
+    'default': env.cache('CACHE_URL', default='locmemcache://eudp-default'),
+    'qrcodes': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'eudp-qrcodes',
+        'OPTIONS': {'MAX_ENTRIES': env.int('QR_CACHE_MAX_ENTRIES', default=5000)},
+    },
+}
+QR_CACHE_TIMEOUT = env.int('QR_CACHE_TIMEOUT', default=60 * 60 * 24 * 30)
+# የማስታወቂያ ገጾች (members/feed.py)፤ version ሲቀየር ወዲያው ይታደሳሉ
+FEED_CACHE_TIMEOUT = env.int('FEED_CACHE_TIMEOUT', default=60 * 10)
+# የ staff የክልል ወሰን (members/scoping.py)፤ ለውጦች በ signals ወዲያው ይሰረዛሉ። የሚቀመጠው
+# `default` የጋራ cache (CACHE_URL) ሲሆን ብቻ ነው፤ በ LocMemCache በየ request ይሰላል
+MEMBER_SCOPE_CACHE_TIMEOUT = env.int('MEMBER_SCOPE_CACHE_TIMEOUT', default=60 * 60)
+# request.member (members/identity.py)፤ Member ሲቀየር በ signals ወዲያው ይሰረዛል
+MEMBER_PROFILE_CACHE_TIMEOUT = env.int('MEMBER_PROFILE_CACHE_TIMEOUT', default=60 * 15)
+
+# --- Sessions ---
+# በ `default` cache ይነበባሉ፣ ወደ ዳታቤዝም ይጻፋሉ (cache ቢጠፋ sessions አይጠፉም)
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# --- ID card printing (members/cards.py) ---
+# የግዕዝ ፊደል ያለው TTF (ለምሳሌ AbyssinicaSIL-Regular.ttf)፤ ካልተሰጠ የ Pillow ነባሪ ፊደል
+ID_CARD_FONT_PATH = env('ID_CARD_FONT_PATH', default=None)
+ID_CARD_WORKERS = env.int('ID_CARD_WORKERS', default=0) or None
+
+# --- Member photos (members/images.py) ---
+# True ከሆነ ፎቶዎች በ background thread ሳይሆን transaction ሲጠናቀቅ ወዲያው ይቀነባበራሉ
+PHOTO_PROCESSING_SYNC = env.bool('PHOTO_PROCESSING_SYNC', default=False)
+
+# --- Meeting check-in (members/checkin.py) ---
+# ይህን ያህል check-ins ሲሰበሰቡ ወይም ይህን ያህል ሰከንድ ሲያልፍ በአንድ bulk upsert ይጻፋሉ (1 = ወዲያው)
+CHECKIN_FLUSH_SIZE = env.int('CHECKIN_FLUSH_SIZE', default=200)
+CHECKIN_FLUSH_INTERVAL = env.float('CHECKIN_FLUSH_INTERVAL', default=2.0)
+# አንድ check-in ይህን ያህል ጊዜ መጻፍ ካልተሳካ ይጣላል (ይመዘገባል)፤ በ flush interval ይሞከራል
+CHECKIN_MAX_ATTEMPTS = env.int('CHECKIN_MAX_ATTEMPTS', default=10)
+
+# --- Offline sync API (members/sync.py) ---
+# ከዚህ ያነሰ ሰከንድ የሆናቸው ለውጦች (ገና commit ሊደረጉ የሚችሉ) ለሚቀጥለው pull ይቆያሉ
+SYNC_SETTLE_SECONDS = env.int('SYNC_SETTLE_SECONDS', default=5)
+
+# --- Analytics snapshot (members/analytics.py, `build_analytics_snapshot`) ---
+ANALYTICS_SNAPSHOT_PATH = env('ANALYTICS_SNAPSHOT_PATH', default=os.path.join(BASE_DIR, 'analytics', 'members.npz'))
+
+# --- Announcement fan-out (members/messaging.py, `send_messages` worker) ---
+MESSAGE_SENDERS = {
+    'sms': env('SMS_SENDER', default='members.messaging.ConsoleSender'),
+    'email': env('EMAIL_SENDER', default='members.messaging.EmailSender'),
+}
+MESSAGE_OUTBOX_PATH = env('MESSAGE_OUTBOX_PATH', default=os.path.join(BASE_DIR, 'outbox.jsonl'))
+# በሰከንድ ቢበዛ የሚላኩ መልዕክቶች (0 = ገደብ የለም) እና በአንድ ጊዜ የሚወሰዱ
+MESSAGE_RATE_PER_SECOND = env.float('MESSAGE_RATE_PER_SECOND', default=20)
+MESSAGE_BATCH_SIZE = env.int('MESSAGE_BATCH_SIZE', default=200)
+# ያልተሳካ መልዕክት እስከ MESSAGE_MAX_ATTEMPTS ድረስ በ RETRY_DELAY × 2^n ሰከንድ ክፍተት ይሞከራል
+MESSAGE_MAX_ATTEMPTS = env.int('MESSAGE_MAX_ATTEMPTS', default=5)
+MESSAGE_RETRY_DELAY = env.int('MESSAGE_RETRY_DELAY', default=60)
+MESSAGE_LEASE_SECONDS = env.int('MESSAGE_LEASE_SECONDS', default=300)
+
+# --- Query instrumentation (members/middleware.py) ---
+# ከዚህ በላይ queries የሚያደርግ request በ WARNING ይመዘገባል
+QUERY_COUNT_WARNING = env.int('QUERY_COUNT_WARNING', default=50)
+
 # ... (AUTH_PASSWORD_VALIDATORS, LOGIN_URL, LANGUAGE_CODE, ወዘተ...)
 
 AUTH_PASSWORD_VALIDATORS = [